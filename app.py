@@ -31,6 +31,14 @@ from utils.request_id import REQUEST_ID_HEADER, get_request_id, normalize_reques
 
 validate_startup_env()
 
+from services.redis_client import log_connection_diagnostics
+
+log_connection_diagnostics()
+
+from services.auth import start_blocklist_sync
+
+start_blocklist_sync()
+
 from routes.upload import router as upload_router
 from routes.status import router as status_router
 from routes.health import router as health_router
@@ -0,0 +1,145 @@
+# User value: This file measures how much Redis memory compact job records save and what decoding them costs.
+# benchmarks/bench_job_records.py
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import redis
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_commit_enqueue import start_fake_redis  # noqa: E402
+from repositories.job_records import compact_fields, decode_job  # noqa: E402
+from schemas.job_contract import CONTRACT_VERSION  # noqa: E402
+
+
+# User value: builds one finished job shaped like the ones the API and workers write today.
+def synth_job(rng: random.Random, idx: int) -> dict:
+    ocr = rng.random() < 0.6
+    created = f"2026-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00"
+    job = {
+        "contract_version": CONTRACT_VERSION,
+        "user": f"user{idx % 5000}@example.com",
+        "status": "COMPLETED" if rng.random() < 0.9 else "FAILED",
+        "stage": "Completed",
+        "progress": "100",
+        "version": str(rng.randint(6, 14)),
+        "job_type": "OCR" if ocr else "TRANSCRIPTION",
+        "type": "OCR" if ocr else "TRANSCRIPTION",
+        "source": "ocr" if ocr else "file",
+        "created_at": created,
+        "created_ts": str(int(time.mktime(time.strptime(created, "%Y-%m-%dT%H:%M:%S")))),
+        "updated_at": created,
+        "input_filename": f"scan_{idx:07d}_{'pravachan' if rng.random() < 0.3 else 'granth'}.{'pdf' if ocr else 'mp3'}",
+        "input_size_bytes": str(rng.randint(100_000, 80_000_000)),
+        "input_gcs_uri": f"gs://prod-uploads/uploads/{idx:07d}/input.{'pdf' if ocr else 'mp3'}",
+        "output_filename": f"scan_{idx:07d}.docx",
+        "output_path": f"outputs/{idx:07d}/result.docx",
+        "request_id": f"{rng.getrandbits(128):032x}",
+        "content_subtype": rng.choice(("general", "pravachan", "jain_literature")),
+        "duration_sec": f"{rng.uniform(5, 900):.1f}",
+        "eta_sec": str(rng.randint(30, 1800)),
+    }
+    if ocr:
+        pages = rng.randint(1, 400)
+        job["total_pages"] = str(pages)
+        job["ocr_quality_score"] = f"{rng.uniform(0.5, 1.0):.3f}"
+        low = sorted(rng.sample(range(1, pages + 1), min(pages, rng.randint(0, 12))))
+        job["low_confidence_pages"] = json.dumps(low)
+        job["quality_hints"] = json.dumps(["Some pages look blurry; rescan them at 300 dpi."] if low else [])
+    else:
+        job["transcript_quality_score"] = f"{rng.uniform(0.5, 1.0):.3f}"
+        segments = [
+            {"start_sec": round(s * 30.0, 1), "end_sec": round(s * 30.0 + 30.0, 1), "score": round(rng.uniform(0.4, 1.0), 3)}
+            for s in range(rng.randint(4, 40))
+        ]
+        job["segment_quality"] = json.dumps(segments)
+        job["low_confidence_segments"] = json.dumps([s for s in segments if s["score"] < 0.6])
+    if job["status"] == "FAILED":
+        job["error_code"] = "PROCESSING_FAILED"
+        job["error_message"] = "The file could not be processed. Please try again or upload a clearer copy."
+        job["recovery_action"] = "retry"
+        job["recovery_reason"] = "transient_worker_error"
+    return job
+
+
+# User value: stores a job the way the migration would leave it: record plus the hot plain fields.
+def compact_job(job: dict) -> dict:
+    record, replaced = compact_fields(job, terminal=True)
+    stored = {name: value for name, value in job.items() if name not in replaced}
+    stored["rec"] = record
+    return stored
+
+
+# User value: supports field_bytes so the OCR/transcription journey stays clear and reliable.
+def field_bytes(job: dict) -> int:
+    return sum(len(name.encode("utf-8")) + len(str(value).encode("utf-8")) for name, value in job.items())
+
+
+# User value: stores a sample of both layouts in Redis and returns average MEMORY USAGE per job for each.
+def redis_memory(redis_url: str, plain: list[dict], compact: list[dict]) -> tuple[float, float]:
+    r = redis.Redis.from_url(redis_url, decode_responses=True)
+    averages = []
+    for layout, jobs in (("plain", plain), ("compact", compact)):
+        keys = [f"bench_job_records:{layout}:{idx}" for idx in range(len(jobs))]
+        pipe = r.pipeline(transaction=False)
+        for key, job in zip(keys, jobs):
+            pipe.hset(key, mapping=job)
+        pipe.execute()
+        pipe = r.pipeline(transaction=False)
+        for key in keys:
+            pipe.memory_usage(key, samples=0)
+        averages.append(statistics.mean(int(value or 0) for value in pipe.execute()))
+        r.delete(*keys)
+    r.close()
+    return averages[0], averages[1]
+
+
+# User value: times decoding every stored job into the flat dict the routes use, in microseconds per job.
+def decode_us(jobs: list[dict]) -> float:
+    started = time.perf_counter()
+    for job in jobs:
+        decode_job(job)
+    return (time.perf_counter() - started) * 1e6 / len(jobs)
+
+
+# User value: parses options and prints bytes per job and decode cost for both layouts.
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare plain and compact job hashes: bytes per job and decode time.")
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--redis-sample", type=int, default=0, help="also store this many jobs in Redis and read MEMORY USAGE")
+    parser.add_argument("--fake-redis", action="store_true", help="use an in-process fakeredis TCP server for --redis-sample")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    plain = [synth_job(rng, idx) for idx in range(args.jobs)]
+    compact = [compact_job(job) for job in plain]
+    encode_sec = time.perf_counter() - started
+
+    plain_bytes = sum(field_bytes(job) for job in plain) / args.jobs
+    compact_bytes = sum(field_bytes(job) for job in compact) / args.jobs
+    plain_fields = sum(len(job) for job in plain) / args.jobs
+    compact_fields_avg = sum(len(job) for job in compact) / args.jobs
+    print(f"{args.jobs} synthetic finished jobs (built and packed in {encode_sec:.1f}s)")
+    print(f"{'layout':>8}{'fields':>8}{'bytes/job':>11}{'decode_us':>11}")
+    print(f"{'plain':>8}{plain_fields:>8.1f}{plain_bytes:>11.0f}{decode_us(plain):>11.2f}")
+    print(f"{'compact':>8}{compact_fields_avg:>8.1f}{compact_bytes:>11.0f}{decode_us(compact):>11.2f}")
+    print(f"field bytes saved: {100.0 * (1 - compact_bytes / plain_bytes):.1f}%")
+
+    if args.redis_sample:
+        redis_url = start_fake_redis() if args.fake_redis else os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        sample = min(args.redis_sample, args.jobs)
+        plain_mem, compact_mem = redis_memory(redis_url, plain[:sample], compact[:sample])
+        scale = args.jobs / (1024 * 1024)
+        print(f"MEMORY USAGE over {sample} jobs: plain {plain_mem:.0f} B/job, compact {compact_mem:.0f} B/job")
+        print(f"projected for {args.jobs} jobs: plain {plain_mem * scale:.0f} MiB, compact {compact_mem * scale:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
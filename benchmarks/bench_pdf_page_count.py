@@ -0,0 +1,160 @@
+# User value: This file measures PDF page counting time and memory so large-scan uploads stay fast and cheap.
+# benchmarks/bench_pdf_page_count.py
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.pdf_page_count import count_pdf_pages  # noqa: E402
+
+PAD_CHUNK = os.urandom(1024 * 1024)
+
+
+# User value: reproduces the previous full-read heuristic so the comparison is against shipped behavior.
+def legacy_parse_pdf_page_count(file_obj) -> int | None:
+    try:
+        pos = file_obj.tell()
+        file_obj.seek(0, os.SEEK_SET)
+        blob = file_obj.read()
+        file_obj.seek(pos, os.SEEK_SET)
+        if not blob:
+            return None
+        text = blob.decode("latin-1", errors="ignore")
+        count = text.count("/Type /Page")
+        if count <= 0:
+            return None
+        return max(1, count - text.count("/Type /Pages"))
+    except Exception:
+        return None
+
+
+# User value: writes a scan-sized PDF with a classic xref so both counters see realistic structure.
+def write_classic_pdf(handle, *, pages: int, size_mb: int, linearized: bool = False) -> None:
+    handle.write(b"%PDF-1.4\n")
+    if linearized:
+        handle.write(f"99 0 obj\n<< /Linearized 1 /L 0 /H [ 0 0 ] /O 3 /E 0 /N {pages} /T 0 >>\nendobj\n".encode("ascii"))
+    offsets = []
+    kids = " ".join(f"{3 + i * 2} 0 R" for i in range(pages))
+    bodies = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode("ascii"),
+    ]
+    per_page = max(1, size_mb // max(1, pages)) if size_mb >= pages else 0
+    remaining_mb = size_mb
+    for idx in range(pages):
+        bodies.append(f"<< /Type /Page /Parent 2 0 R /Contents {4 + idx * 2} 0 R >>".encode("ascii"))
+        chunks = per_page if per_page else (1 if remaining_mb > 0 and idx < size_mb else 0)
+        remaining_mb -= chunks
+        bodies.append(None if not chunks else chunks)
+    for num, body in enumerate(bodies, start=1):
+        offsets.append(handle.tell())
+        handle.write(f"{num} 0 obj\n".encode("ascii"))
+        if isinstance(body, int) or body is None:
+            length = (body or 0) * len(PAD_CHUNK)
+            handle.write(f"<< /Length {length} >>\nstream\n".encode("ascii"))
+            for _ in range(body or 0):
+                handle.write(PAD_CHUNK)
+            handle.write(b"\nendstream")
+        else:
+            handle.write(body)
+        handle.write(b"\nendobj\n")
+    xref = handle.tell()
+    handle.write(f"xref\n0 {len(bodies) + 1}\n0000000000 65535 f \n".encode("ascii"))
+    for offset in offsets:
+        handle.write(f"{offset:010d} 00000 n \n".encode("ascii"))
+    handle.write(f"trailer\n<< /Size {len(bodies) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii"))
+
+
+# User value: writes a PDF 1.5 file with object and xref streams, which the legacy heuristic cannot count.
+def write_object_stream_pdf(handle, *, pages: int, size_mb: int) -> None:
+    handle.write(b"%PDF-1.5\n")
+    pad_offset = handle.tell()
+    handle.write(f"1 0 obj\n<< /Length {size_mb * len(PAD_CHUNK)} >>\nstream\n".encode("ascii"))
+    for _ in range(size_mb):
+        handle.write(PAD_CHUNK)
+    handle.write(b"\nendstream\nendobj\n")
+
+    kids = " ".join(f"{4 + i} 0 R" for i in range(pages))
+    objects = [
+        b"<< /Type /Catalog /Pages 3 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode("ascii"),
+    ] + [b"<< /Type /Page /Parent 3 0 R >>" for _ in range(pages)]
+    header, payload = [], bytearray()
+    for idx, body in enumerate(objects):
+        header.append(f"{2 + idx} {len(payload)}")
+        payload += body + b"\n"
+    header_bytes = (" ".join(header) + "\n").encode("ascii")
+    stm_num = 2 + len(objects)
+    packed = zlib.compress(header_bytes + bytes(payload))
+    stm_offset = handle.tell()
+    handle.write(
+        f"{stm_num} 0 obj\n<< /Type /ObjStm /N {len(objects)} /First {len(header_bytes)} "
+        f"/Filter /FlateDecode /Length {len(packed)} >>\nstream\n".encode("ascii")
+    )
+    handle.write(packed + b"\nendstream\nendobj\n")
+
+    xref_num = stm_num + 1
+    xref_offset = handle.tell()
+    rows = [bytes([0, 0, 0, 0, 0, 0xFF, 0xFF]), bytes([1]) + pad_offset.to_bytes(4, "big") + b"\x00\x00"]
+    rows += [bytes([2]) + stm_num.to_bytes(4, "big") + idx.to_bytes(2, "big") for idx in range(len(objects))]
+    rows += [bytes([1]) + stm_offset.to_bytes(4, "big") + b"\x00\x00"]
+    rows += [bytes([1]) + xref_offset.to_bytes(4, "big") + b"\x00\x00"]
+    xref_data = zlib.compress(b"".join(rows))
+    handle.write(
+        f"{xref_num} 0 obj\n<< /Type /XRef /Size {xref_num + 1} /W [1 4 2] /Root 2 0 R "
+        f"/Filter /FlateDecode /Length {len(xref_data)} >>\nstream\n".encode("ascii")
+    )
+    handle.write(xref_data + b"\nendstream\nendobj\n")
+    handle.write(f"startxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+
+
+# User value: reports wall time and peak Python allocation for one counter on one file.
+def measure(counter, handle, repeat: int) -> tuple[int | None, float, float]:
+    best_ms = None
+    peak_mb = 0.0
+    result = None
+    for _ in range(repeat):
+        handle.seek(0)
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = counter(handle)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        best_ms = elapsed_ms if best_ms is None else min(best_ms, elapsed_ms)
+        peak_mb = max(peak_mb, peak / (1024 * 1024))
+    return result, best_ms or 0.0, peak_mb
+
+
+# User value: runs the comparison and prints one row per file shape and counter.
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare PDF page counting engines.")
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cases = {
+        "classic": lambda h: write_classic_pdf(h, pages=args.pages, size_mb=args.size_mb),
+        "linearized": lambda h: write_classic_pdf(h, pages=args.pages, size_mb=args.size_mb, linearized=True),
+        "object_streams": lambda h: write_object_stream_pdf(h, pages=args.pages, size_mb=args.size_mb),
+    }
+    counters = {"legacy_full_read": legacy_parse_pdf_page_count, "page_count_engine": count_pdf_pages}
+
+    print(f"{'case':<16}{'counter':<20}{'pages':>8}{'best_ms':>12}{'peak_mb':>10}")
+    for case, writer in cases.items():
+        with tempfile.TemporaryFile() as handle:
+            writer(handle)
+            handle.flush()
+            for name, counter in counters.items():
+                pages, best_ms, peak_mb = measure(counter, handle, args.repeat)
+                print(f"{case:<16}{name:<20}{str(pages):>8}{best_ms:>12.1f}{peak_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
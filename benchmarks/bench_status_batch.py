@@ -0,0 +1,123 @@
+# User value: This file shows how much faster a dashboard refresh gets with one batch status call instead of one call per job.
+# benchmarks/bench_status_batch.py
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GOOGLE_CLIENT_ID", "bench")
+
+import redis  # noqa: E402
+from fastapi import Response  # noqa: E402
+
+from benchmarks.bench_commit_enqueue import start_fake_redis, start_latency_proxy  # noqa: E402
+from routes import status  # noqa: E402
+from schemas.requests import StatusBatchRequest  # noqa: E402
+
+EMAIL = "bench@example.com"
+USER = {"email": EMAIL}
+
+
+# User value: runs the latency proxy on its own event loop so the sync route code can call through it.
+def start_proxy_thread(host: str, port: int, rtt_ms: float) -> int:
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    _, proxy_port = asyncio.run_coroutine_threadsafe(start_latency_proxy(host, port, rtt_ms), loop).result()
+    return proxy_port
+
+
+# User value: writes in-flight jobs shaped like real ones so both paths do the same per-job work.
+def seed_jobs(r, count: int) -> list[str]:
+    job_ids = [uuid.uuid4().hex for _ in range(count)]
+    pipe = r.pipeline(transaction=False)
+    for job_id in job_ids:
+        pipe.hset(
+            f"job_status:{job_id}",
+            mapping={
+                "user": EMAIL,
+                "status": "PROCESSING",
+                "stage": "OCR",
+                "progress": 40,
+                "job_type": "OCR",
+                "version": 3,
+                "created_at": "2026-01-01T00:00:00",
+                "updated_at": "2026-01-01T00:00:10",
+            },
+        )
+    pipe.execute()
+    return job_ids
+
+
+# User value: replays what the dashboard does today: one status read per job.
+def individual_reads(job_ids: list[str]) -> None:
+    for job_id in job_ids:
+        status.read_status(job_id, Response(), USER)
+
+
+# User value: runs the batch endpoint for the same jobs.
+def batch_read(job_ids: list[str]) -> None:
+    status.get_status_batch(StatusBatchRequest(job_ids=job_ids), user=USER)
+
+
+# User value: times one strategy and returns per-refresh latencies.
+def measure(read, job_ids: list[str], iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        read(job_ids)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return samples
+
+
+# User value: runs both strategies at each injected RTT and batch size and prints a comparison table.
+def run(redis_url: str, rtts: list[float], sizes: list[int], iterations: int) -> None:
+    base = redis.Redis.from_url(redis_url)
+    host = base.connection_pool.connection_kwargs.get("host", "127.0.0.1")
+    port = int(base.connection_pool.connection_kwargs.get("port", 6379))
+    db = int(base.connection_pool.connection_kwargs.get("db", 0))
+    base.close()
+
+    print(f"{'rtt_ms':>7}{'jobs':>6}{'strategy':>12}{'p50_ms':>10}{'p99_ms':>10}{'speedup':>9}")
+    for rtt in rtts:
+        r = redis.Redis(host="127.0.0.1", port=start_proxy_thread(host, port, rtt), db=db, decode_responses=True)
+        with patch("routes.status.r", r):
+            for size in sizes:
+                job_ids = seed_jobs(r, size)
+                medians = {}
+                for name, read in (("individual", individual_reads), ("batch", batch_read)):
+                    measure(read, job_ids, 2)
+                    samples = sorted(measure(read, job_ids, iterations))
+                    p99 = samples[max(0, int(round(0.99 * len(samples))) - 1)]
+                    medians[name] = statistics.median(samples)
+                    speedup = medians["individual"] / medians[name]
+                    print(f"{rtt:>7.1f}{size:>6}{name:>12}{medians[name]:>10.2f}{p99:>10.2f}{speedup:>8.1f}x")
+                r.delete(*[f"job_status:{job_id}" for job_id in job_ids])
+        r.close()
+
+
+# User value: parses options and runs the benchmark end to end.
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare N single /status reads with one /status/batch read (token verification excluded)."
+    )
+    parser.add_argument("--rtt-ms", type=float, nargs="+", default=[1.0, 5.0])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--fake-redis", action="store_true", help="use an in-process fakeredis TCP server")
+    args = parser.parse_args()
+
+    # Per-read log lines are part of the cost being compared, but printing them would drown the table.
+    logging.disable(logging.INFO)
+    redis_url = start_fake_redis() if args.fake_redis else os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    run(redis_url, args.rtt_ms, args.jobs, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# User value: This file shows status polls stay fast while large uploads are in flight, so users never see a frozen API.
+# benchmarks/bench_upload_event_loop.py
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for _key, _value in {
+    "GOOGLE_CLIENT_ID": "bench-client-id",
+    "GCS_BUCKET_NAME": "bench",
+    "QUEUE_NAME": "doc_jobs",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "CORS_ALLOW_ORIGINS": "http://localhost",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_JOB_ID = "bench-status-job"
+BOUNDARY = "----bench-boundary"
+
+
+# User value: stands in for the blocking GCS SDK so the benchmark runs without cloud credentials.
+def make_blocking_gcs_upload(ms_per_mb: float):
+    # User value: reads the spool and sleeps per MB like a blocking network write would.
+    def upload_file(file_obj, destination_path: str, crc32c: str | None = None) -> dict:
+        file_obj.seek(0)
+        while True:
+            chunk = file_obj.read(1024 * 1024)
+            if not chunk:
+                break
+            time.sleep(ms_per_mb / 1000.0)
+        return {"bucket": "bench", "blob": destination_path, "gcs_uri": f"gs://bench/{destination_path}"}
+
+    return upload_file
+
+
+# User value: wires Redis either to REDIS_URL or to one shared in-process fake for both clients.
+def configure_redis(use_fake: bool) -> None:
+    import routes.status as status_routes
+    import services.upload_orchestrator as orchestrator
+
+    if use_fake:
+        import fakeredis
+
+        server = fakeredis.FakeServer()
+        status_routes.r = fakeredis.FakeRedis(server=server, decode_responses=True)
+        orchestrator.r = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    status_routes.r.hset(
+        f"job_status:{BENCH_JOB_ID}",
+        mapping={"status": "PROCESSING", "stage": "Bench", "progress": 10, "user": BENCH_EMAIL, "job_type": "OCR"},
+    )
+
+
+# User value: builds the app with auth bypassed so only upload and status work is measured.
+def build_app(ms_per_mb: float):
+    import services.upload_orchestrator as orchestrator
+    from app import app
+    from services.auth import verify_google_token
+
+    app.dependency_overrides[verify_google_token] = lambda: {"email": BENCH_EMAIL}
+    orchestrator.upload_file = make_blocking_gcs_upload(ms_per_mb)
+    return app
+
+
+# User value: runs uvicorn in a background thread so client timings include real socket and loop scheduling.
+def start_server(app) -> tuple[uvicorn.Server, int]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, port
+
+
+# User value: streams a multipart body in network-sized pieces like a browser upload.
+async def multipart_body(size_mb: int):
+    yield (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"type\"\r\n\r\nTRANSCRIPTION\r\n"
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"bench.mp3\"\r\n"
+        "Content-Type: audio/mpeg\r\n\r\nID3"
+    ).encode("ascii")
+    block = b"\0" * (256 * 1024)
+    for _ in range(size_mb * 4):
+        yield block
+    yield f"\r\n--{BOUNDARY}--\r\n".encode("ascii")
+
+
+# User value: polls job status at a fixed rate and records each round-trip latency.
+async def poll_status(client: httpx.AsyncClient, stop: asyncio.Event, interval_ms: float, samples: list) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        resp = await client.get(f"/status/{BENCH_JOB_ID}")
+        samples.append((time.perf_counter() - started) * 1000.0)
+        resp.raise_for_status()
+        await asyncio.sleep(interval_ms / 1000.0)
+
+
+# User value: summarizes latency samples the way dashboards report them.
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    p99_idx = max(0, int(round(0.99 * len(ordered))) - 1)
+    return {
+        "n": len(ordered),
+        "p50_ms": statistics.median(ordered) if ordered else 0.0,
+        "p99_ms": ordered[p99_idx] if ordered else 0.0,
+        "max_ms": ordered[-1] if ordered else 0.0,
+    }
+
+
+# User value: measures idle status latency, then latency with N uploads in flight.
+async def run(port: int, args) -> None:
+    base = f"http://127.0.0.1:{port}"
+    timeout = httpx.Timeout(600.0)
+    async with httpx.AsyncClient(base_url=base, timeout=timeout) as poller, httpx.AsyncClient(
+        base_url=base, timeout=timeout
+    ) as uploader:
+        idle: list[float] = []
+        stop = asyncio.Event()
+        task = asyncio.create_task(poll_status(poller, stop, args.interval_ms, idle))
+        await asyncio.sleep(args.idle_sec)
+        stop.set()
+        await task
+
+        loaded: list[float] = []
+        stop = asyncio.Event()
+        task = asyncio.create_task(poll_status(poller, stop, args.interval_ms, loaded))
+        started = time.perf_counter()
+        uploads = [
+            uploader.post(
+                "/upload",
+                content=multipart_body(args.size_mb),
+                headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+            )
+            for _ in range(args.uploads)
+        ]
+        results = await asyncio.gather(*uploads)
+        upload_sec = time.perf_counter() - started
+        stop.set()
+        await task
+
+    failed = [r.status_code for r in results if r.status_code != 200]
+    print(f"uploads={args.uploads} size_mb={args.size_mb} wall_sec={upload_sec:.1f} failed={failed}")
+    print(f"{'phase':<10}{'n':>6}{'p50_ms':>10}{'p99_ms':>10}{'max_ms':>10}")
+    for phase, samples in (("idle", idle), ("uploads", loaded)):
+        row = summarize(samples)
+        print(f"{phase:<10}{row['n']:>6}{row['p50_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}")
+
+
+# User value: parses options and runs the benchmark end to end.
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Status poll latency while large uploads are in flight.")
+    parser.add_argument("--uploads", type=int, default=4)
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--interval-ms", type=float, default=20.0)
+    parser.add_argument("--idle-sec", type=float, default=3.0)
+    parser.add_argument("--gcs-ms-per-mb", type=float, default=5.0)
+    parser.add_argument("--fake-redis", action="store_true", help="use an in-process fakeredis server")
+    args = parser.parse_args()
+
+    app = build_app(args.gcs_ms_per_mb)
+    configure_redis(args.fake_redis)
+    server, port = start_server(app)
+    try:
+        asyncio.run(run(port, args))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
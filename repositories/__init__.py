@@ -0,0 +1 @@
+# User value: This package keeps Redis/storage access for job data in one place so routes stay thin.
@@ -0,0 +1,266 @@
+# User value: This file stores job records compactly in Redis and reads them back the same way for every route.
+# repositories/job_records.py
+import base64
+import os
+from typing import Iterable, Optional
+
+import msgpack
+import zstandard
+
+JOB_KEY_PREFIX = "job_status:"
+# Hash field holding the packed part of a job: base64(msgpack([format version, {field code: value}])).
+RECORD_FIELD = "rec"
+RECORD_FORMAT_VERSION = 1
+JOB_RECORD_ZSTD_MIN_BYTES = int(os.getenv("JOB_RECORD_ZSTD_MIN_BYTES", "256"))
+_ZSTD_EXT = 1
+
+# Read by the Lua scripts, workers or partial HMGETs, or rewritten while a job runs: always plain hash fields.
+HOT_FIELDS = frozenset(
+    {
+        "user",
+        "status",
+        "stage",
+        "progress",
+        "version",
+        "updated_at",
+        "created_at",
+        "created_ts",
+        "job_type",
+        "type",
+        "error_code",
+        "output_path",
+        "cancel_requested",
+        "total_pages",
+        "duration_sec",
+        RECORD_FIELD,
+    }
+)
+# Written once by the API when a job is created; packed straight away when compact records are on.
+CREATE_PACKED_FIELDS = (
+    "contract_version",
+    "source",
+    "input_filename",
+    "input_size_bytes",
+    "output_filename",
+    "request_id",
+    "content_subtype",
+    "retry_of_job_id",
+)
+
+# Append-only: a record written today must decode with every later release. Unlisted fields keep their name.
+_FIELD_NAMES = (
+    "contract_version",
+    "source",
+    "input_filename",
+    "input_size_bytes",
+    "output_filename",
+    "request_id",
+    "content_subtype",
+    "retry_of_job_id",
+    "input_gcs_uri",
+    "error",
+    "error_message",
+    "recovery_action",
+    "recovery_reason",
+    "recovery_attempt",
+    "recovery_max_attempts",
+    "recovery_trace",
+    "ocr_quality_score",
+    "low_confidence_pages",
+    "quality_hints",
+    "transcript_quality_score",
+    "low_confidence_segments",
+    "segment_quality",
+    "transcript_quality_hints",
+    "detected_job_type",
+    "warnings",
+    "eta_sec",
+    "confidence",
+    "reasons",
+    "estimated_effort",
+    "estimated_cost_band",
+    "policy_decision",
+    "policy_reason",
+    "projected_cost_usd",
+)
+FIELD_CODES = {name: code for code, name in enumerate(_FIELD_NAMES)}
+
+# Append-only, like the field codes. An enum field stores the index of a known value, or the text itself.
+VALUE_ENUMS = {
+    "contract_version": ("2026-02-16-prs-041",),
+    "source": ("ocr", "file"),
+    "content_subtype": ("jain_literature", "general", "pravachan", "shanka_samadhan"),
+    "detected_job_type": ("OCR", "TRANSCRIPTION"),
+}
+
+# KEYS: job hash. ARGV: version the record was built from, packed record, then the plain fields it replaces.
+# Nothing changes for readers, so the version is not bumped; a job written to meanwhile is skipped.
+COMPACT_JOB_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return 0
+end
+if (redis.call('HGET', KEYS[1], 'version') or '') ~= ARGV[1] then
+  return 0
+end
+redis.call('HSET', KEYS[1], '""" + RECORD_FIELD + """', ARGV[2])
+if #ARGV > 2 then
+  redis.call('HDEL', KEYS[1], unpack(ARGV, 3))
+end
+return 1
+"""
+
+# KEYS: job hash. ARGV: version the fields were read at, then field/value pairs to write back as plain fields.
+EXPAND_JOB_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return 0
+end
+if (redis.call('HGET', KEYS[1], 'version') or '') ~= ARGV[1] then
+  return 0
+end
+if #ARGV > 1 then
+  redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+end
+redis.call('HDEL', KEYS[1], '""" + RECORD_FIELD + """')
+return 1
+"""
+
+
+# User value: supports job_key so the OCR/transcription journey stays clear and reliable.
+def job_key(job_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}{job_id}"
+
+
+# User value: supports _pack_value so the OCR/transcription journey stays clear and reliable.
+def _pack_value(name: str, value):
+    text = "" if value is None else str(value)
+    enum = VALUE_ENUMS.get(name)
+    if enum is not None:
+        return enum.index(text) if text in enum else text
+    if text.isascii() and text.isdigit() and len(text) < 19 and (text == "0" or text[0] != "0"):
+        return int(text)
+    raw = text.encode("utf-8")
+    if len(raw) >= JOB_RECORD_ZSTD_MIN_BYTES:
+        packed = zstandard.compress(raw, 3)
+        if len(packed) < len(raw):
+            return msgpack.ExtType(_ZSTD_EXT, packed)
+    return text
+
+
+# User value: supports _unpack_value so the OCR/transcription journey stays clear and reliable.
+def _unpack_value(name: str, value) -> str:
+    if isinstance(value, msgpack.ExtType):
+        return zstandard.decompress(value.data).decode("utf-8")
+    if isinstance(value, int):
+        enum = VALUE_ENUMS.get(name)
+        return enum[value] if enum is not None else str(value)
+    return value
+
+
+# User value: packs job fields into one compact record value.
+def pack_record(fields: dict) -> str:
+    body = {FIELD_CODES.get(name, name): _pack_value(name, value) for name, value in fields.items()}
+    return base64.b64encode(msgpack.packb([RECORD_FORMAT_VERSION, body], use_bin_type=True)).decode("ascii")
+
+
+# User value: unpacks a record value back into the plain string fields every reader expects.
+def unpack_record(value: str) -> dict:
+    version, body = msgpack.unpackb(base64.b64decode(value), raw=False, strict_map_key=False)
+    if version != RECORD_FORMAT_VERSION:
+        raise ValueError(f"unsupported job record format {version}")
+    fields = {}
+    for key, packed in body.items():
+        name = _FIELD_NAMES[key] if isinstance(key, int) else key
+        fields[name] = _unpack_value(name, packed)
+    return fields
+
+
+# User value: turns a raw job hash into the same flat dict whether or not the job was stored compactly.
+def decode_job(raw: dict) -> dict:
+    packed = raw.get(RECORD_FIELD) if raw else None
+    if not packed:
+        return raw
+    data = unpack_record(packed)
+    # Plain fields are written later than the record (by workers), so they win.
+    data.update((name, value) for name, value in raw.items() if name != RECORD_FIELD)
+    return data
+
+
+# User value: shapes the fields of a new job for storage, packing the write-once ones when compact records are on.
+def encode_job(mapping: dict, *, compact: bool, pack_fields: Iterable[str] = CREATE_PACKED_FIELDS) -> dict:
+    if not compact:
+        return mapping
+    packed = {name: mapping[name] for name in pack_fields if name in mapping}
+    if not packed:
+        return mapping
+    plain = {name: value for name, value in mapping.items() if name not in packed}
+    plain[RECORD_FIELD] = pack_record(packed)
+    return plain
+
+
+# User value: works out the compact form of a stored job: what goes in the record and which plain fields it replaces.
+def compact_fields(raw: dict, *, terminal: bool) -> tuple[Optional[str], list[str]]:
+    data = decode_job(raw)
+    # A finished job is no longer written by workers, so everything but the hot fields can be packed.
+    names = [name for name in data if name not in HOT_FIELDS] if terminal else [n for n in CREATE_PACKED_FIELDS if n in data]
+    if not names:
+        return None, []
+    record = pack_record({name: data[name] for name in names})
+    return record, [name for name in names if name in raw]
+
+
+# User value: works out the plain fields to write back when undoing compact storage for one job.
+def expand_fields(raw: dict) -> dict:
+    packed = raw.get(RECORD_FIELD)
+    if not packed:
+        return {}
+    return {name: value for name, value in unpack_record(packed).items() if name not in raw}
+
+
+# User value: reads one job, compact or not.
+def read_job(r, job_id: str) -> dict:
+    return decode_job(r.hgetall(job_key(job_id)))
+
+
+# User value: reads one job on the async client, compact or not.
+async def read_job_async(r, job_id: str) -> dict:
+    return decode_job(await r.hgetall(job_key(job_id)))
+
+
+# User value: reads many jobs in one pipeline, compact or not; missing jobs come back as {}.
+def read_jobs(r, job_ids: list[str]) -> list[dict]:
+    pipe = r.pipeline(transaction=False)
+    for job_id in job_ids:
+        pipe.hgetall(job_key(job_id))
+    return [decode_job(raw) for raw in pipe.execute()]
+
+
+# User value: lists what one HMGET must fetch: the fields, plus the packed record only when a field may live there.
+def _fields_to_read(fields: tuple) -> tuple:
+    cold = any(name not in HOT_FIELDS for name in fields)
+    return (*fields, RECORD_FIELD) if cold else fields
+
+
+# User value: turns HMGET values back into a field dict, filling cold fields from the packed record when it was read.
+def decode_job_fields(fields: tuple, values: list) -> dict:
+    data = dict(zip(fields, values))
+    if len(values) > len(fields) and values[-1]:
+        packed = unpack_record(values[-1])
+        for name in fields:
+            if data[name] is None:
+                data[name] = packed.get(name)
+    return data
+
+
+# User value: reads a few fields with one HMGET, fetching the packed record only when a requested field lives there.
+def read_job_fields(r, job_id: str, *fields: str) -> dict:
+    return decode_job_fields(fields, r.hmget(job_key(job_id), *_fields_to_read(fields)))
+
+
+# User value: reads a few fields of one job on the async client, compact or not.
+async def read_job_fields_async(r, job_id: str, *fields: str) -> dict:
+    return decode_job_fields(fields, await r.hmget(job_key(job_id), *_fields_to_read(fields)))
+
+
+# User value: queues the same read on a pipeline so many jobs cost one round trip; decode each row with decode_job_fields.
+def queue_job_fields(pipe, job_id: str, *fields: str) -> None:
+    pipe.hmget(job_key(job_id), *_fields_to_read(fields))
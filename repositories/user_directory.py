@@ -0,0 +1,125 @@
+# User value: This file gives every user a short numeric id so per-user Redis keys stay small and cheap to scan.
+# repositories/user_directory.py
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from services.feature_flags import is_user_ids_enabled
+
+# Hash of email -> id, and its reverse for scripts that start from a key name.
+USER_IDS_KEY = "user_ids"
+USER_EMAILS_KEY = "user_emails"
+USER_ID_SEQ_KEY = "user_id_seq"
+USER_DIRECTORY_CACHE_SIZE = int(os.getenv("USER_DIRECTORY_CACHE_SIZE", "10000"))
+
+# KEYS: email -> id hash, id -> email hash, id sequence. ARGV: email.
+# Returns the existing id, or assigns the next one; ids are never reused or changed.
+ASSIGN_USER_ID_LUA = """
+local id = redis.call('HGET', KEYS[1], ARGV[1])
+if id then
+  return id
+end
+id = tostring(redis.call('INCR', KEYS[3]))
+redis.call('HSET', KEYS[1], ARGV[1], id)
+redis.call('HSET', KEYS[2], id, ARGV[1])
+return id
+"""
+
+_sync_script = None
+_async_script = None
+
+
+class UserIdCache:
+    # User value: keeps recently seen email -> id pairs in memory, bounded by LRU eviction; ids never change, so no TTL.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    # User value: supports get so the OCR/transcription journey stays clear and reliable.
+    def get(self, email: str) -> Optional[str]:
+        with self._lock:
+            user_id = self._entries.get(email)
+            if user_id is not None:
+                self._entries.move_to_end(email)
+            return user_id
+
+    # User value: supports put so the OCR/transcription journey stays clear and reliable.
+    def put(self, email: str, user_id: str) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[email] = user_id
+            self._entries.move_to_end(email)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    # User value: supports clear so the OCR/transcription journey stays clear and reliable.
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = UserIdCache(USER_DIRECTORY_CACHE_SIZE)
+
+
+# User value: tells an id-keyed owner from an email-keyed one; emails always contain '@', ids never do.
+def is_user_id(owner: str) -> bool:
+    return bool(owner) and "@" not in owner
+
+
+# User value: returns the user's id, assigning one the first time the email is seen.
+def user_id(r, email: str) -> str:
+    global _sync_script
+    cached = _cache.get(email)
+    if cached is not None:
+        return cached
+    found = r.hget(USER_IDS_KEY, email)
+    if found is None:
+        if _sync_script is None:
+            _sync_script = r.register_script(ASSIGN_USER_ID_LUA)
+        found = _sync_script(keys=[USER_IDS_KEY, USER_EMAILS_KEY, USER_ID_SEQ_KEY], args=[email], client=r)
+    found = str(found)
+    _cache.put(email, found)
+    return found
+
+
+# User value: returns the user's id on the async client, so upload and streaming paths never block the event loop.
+async def user_id_async(r, email: str) -> str:
+    global _async_script
+    cached = _cache.get(email)
+    if cached is not None:
+        return cached
+    found = await r.hget(USER_IDS_KEY, email)
+    if found is None:
+        if _async_script is None:
+            _async_script = r.register_script(ASSIGN_USER_ID_LUA)
+        found = await _async_script(keys=[USER_IDS_KEY, USER_EMAILS_KEY, USER_ID_SEQ_KEY], args=[email], client=r)
+    found = str(found)
+    _cache.put(email, found)
+    return found
+
+
+# User value: maps an id back to its email, for scripts that walk keys; None if the id was never assigned.
+def email_for(r, owner: str) -> Optional[str]:
+    if not is_user_id(owner):
+        return owner or None
+    return r.hget(USER_EMAILS_KEY, owner)
+
+
+# User value: names the user in every per-user key and in each job's `user` field: the id once user ids are on, else the email.
+def user_ref(r, email: str) -> str:
+    return user_id(r, email) if is_user_ids_enabled() else email
+
+
+# User value: same as user_ref, on the async client.
+async def user_ref_async(r, email: str) -> str:
+    return await user_id_async(r, email) if is_user_ids_enabled() else email
+
+
+# User value: checks a job's `user` field against the caller, accepting either form so jobs stay theirs during the key migration.
+def owns(value, email: str, owner: str) -> bool:
+    return bool(value) and value in (owner, email)
@@ -1,7 +1,7 @@
 # User value: This file helps users get reliable OCR/transcription results with clear processing behavior.
 # routes/auth.py
 from fastapi import APIRouter, HTTPException
-from services.auth import verify_google_id_token
+from services.auth import issue_session_token, verify_google_id_token
 
 router = APIRouter()
 
@@ -11,8 +11,9 @@ router = APIRouter()
 def google_auth(payload: dict):
     """
     Optional endpoint.
-    Used only to confirm identity on frontend.
-    Does NOT grant access.
+    Used to confirm identity on frontend.
+    With FEATURE_SESSION_TOKENS=1 it also returns a short-lived API session token
+    that can be sent as the Bearer token instead of the Google ID token.
     """
     token = payload.get("id_token")
     if not token:
@@ -23,7 +24,12 @@ def google_auth(payload: dict):
 
     info = verify_google_id_token(str(token).strip())
 
-    return {
+    out = {
         "email": info.get("email"),
         "name": info.get("name"),
     }
+    session = issue_session_token(info)
+    if session:
+        out.update(session)
+        out["token_type"] = "Bearer"
+    return out
@@ -9,9 +9,16 @@ from schemas.job_contract import (
     CANONICAL_FIELDS,
 )
 from services.feature_flags import (
+    is_conditional_get_enabled,
     is_cost_guardrail_enabled,
+    is_direct_upload_enabled,
+    is_job_events_stream_enabled,
+    is_lazy_download_urls_enabled,
     is_queue_orchestration_enabled,
+    is_session_tokens_enabled,
     is_smart_intake_enabled,
+    is_status_long_poll_enabled,
+    is_streaming_upload_enabled,
 )
 
 router = APIRouter()
@@ -30,5 +37,12 @@ def job_status_contract():
             "smart_intake_enabled": is_smart_intake_enabled(),
             "cost_guardrail_enabled": is_cost_guardrail_enabled(),
             "queue_orchestration_enabled": is_queue_orchestration_enabled(),
+            "streaming_upload_enabled": is_streaming_upload_enabled(),
+            "direct_upload_enabled": is_direct_upload_enabled(),
+            "session_tokens_enabled": is_session_tokens_enabled(),
+            "lazy_download_urls_enabled": is_lazy_download_urls_enabled(),
+            "conditional_get_enabled": is_conditional_get_enabled(),
+            "status_long_poll_enabled": is_status_long_poll_enabled(),
+            "job_events_stream_enabled": is_job_events_stream_enabled(),
         },
     }
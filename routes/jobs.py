@@ -3,13 +3,39 @@
 import os
 import json
 import uuid
-import redis
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
-
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import RedirectResponse, StreamingResponse
+
+from repositories.job_records import (
+    decode_job_fields,
+    encode_job,
+    job_key,
+    queue_job_fields,
+    read_job,
+    read_job_fields,
+    read_jobs,
+)
+from repositories.user_directory import owns, user_ref, user_ref_async
 from services.auth import verify_google_token
-from services.gcs import generate_signed_url
+from services.feature_flags import (
+    is_active_jobs_set_enabled,
+    is_compact_job_records_enabled,
+    is_conditional_get_enabled,
+    is_job_archive_reads_enabled,
+    is_job_events_stream_enabled,
+    is_job_indexes_enabled,
+    is_lazy_download_urls_enabled,
+)
+from services.job_archive import archived_jobs_key, load_archived_jobs
+from services.job_events import get_job_change_hub, user_job_events
+from services.job_export import EXPORT_FORMATS, JOBS_EXPORT_BATCH_SIZE, csv_chunk, iter_job_batches, ndjson_chunk
+from services.redis_client import get_async_redis, get_redis
+from services.signed_urls import download_target, signed_download_urls, url_freshness_bucket
+from utils.etag import if_none_match as etag_matches, strong_etag
+from utils.job_indexes import active_jobs_key, counts_field, counts_key, index_key_for, time_index_key
 from utils.metrics import incr
+from utils.page_cursor import NEWER, OLDER, PageCursor, decode_cursor, encode_cursor
 from utils.request_id import get_request_id
 from utils.stage_logging import log_stage
 from schemas.job_contract import (
@@ -18,13 +44,12 @@ from schemas.job_contract import (
     JOB_STATUS_CANCELLED,
     JOB_STATUS_QUEUED,
 )
-from utils.status_machine import transition_hset
+from utils.status_machine import history_version_key, transition_hset
 from utils.request_id import get_request_id
 
 router = APIRouter()
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-r = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+r = get_redis()
 QUEUE_NAME = os.getenv("QUEUE_NAME", "doc_jobs")
 QUEUE_NAME_OCR = os.getenv("QUEUE_NAME_OCR", "doc_jobs_ocr")
 QUEUE_NAME_TRANSCRIPTION = os.getenv("QUEUE_NAME_TRANSCRIPTION", "doc_jobs_transcription")
@@ -35,6 +60,8 @@ FEATURE_QUEUE_PARTITIONING = str(os.getenv("FEATURE_QUEUE_PARTITIONING", "1")).s
     "on",
 }
 GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME", "doc-transcribe-output-transcribe-serverless").strip()
+# Fields the legacy full-scan listing reads per job to filter and count.
+META_FIELDS = ("status", "job_type", "type")
 
 
 # User value: routes retried jobs to the right worker queue so retries are processed quickly and correctly.
@@ -46,20 +73,200 @@ def resolve_target_queue(job_type: str) -> str:
     return QUEUE_NAME_TRANSCRIPTION
 
 
+# User value: supports enrich_job so the OCR/transcription journey stays clear and reliable.
+def enrich_job(job_id: str, data: dict) -> dict:
+    if not data.get("request_id"):
+        rid = get_request_id()
+        if rid:
+            data["request_id"] = rid
+    data["job_id"] = job_id
+    trace_raw = data.get("recovery_trace")
+    if not isinstance(trace_raw, list):
+        text = str(trace_raw or "").strip()
+        if text:
+            try:
+                parsed = json.loads(text)
+                data["recovery_trace"] = parsed if isinstance(parsed, list) else []
+            except Exception:
+                data["recovery_trace"] = []
+        else:
+            data["recovery_trace"] = []
+    return data
+
+
+# User value: gives every finished job a stable link that is only signed when the user actually downloads.
+def download_link(job_id: str) -> str:
+    return f"/jobs/{job_id}/download"
+
+
+# User value: gives every finished job on a page its download link, signing uncached links concurrently.
+def _attach_download_urls(items: list[dict]) -> None:
+    wanted = [(item, target) for item in items for target in [download_target(item)] if target]
+    if not wanted:
+        return
+    if is_lazy_download_urls_enabled():
+        for item, _ in wanted:
+            item["output_path"] = download_link(item["job_id"])
+            item["download_url"] = item["output_path"]
+        return
+    urls = signed_download_urls([target for _, target in wanted])
+    for (item, _), url in zip(wanted, urls):
+        item["output_path"] = url
+        item["download_url"] = url
+
+
+# User value: reads job hashes in one pipeline, bringing back archived jobs whose hashes have left Redis.
+def _job_details(email: str, owner: str, job_ids: list[str]) -> list[dict]:
+    details_rows = read_jobs(r, job_ids)
+    if is_job_archive_reads_enabled():
+        missing = [job_id for job_id, data in zip(job_ids, details_rows) if not data]
+        if missing:
+            archived = load_archived_jobs(r, email, missing, owner=owner)
+            details_rows = [data or archived.get(job_id) or {} for job_id, data in zip(job_ids, details_rows)]
+    for data in details_rows:
+        if data:
+            # Responses keep showing the email even when the job is stored under the user's id.
+            data["user"] = email
+    return details_rows
+
+
+# User value: reads positions start..stop of the user's history: the live list, then archived jobs after it.
+def _history_range(owner: str, start: int, stop: int, live_jobs: int) -> list[str]:
+    job_ids = r.lrange(f"user_jobs:{owner}", start, stop)
+    if is_job_archive_reads_enabled() and (stop < 0 or stop >= live_jobs):
+        archived_stop = -1 if stop < 0 else stop - live_jobs
+        job_ids += r.lrange(archived_jobs_key(owner), max(0, start - live_jobs), archived_stop)
+    return job_ids
+
+
+# User value: serves a filtered or counted history page from the per-user indexes and counters in one round trip.
+def _indexed_page(
+    owner: str,
+    *,
+    status: str | None,
+    job_type: str | None,
+    limit: int,
+    offset: int,
+    include_counts: bool,
+    total_user_jobs: int,
+) -> tuple[list[str], bool, int | None, dict, dict]:
+    pipe = r.pipeline(transaction=False)
+    # Archived jobs leave user_jobs but stay in the time index.
+    unfiltered = time_index_key(owner) if is_job_archive_reads_enabled() else None
+    index_key = index_key_for(owner, status=status, job_type=job_type, unfiltered=unfiltered)
+    if index_key:
+        pipe.zrevrange(index_key, offset, offset + limit)
+    else:
+        # Counts without filters: the page itself still comes from the user's job list.
+        pipe.lrange(f"user_jobs:{owner}", offset, offset + limit)
+    if include_counts:
+        pipe.hgetall(counts_key(owner))
+    rows = pipe.execute()
+
+    selected_job_ids = rows[0]
+    counts_by_type = {"TRANSCRIPTION": 0, "OCR": 0}
+    counts_by_status = {k: 0 for k in TRACKED_HISTORY_STATUSES}
+    matched_total = None
+    if include_counts:
+        matched_total, counts_by_status, counts_by_type = _counts_from_hash(
+            rows[1] or {}, status=status, job_type=job_type, total_user_jobs=total_user_jobs
+        )
+    return selected_job_ids[:limit], len(selected_job_ids) > limit, matched_total, counts_by_status, counts_by_type
+
+
+# User value: turns the per-user counters hash into the totals and per-status/type counts a history page shows.
+def _counts_from_hash(
+    counts: dict, *, status: str | None, job_type: str | None, total_user_jobs: int
+) -> tuple[int, dict, dict]:
+
+    # User value: supports count so the OCR/transcription journey stays clear and reliable.
+    def count(**kwargs) -> int:
+        return max(0, int(counts.get(counts_field(**kwargs)) or 0))
+
+    counts_by_type = {job_type_name: count(job_type=job_type_name) for job_type_name in ("TRANSCRIPTION", "OCR")}
+    counts_by_status = {status_name: count(status=status_name, job_type=job_type) for status_name in TRACKED_HISTORY_STATUSES}
+    matched_total = count(status=status, job_type=job_type) if (status or job_type) else total_user_jobs
+    return matched_total, counts_by_status, counts_by_type
+
+
+# User value: reads one keyset page (newest first) next to a cursor, so pages never skip or repeat jobs while new ones arrive.
+def _cursor_page(index_key: str, cursor: PageCursor | None, limit: int, counts_key_name: str | None) -> tuple[list[str], bool, dict | None]:
+    pipe = r.pipeline(transaction=False)
+    if cursor is None:
+        pipe.zrevrange(index_key, 0, limit)
+    else:
+        # Jobs created in the same microsecond share a score; the job id breaks the tie.
+        pipe.zrangebyscore(index_key, cursor.score, cursor.score)
+        if cursor.direction == OLDER:
+            pipe.zrevrangebyscore(index_key, f"({cursor.score}", "-inf", start=0, num=limit + 1)
+        else:
+            pipe.zrangebyscore(index_key, f"({cursor.score}", "+inf", start=0, num=limit + 1)
+    if counts_key_name:
+        pipe.hgetall(counts_key_name)
+    rows = pipe.execute()
+    counts = rows.pop() if counts_key_name else None
+
+    if cursor is None:
+        candidates = rows[0]
+    elif cursor.direction == OLDER:
+        candidates = sorted((m for m in rows[0] if m < cursor.job_id), reverse=True) + rows[1]
+    else:
+        candidates = sorted(m for m in rows[0] if m > cursor.job_id) + rows[1]
+    page = candidates[:limit]
+    if cursor is not None and cursor.direction == NEWER:
+        page.reverse()
+    return page, len(candidates) > limit, counts
+
+
+# User value: fingerprints one history page so an unchanged reload can be answered with 304.
+def jobs_list_etag(email: str, history_version, query: tuple) -> str:
+    lazy = is_lazy_download_urls_enabled()
+    # Eager pages carry signed URLs; roll the tag before a cached URL stops being reusable.
+    return strong_etag("jobs", email, history_version or "0", *query, int(lazy), "" if lazy else url_freshness_bucket())
+
+
 @router.get("/jobs")
 # User value: supports list_jobs so the OCR/transcription journey stays clear and reliable.
 def list_jobs(
+    http_response: Response,
     user=Depends(verify_google_token),
     job_type: str | None = Query(default=None, description="Filter by job type, e.g. TRANSCRIPTION/OCR"),
     status: str | None = Query(default=None, description="Filter by status, e.g. COMPLETED/FAILED/CANCELLED"),
     limit: int | None = Query(default=None, ge=1, le=200, description="Page size for load-more"),
     offset: int = Query(default=0, ge=0, description="Offset for load-more"),
     include_counts: bool = Query(default=False, description="Include counts_by_status in response"),
+    cursor: str | None = Query(default=None, description="Opaque next_cursor/prev_cursor from a previous page; empty for the first page"),
+    if_none_match: str | None = Header(default=None),
 ):
     email = user["email"].lower()
+    owner = user_ref(r, email)
     status_norm = status.strip().upper() if status else None
     job_type_norm = job_type.strip().upper() if job_type else None
 
+    page_cursor = None
+    if cursor is not None:
+        if not is_job_indexes_enabled():
+            raise HTTPException(status_code=400, detail="Cursor pagination is not enabled")
+        if cursor:
+            try:
+                page_cursor = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if is_conditional_get_enabled():
+        etag = jobs_list_etag(
+            email,
+            r.get(history_version_key(owner)),
+            # Offset pages keep the tags they had before cursors existed.
+            (job_type_norm, status_norm, limit, offset, include_counts) + (() if cursor is None else (cursor,)),
+        )
+        if etag_matches(if_none_match, etag):
+            incr("api_conditional_get_total", route="jobs", result="not_modified")
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+        http_response.headers["ETag"] = etag
+        http_response.headers["Cache-Control"] = "private, no-cache"
+        incr("api_conditional_get_total", route="jobs", result="modified")
+
     log_stage(
         job_id="jobs-list",
         stage="JOBS_LIST",
@@ -72,54 +279,89 @@ def list_jobs(
         include_counts=include_counts,
     )
 
-    user_jobs_key = f"user_jobs:{email}"
-    total_user_jobs = r.llen(user_jobs_key)
-
-    # User value: supports enrich so the OCR/transcription journey stays clear and reliable.
-    def enrich(job_id: str, data: dict) -> dict:
-        if not data.get("request_id"):
-            rid = get_request_id()
-            if rid:
-                data["request_id"] = rid
-        output_path = data.get("output_path")
-        if output_path and output_path.startswith("gs://"):
-            path = output_path.replace("gs://", "")
-            bucket, blob = path.split("/", 1)
-            filename = data.get("output_filename") or os.path.basename(blob) or "transcript.txt"
-
-            signed_url = generate_signed_url(
-                bucket_name=bucket,
-                blob_path=blob,
-                expiration_minutes=60,
-                download_filename=filename,
+    user_jobs_key = f"user_jobs:{owner}"
+    live_jobs = total_user_jobs = r.llen(user_jobs_key)
+    if is_job_archive_reads_enabled():
+        total_user_jobs += r.llen(archived_jobs_key(owner))
+
+    # User value: hands out cursors for the first and last job on a page so the client can page either way.
+    def cursor_links(items: list[dict], *, older: bool, newer: bool) -> tuple[str | None, str | None]:
+        positioned = [item for item in items if item.get("created_ts")]
+        if not positioned:
+            return None, None
+        first, last = positioned[0], positioned[-1]
+        next_cursor = encode_cursor(PageCursor(last["created_ts"], last["job_id"], OLDER)) if older else None
+        prev_cursor = encode_cursor(PageCursor(first["created_ts"], first["job_id"], NEWER)) if newer else None
+        return next_cursor, prev_cursor
+
+    if cursor is not None:
+        limit = limit or 50
+        index_key = index_key_for(owner, status=status_norm, job_type=job_type_norm, unfiltered=time_index_key(owner))
+        page_job_ids, more, counts = _cursor_page(
+            index_key, page_cursor, limit, counts_key(owner) if include_counts else None
+        )
+
+        details_rows = _job_details(email, owner, page_job_ids)
+
+        items = []
+        for idx, data in enumerate(details_rows):
+            if not data:
+                continue
+            items.append(enrich_job(page_job_ids[idx], data))
+        _attach_download_urls(items)
+
+        going_newer = page_cursor is not None and page_cursor.direction == NEWER
+        next_cursor, prev_cursor = cursor_links(
+            items,
+            older=more if not going_newer else True,
+            newer=(page_cursor is not None) if not going_newer else more,
+        )
+        response = {
+            "items": items,
+            "offset": None,
+            "limit": limit,
+            "next_offset": None,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "has_more": next_cursor is not None,
+            "total": None,
+        }
+        if counts is not None:
+            response["total"], response["counts_by_status"], response["counts_by_type"] = _counts_from_hash(
+                counts, status=status_norm, job_type=job_type_norm, total_user_jobs=total_user_jobs
             )
 
-            data["output_path"] = signed_url
-            data["download_url"] = signed_url
-
-        data["job_id"] = job_id
-        trace_raw = data.get("recovery_trace")
-        if not isinstance(trace_raw, list):
-            text = str(trace_raw or "").strip()
-            if text:
-                try:
-                    parsed = json.loads(text)
-                    data["recovery_trace"] = parsed if isinstance(parsed, list) else []
-                except Exception:
-                    data["recovery_trace"] = []
-            else:
-                data["recovery_trace"] = []
-        return data
+        incr(
+            "api_jobs_list_total",
+            mode="cursor",
+            include_counts="true" if include_counts else "false",
+            filtered="true" if (status_norm or job_type_norm) else "false",
+        )
+        log_stage(
+            job_id="jobs-list",
+            stage="JOBS_LIST",
+            event="COMPLETED",
+            user=email,
+            returned_count=len(items),
+            paginated=True,
+            has_more=response["has_more"],
+            cursor_direction=page_cursor.direction if page_cursor else None,
+            total_user_jobs=total_user_jobs,
+            scanned_count=len(page_job_ids),
+            fast_path=False,
+            indexed=True,
+        )
+        return response
 
     # Backward compatibility: when no pagination requested, return full array.
     if limit is None:
-        job_ids = r.lrange(user_jobs_key, 0, -1)
+        job_ids = _history_range(owner, 0, -1, live_jobs)
         jobs = []
-        for job_id in job_ids:
-            data = r.hgetall(f"job_status:{job_id}")
+        for job_id, data in zip(job_ids, _job_details(email, owner, job_ids)):
             if not data:
                 continue
-            jobs.append(enrich(job_id, data))
+            jobs.append(enrich_job(job_id, data))
+        _attach_download_urls(jobs)
 
         incr("api_jobs_list_total", mode="all", include_counts="false", filtered="false")
         log_stage(
@@ -137,20 +379,18 @@ def list_jobs(
 
     # Fast path for primary UI use-case: paginated, no filters, no counts.
     if not include_counts and not status_norm and not job_type_norm:
-        selected_job_ids = r.lrange(user_jobs_key, offset, offset + limit)
+        selected_job_ids = _history_range(owner, offset, offset + limit, live_jobs)
         has_more = len(selected_job_ids) > limit
         page_job_ids = selected_job_ids[:limit]
 
-        details_pipe = r.pipeline(transaction=False)
-        for job_id in page_job_ids:
-            details_pipe.hgetall(f"job_status:{job_id}")
-        details_rows = details_pipe.execute()
+        details_rows = _job_details(email, owner, page_job_ids)
 
         items = []
         for idx, data in enumerate(details_rows):
             if not data:
                 continue
-            items.append(enrich(page_job_ids[idx], data))
+            items.append(enrich_job(page_job_ids[idx], data))
+        _attach_download_urls(items)
 
         response = {
             "items": items,
@@ -160,6 +400,9 @@ def list_jobs(
             "has_more": has_more,
             "total": None,
         }
+        if has_more and is_job_indexes_enabled():
+            # Lets a client switch from offsets to cursors after the first page.
+            response["next_cursor"] = cursor_links(items, older=True, newer=False)[0]
 
         incr("api_jobs_list_total", mode="paged", include_counts="false", filtered="false")
         log_stage(
@@ -177,76 +420,86 @@ def list_jobs(
         )
         return response
 
-    counts_by_status = {k: 0 for k in TRACKED_HISTORY_STATUSES}
-    counts_by_type = {"TRANSCRIPTION": 0, "OCR": 0}
-
-    selected_job_ids: list[str] = []
-    matched_seen = 0
-    matched_total = 0
-    scanned_count = 0
-
-    job_ids = r.lrange(user_jobs_key, 0, -1)
-
-    if include_counts:
-        meta_pipe = r.pipeline(transaction=False)
-        for job_id in job_ids:
-            meta_pipe.hmget(f"job_status:{job_id}", "status", "job_type", "type")
-        meta_rows = meta_pipe.execute()
+    if is_job_indexes_enabled():
+        page_job_ids, has_more, matched_total, counts_by_status, counts_by_type = _indexed_page(
+            owner,
+            status=status_norm,
+            job_type=job_type_norm,
+            limit=limit,
+            offset=offset,
+            include_counts=include_counts,
+            total_user_jobs=total_user_jobs,
+        )
+        scanned_count = len(page_job_ids)
     else:
-        meta_rows = None
+        counts_by_status = {k: 0 for k in TRACKED_HISTORY_STATUSES}
+        counts_by_type = {"TRANSCRIPTION": 0, "OCR": 0}
+
+        selected_job_ids: list[str] = []
+        matched_seen = 0
+        matched_total = 0
+        scanned_count = 0
 
-    for idx, job_id in enumerate(job_ids):
-        scanned_count += 1
+        job_ids = r.lrange(user_jobs_key, 0, -1)
 
         if include_counts:
-            row = meta_rows[idx]
+            meta_pipe = r.pipeline(transaction=False)
+            for job_id in job_ids:
+                queue_job_fields(meta_pipe, job_id, *META_FIELDS)
+            meta_rows = [decode_job_fields(META_FIELDS, row) for row in meta_pipe.execute()]
         else:
-            row = r.hmget(f"job_status:{job_id}", "status", "job_type", "type")
+            meta_rows = None
 
-        if not row:
-            continue
+        for idx, job_id in enumerate(job_ids):
+            scanned_count += 1
 
-        row_status = (row[0] or "").upper()
-        row_type = (row[1] or row[2] or "").upper()
-        if include_counts and row_type in counts_by_type:
-            counts_by_type[row_type] += 1
+            if include_counts:
+                row = meta_rows[idx]
+            else:
+                row = read_job_fields(r, job_id, *META_FIELDS)
 
-        if job_type_norm and row_type != job_type_norm:
-            continue
+            if not row:
+                continue
 
-        if include_counts and row_status in counts_by_status:
-            counts_by_status[row_status] += 1
+            row_status = (row["status"] or "").upper()
+            row_type = (row["job_type"] or row["type"] or "").upper()
+            if include_counts and row_type in counts_by_type:
+                counts_by_type[row_type] += 1
 
-        if status_norm and row_status != status_norm:
-            continue
+            if job_type_norm and row_type != job_type_norm:
+                continue
 
-        matched_total += 1
+            if include_counts and row_status in counts_by_status:
+                counts_by_status[row_status] += 1
 
-        if matched_seen < offset:
-            matched_seen += 1
-            continue
+            if status_norm and row_status != status_norm:
+                continue
 
-        if len(selected_job_ids) < (limit + 1):
-            selected_job_ids.append(job_id)
-            matched_seen += 1
-            continue
+            matched_total += 1
 
-        if not include_counts:
-            break
+            if matched_seen < offset:
+                matched_seen += 1
+                continue
 
-    has_more = len(selected_job_ids) > limit
-    page_job_ids = selected_job_ids[:limit]
+            if len(selected_job_ids) < (limit + 1):
+                selected_job_ids.append(job_id)
+                matched_seen += 1
+                continue
+
+            if not include_counts:
+                break
+
+        has_more = len(selected_job_ids) > limit
+        page_job_ids = selected_job_ids[:limit]
 
-    details_pipe = r.pipeline(transaction=False)
-    for job_id in page_job_ids:
-        details_pipe.hgetall(f"job_status:{job_id}")
-    details_rows = details_pipe.execute()
+    details_rows = _job_details(email, owner, page_job_ids)
 
     items = []
     for idx, data in enumerate(details_rows):
         if not data:
             continue
-        items.append(enrich(page_job_ids[idx], data))
+        items.append(enrich_job(page_job_ids[idx], data))
+    _attach_download_urls(items)
 
     if include_counts:
         has_more = (offset + len(items)) < matched_total
@@ -263,6 +516,8 @@ def list_jobs(
     if include_counts:
         response["counts_by_status"] = counts_by_status
         response["counts_by_type"] = counts_by_type
+    if has_more and is_job_indexes_enabled():
+        response["next_cursor"] = cursor_links(items, older=True, newer=False)[0]
 
     incr(
         "api_jobs_list_total",
@@ -283,45 +538,208 @@ def list_jobs(
         scanned_count=scanned_count,
         matched_total=matched_total,
         fast_path=False,
+        indexed=is_job_indexes_enabled(),
     )
     return response
 
 
+# User value: tells users their job already finished instead of failing the cancel request.
+def _cancel_noop(job_id: str, email: str, status: str) -> dict:
+    incr("api_jobs_cancel_noop_total", status=status)
+    log_stage(
+        job_id=job_id,
+        stage="JOB_CANCEL",
+        event="COMPLETED",
+        user=email,
+        status=status,
+        message="already_finished",
+    )
+    return {
+        "job_id": job_id,
+        "status": status,
+        "message": "Job already finished",
+    }
+
+
+@router.get("/jobs/active")
+# User value: lists the user's unfinished jobs from one set read, so the UI's polling loop stays cheap.
+def list_active_jobs(
+    http_response: Response,
+    user=Depends(verify_google_token),
+    if_none_match: str | None = Header(default=None),
+):
+    if not is_active_jobs_set_enabled():
+        raise HTTPException(status_code=404, detail="Active jobs view is disabled")
+    email = user["email"].lower()
+    owner = user_ref(r, email)
+
+    if is_conditional_get_enabled():
+        # Every job write bumps the history version, so it also covers status, stage and progress here.
+        etag = strong_etag("jobs-active", email, r.get(history_version_key(owner)) or "0")
+        if etag_matches(if_none_match, etag):
+            incr("api_conditional_get_total", route="jobs_active", result="not_modified")
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+        http_response.headers["ETag"] = etag
+        http_response.headers["Cache-Control"] = "private, no-cache"
+        incr("api_conditional_get_total", route="jobs_active", result="modified")
+
+    job_ids = sorted(r.smembers(active_jobs_key(owner)))
+    items = []
+    for job_id, data in zip(job_ids, read_jobs(r, job_ids)):
+        # A member that finished or vanished without the set catching up; the sweeper removes it.
+        if not data or not owns(data.get("user"), email, owner):
+            continue
+        if str(data.get("status") or "").strip().upper() in TERMINAL_STATUSES:
+            continue
+        data["user"] = email
+        items.append(enrich_job(job_id, data))
+    items.sort(key=lambda item: (str(item.get("created_at") or ""), item["job_id"]), reverse=True)
+
+    incr("api_jobs_active_total")
+    log_stage(
+        job_id="jobs-active",
+        stage="JOBS_ACTIVE",
+        event="COMPLETED",
+        user=email,
+        returned_count=len(items),
+        stale_count=len(job_ids) - len(items),
+    )
+    return {"items": items, "count": len(items)}
+
+
+@router.get("/jobs/export")
+# User value: downloads the user's entire job history as NDJSON or CSV without waiting for one huge response.
+def export_jobs(
+    user=Depends(verify_google_token),
+    export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    include_urls: bool = Query(default=False, description="Sign download URLs (slower); otherwise link /jobs/{id}/download"),
+):
+    email = user["email"].lower()
+    owner = user_ref(r, email)
+    incr("api_jobs_export_total", format=export_format, include_urls="true" if include_urls else "false")
+    log_stage(job_id="jobs-export", stage="JOBS_EXPORT", event="STARTED", user=email, format=export_format, include_urls=include_urls)
+
+    # User value: yields one formatted chunk per batch so memory stays flat however long the history is.
+    def rows():
+        exported = 0
+        sources = [f"user_jobs:{owner}"]
+        fill_missing = None
+        if is_job_archive_reads_enabled():
+            sources.append(archived_jobs_key(owner))
+
+            # User value: supports fill_missing so the OCR/transcription journey stays clear and reliable.
+            def fill_missing(job_ids: list[str]) -> dict[str, dict]:
+                return load_archived_jobs(r, email, job_ids, owner=owner)
+
+        batches = (batch for key in sources for batch in iter_job_batches(r, key, JOBS_EXPORT_BATCH_SIZE, fill_missing))
+        for batch in batches:
+            items = [enrich_job(job_id, {**data, "user": email}) for job_id, data in batch]
+            if include_urls:
+                _attach_download_urls(items)
+            else:
+                for item in items:
+                    if download_target(item):
+                        item["output_path"] = download_link(item["job_id"])
+                        item["download_url"] = item["output_path"]
+            yield ndjson_chunk(items) if export_format == "ndjson" else csv_chunk(items, header=exported == 0)
+            exported += len(items)
+        if export_format == "csv" and exported == 0:
+            yield csv_chunk([], header=True)
+        incr("api_jobs_export_items_total", amount=exported)
+        log_stage(job_id="jobs-export", stage="JOBS_EXPORT", event="COMPLETED", user=email, format=export_format, exported_count=exported)
+
+    return StreamingResponse(
+        rows(),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="jobs.{export_format}"',
+            "Cache-Control": "private, no-store",
+        },
+    )
+
+
+@router.get("/jobs/events")
+# User value: pushes status, stage and progress changes for the user's active jobs over one connection.
+async def stream_job_events(
+    request: Request,
+    user=Depends(verify_google_token),
+    last_event_id: str | None = Header(default=None),
+):
+    if not is_job_events_stream_enabled():
+        raise HTTPException(status_code=404, detail="Job events stream is disabled")
+    email = user["email"].lower()
+    incr("api_jobs_events_streams_total", resumed="true" if last_event_id else "false")
+    log_stage(job_id="jobs-events", stage="JOBS_EVENTS", event="STARTED", user=email, last_event_id=last_event_id)
+    ar = get_async_redis()
+    return StreamingResponse(
+        user_job_events(
+            ar,
+            get_job_change_hub(),
+            await user_ref_async(ar, email),
+            last_event_id=last_event_id,
+            is_disconnected=request.is_disconnected,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/jobs/{job_id}/download")
+# User value: sends users straight to their finished result, signing the link only when they ask for it.
+def download_job_output(job_id: str, user=Depends(verify_google_token)):
+    email = user["email"].lower()
+    owner = user_ref(r, email)
+    job_user, status, output_path, output_filename = read_job_fields(
+        r, job_id, "user", "status", "output_path", "output_filename"
+    ).values()
+    if job_user is None and status is None and is_job_archive_reads_enabled():
+        archived = load_archived_jobs(r, email, [job_id], owner=owner).get(job_id) or {}
+        job_user, status, output_path, output_filename = (
+            archived.get(name) for name in ("user", "status", "output_path", "output_filename")
+        )
+    if job_user is None and status is None:
+        incr("api_jobs_download_failed_total", reason="not_found")
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not owns(job_user, email, owner):
+        incr("api_jobs_download_failed_total", reason="forbidden")
+        log_stage(job_id=job_id, stage="JOB_DOWNLOAD", event="FAILED", user=email, error="Forbidden")
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    target = download_target({"output_path": output_path, "output_filename": output_filename})
+    if not target:
+        incr("api_jobs_download_failed_total", reason="not_ready")
+        raise HTTPException(status_code=409, detail=f"Output not available (status={str(status or 'UNKNOWN').upper()})")
+
+    url = signed_download_urls([target])[0]
+    incr("api_jobs_download_total")
+    log_stage(job_id=job_id, stage="JOB_DOWNLOAD", event="COMPLETED", user=email)
+    return RedirectResponse(url, status_code=302, headers={"Cache-Control": "private, no-store"})
+
+
 @router.post("/jobs/{job_id}/cancel")
 # User value: lets users stop running OCR/transcription jobs quickly.
 def cancel_job(job_id: str, user=Depends(verify_google_token)):
     email = user["email"].lower()
     log_stage(job_id=job_id, stage="JOB_CANCEL", event="STARTED", user=email)
 
-    key = f"job_status:{job_id}"
-    data = r.hgetall(key)
+    key = job_key(job_id)
+    data = read_job_fields(r, job_id, "user", "status", "request_id")
+    user_value, status_value = data["user"], data["status"]
 
-    if not data:
+    if user_value is None and status_value is None:
         incr("api_jobs_cancel_failed_total", reason="not_found")
         log_stage(job_id=job_id, stage="JOB_CANCEL", event="FAILED", user=email, error="Job not found")
         raise HTTPException(status_code=404, detail="Job not found")
 
-    if data.get("user") != email:
+    owner = user_ref(r, email)
+    if not owns(data.get("user"), email, owner):
         incr("api_jobs_cancel_failed_total", reason="forbidden")
         log_stage(job_id=job_id, stage="JOB_CANCEL", event="FAILED", user=email, error="Forbidden")
         raise HTTPException(status_code=403, detail="Forbidden")
 
     status = (data.get("status") or "").upper()
     if status in TERMINAL_STATUSES:
-        incr("api_jobs_cancel_noop_total", status=status)
-        log_stage(
-            job_id=job_id,
-            stage="JOB_CANCEL",
-            event="COMPLETED",
-            user=email,
-            status=status,
-            message="already_finished",
-        )
-        return {
-            "job_id": job_id,
-            "status": status,
-            "message": "Job already finished",
-        }
+        return _cancel_noop(job_id, email, status)
     ok, current_status, _ = transition_hset(
         r,
         key=key,
@@ -333,8 +751,12 @@ def cancel_job(job_id: str, user=Depends(verify_google_token)):
         },
         context="JOB_CANCEL",
         request_id=str(data.get("request_id") or ""),
+        user_email=data["user"],
     )
     if not ok:
+        if current_status in TERMINAL_STATUSES:
+            # A worker finished the job between our read and the compare-and-set.
+            return _cancel_noop(job_id, email, current_status)
         raise HTTPException(status_code=409, detail=f"Invalid status transition to CANCELLED from {current_status or 'NONE'}")
     incr("api_jobs_cancel_requested_total", prior_status=status or "UNKNOWN")
 
@@ -353,12 +775,12 @@ def retry_job(job_id: str, user=Depends(verify_google_token)):
     request_id = get_request_id()
     log_stage(job_id=job_id, stage="JOB_RETRY", event="STARTED", user=email, request_id=request_id)
 
-    key = f"job_status:{job_id}"
-    data = r.hgetall(key)
+    data = read_job(r, job_id)
     if not data:
         incr("api_jobs_retry_failed_total", reason="not_found")
         raise HTTPException(status_code=404, detail="Job not found")
-    if data.get("user") != email:
+    owner = user_ref(r, email)
+    if not owns(data.get("user"), email, owner):
         incr("api_jobs_retry_failed_total", reason="forbidden")
         raise HTTPException(status_code=403, detail="Forbidden")
 
@@ -383,37 +805,45 @@ def retry_job(job_id: str, user=Depends(verify_google_token)):
 
     retry_job_id = uuid.uuid4().hex
     now_ts = datetime.utcnow().isoformat()
-    retry_key = f"job_status:{retry_job_id}"
+    retry_key = job_key(retry_job_id)
 
     try:
         ok, current_status, _ = transition_hset(
             r,
             key=retry_key,
-            mapping={
-                "status": JOB_STATUS_QUEUED,
-                "stage": "Queued",
-                "progress": 0,
-                "user": email,
-                "job_type": job_type,
-                "source": source,
-                "input_filename": input_filename,
-                "input_size_bytes": input_size_bytes,
-                "output_filename": output_filename,
-                "total_pages": total_pages,
-                "duration_sec": media_duration,
-                "created_at": now_ts,
-                "updated_at": now_ts,
-                "request_id": request_id or "",
-                "content_subtype": content_subtype,
-                "retry_of_job_id": job_id,
-            },
+            mapping=encode_job(
+                {
+                    "status": JOB_STATUS_QUEUED,
+                    "stage": "Queued",
+                    "progress": 0,
+                    "user": owner,
+                    "job_type": job_type,
+                    "source": source,
+                    "input_filename": input_filename,
+                    "input_size_bytes": input_size_bytes,
+                    "output_filename": output_filename,
+                    "total_pages": total_pages,
+                    "duration_sec": media_duration,
+                    "created_at": now_ts,
+                    "updated_at": now_ts,
+                    "request_id": request_id or "",
+                    "content_subtype": content_subtype,
+                    "retry_of_job_id": job_id,
+                },
+                compact=is_compact_job_records_enabled(),
+            ),
             context="JOB_RETRY_INIT",
             request_id=request_id or "",
         )
         if not ok:
             raise HTTPException(status_code=409, detail=f"Invalid status transition to QUEUED from {current_status or 'NONE'}")
 
-        r.lpush(f"user_jobs:{email}", retry_job_id)
+        # Bump the history version only once the new job is listed, so no reader caches a page without it.
+        history_pipe = r.pipeline(transaction=True)
+        history_pipe.lpush(f"user_jobs:{owner}", retry_job_id)
+        history_pipe.incr(history_version_key(owner))
+        history_version = history_pipe.execute()[-1]
+        r.publish(history_version_key(owner), history_version)
         payload = {
             "job_id": retry_job_id,
             "job_type": job_type,
@@ -1,15 +1,14 @@
 # User value: This route gives users clear visibility into queue load and worker scheduling behavior.
 import os
-import redis
 from fastapi import APIRouter, Depends
 
 from services.auth import verify_google_token
 from services.feature_flags import is_queue_orchestration_enabled
+from services.redis_client import get_redis
 
 router = APIRouter()
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-r = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+r = get_redis()
 
 QUEUE_MODE = str(os.getenv("QUEUE_MODE", "single")).strip().lower() or "single"
 QUEUE_NAME = os.getenv("QUEUE_NAME", "doc_jobs")
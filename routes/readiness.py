@@ -1,24 +1,23 @@
 # User value: This file helps users get reliable OCR/transcription results with clear processing behavior.
 import os
 
-import redis
 from fastapi import APIRouter
 from google.cloud import storage
 
+from services.redis_client import get_redis
+
 router = APIRouter()
 
 
 @router.get("/ready")
 # User value: supports ready so the OCR/transcription journey stays clear and reliable.
 def ready():
-    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     bucket_name = os.getenv("GCS_BUCKET_NAME", "")
 
     checks = {"redis": "unknown", "gcs": "unknown"}
 
     try:
-        rc = redis.Redis.from_url(redis_url, decode_responses=True)
-        rc.ping()
+        get_redis().ping()
         checks["redis"] = "ok"
     except Exception as exc:
         checks["redis"] = f"error:{exc.__class__.__name__}"
@@ -1,21 +1,33 @@
 # User value: This file helps users get reliable OCR/transcription results with clear processing behavior.
 # routes/status.py
-import os
 import json
-import redis
+import os
+import time
 from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
 
+from repositories.job_records import read_job, read_job_fields, read_job_fields_async, read_jobs
+from repositories.user_directory import owns, user_ref, user_ref_async
 from services.auth import verify_google_token
-from services.gcs import generate_signed_url
+from services.feature_flags import is_conditional_get_enabled, is_job_archive_reads_enabled, is_status_long_poll_enabled
+from services.job_archive import load_archived_jobs
+from services.job_events import get_job_change_hub, wait_for_job_version
+from services.redis_client import get_async_redis, get_redis
+from services.signed_urls import download_target, signed_download_url, signed_download_urls, url_freshness_bucket
 from services.user_assist import derive_user_assist
+from schemas.requests import StatusBatchRequest
+from utils.etag import if_none_match as etag_matches, strong_etag
+from utils.metrics import incr, observe_ms
 from utils.request_id import get_request_id
 from utils.stage_logging import log_stage
 
 router = APIRouter()
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-r = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+r = get_redis()
+
+STATUS_LONG_POLL_MAX_SEC = int(os.getenv("STATUS_LONG_POLL_MAX_SEC", "25"))
+STATUS_BATCH_MAX_IDS = int(os.getenv("STATUS_BATCH_MAX_IDS", "100"))
 
 
 # User value: normalizes data so users see consistent OCR/transcription results.
@@ -68,58 +80,117 @@ def compute_queue_wait_sec(data: dict) -> int:
         data["recovery_trace"] = []
 
 
+# User value: fills in the derived status fields (request id, failure text, recovery trace, assist hint) users see.
+def shape_status(data: dict) -> dict:
+    if not data.get("request_id"):
+        rid = get_request_id()
+        if rid:
+            data["request_id"] = rid
+
+    normalize_failure_fields(data)
+    normalize_recovery_fields(data)
+    queue_wait_sec = compute_queue_wait_sec(data)
+    assist = derive_user_assist(
+        status=str(data.get("status") or ""),
+        error_code=str(data.get("error_code") or ""),
+        stage=str(data.get("stage") or ""),
+        queue_wait_sec=queue_wait_sec,
+    )
+    if assist:
+        data["assist"] = assist
+    return data
+
+
+# Everything a status response depends on besides the fields themselves; read with one HMGET.
+ETAG_FIELDS = ("user", "version", "updated_at", "status", "stage", "progress", "error_code", "created_at", "output_path")
+
+
+# User value: fingerprints a job's status so an unchanged poll can be answered with 304.
+def status_etag(job_id: str, fields: dict) -> str:
+    assist = derive_user_assist(
+        status=str(fields.get("status") or ""),
+        error_code=str(fields.get("error_code") or ""),
+        stage=str(fields.get("stage") or ""),
+        queue_wait_sec=compute_queue_wait_sec(fields),
+    )
+    # A signed download_url is part of the body; roll the tag before a cached URL stops being reusable.
+    url_bucket = url_freshness_bucket() if str(fields.get("output_path") or "").startswith("gs://") else ""
+    return strong_etag(
+        "status",
+        job_id,
+        *(fields.get(name) for name in ETAG_FIELDS),
+        json.dumps(assist, sort_keys=True),
+        url_bucket,
+    )
+
+
+# User value: holds a status request open until the job changes, so clients learn about progress without re-polling.
+async def _wait_for_change(job_id: str, email: str, since_version: int, wait_sec: int) -> None:
+    ar = get_async_redis()
+    # Only the owner may wait; everyone else gets the usual 404/403 straight away.
+    if not owns((await read_job_fields_async(ar, job_id, "user"))["user"], email, await user_ref_async(ar, email)):
+        return
+    started = time.perf_counter()
+    version = await wait_for_job_version(get_job_change_hub(), ar, job_id, since_version, wait_sec)
+    observe_ms("api_status_long_poll_wait_ms", (time.perf_counter() - started) * 1000.0)
+    incr("api_status_long_poll_total", result="changed" if version != since_version else "timeout")
+
+
 @router.get("/status/{job_id}")
 # User value: loads latest OCR/transcription data so users see current status.
-def get_status(
+async def get_status(
     job_id: str,
+    response: Response,
     user=Depends(verify_google_token),
+    if_none_match: str | None = Header(default=None),
+    wait: int = Query(default=0, ge=0, description="Seconds to wait for the job to change (long poll)"),
+    since_version: int | None = Query(default=None, ge=0, description="Job version the client already has"),
 ):
+    if wait and since_version is not None and is_status_long_poll_enabled():
+        await _wait_for_change(job_id, user["email"].lower(), since_version, min(wait, STATUS_LONG_POLL_MAX_SEC))
+    return await run_in_threadpool(read_status, job_id, response, user, if_none_match)
+
+
+# User value: loads latest OCR/transcription data so users see current status.
+def read_status(job_id: str, response: Response, user: dict, if_none_match: str | None = None):
     email = user["email"].lower()
+    owner = user_ref(r, email)
     log_stage(job_id=job_id, stage="STATUS_READ", event="STARTED", user=email)
 
-    key = f"job_status:{job_id}"
-    data = r.hgetall(key)
+    conditional = is_conditional_get_enabled()
+    if conditional and if_none_match:
+        fields = read_job_fields(r, job_id, *ETAG_FIELDS)
+        # Missing or foreign jobs fall through to the full read for the usual 404/403.
+        if owns(fields.get("user"), email, owner):
+            etag = status_etag(job_id, fields)
+            if etag_matches(if_none_match, etag):
+                incr("api_conditional_get_total", route="status", result="not_modified")
+                log_stage(job_id=job_id, stage="STATUS_READ", event="COMPLETED", user=email, not_modified=True)
+                return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+    data = read_job(r, job_id)
+    if not data and is_job_archive_reads_enabled():
+        data = load_archived_jobs(r, email, [job_id], owner=owner).get(job_id)
 
     if not data:
         log_stage(job_id=job_id, stage="STATUS_READ", event="FAILED", user=email, error="Job not found")
         raise HTTPException(status_code=404, detail="Job not found")
 
-    if data.get("user") != email:
+    if not owns(data.get("user"), email, owner):
         log_stage(job_id=job_id, stage="STATUS_READ", event="FAILED", user=email, error="Forbidden")
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    if not data.get("request_id"):
-        rid = get_request_id()
-        if rid:
-            data["request_id"] = rid
-
-    output_path = data.get("output_path")
-
-    if output_path and output_path.startswith("gs://"):
-        path = output_path.replace("gs://", "")
-        bucket, blob = path.split("/", 1)
-        filename = data.get("output_filename") or os.path.basename(blob) or "transcript.txt"
+    if conditional:
+        response.headers["ETag"] = status_etag(job_id, data)
+        response.headers["Cache-Control"] = "private, no-cache"
+        incr("api_conditional_get_total", route="status", result="modified")
 
-        signed_url = generate_signed_url(
-            bucket_name=bucket,
-            blob_path=blob,
-            expiration_minutes=60,
-            download_filename=filename,
-        )
-
-        data["download_url"] = signed_url
-
-    normalize_failure_fields(data)
-    normalize_recovery_fields(data)
-    queue_wait_sec = compute_queue_wait_sec(data)
-    assist = derive_user_assist(
-        status=str(data.get("status") or ""),
-        error_code=str(data.get("error_code") or ""),
-        stage=str(data.get("stage") or ""),
-        queue_wait_sec=queue_wait_sec,
-    )
-    if assist:
-        data["assist"] = assist
+    target = download_target(data)
+    if target:
+        data["download_url"] = signed_download_url(target)
+    # After the ETag, which fingerprints the stored value; responses always show the email.
+    data["user"] = email
+    shape_status(data)
 
     log_stage(
         job_id=job_id,
@@ -135,3 +206,52 @@ def get_status(
     )
 
     return data
+
+
+@router.post("/status/batch")
+# User value: loads many jobs' status in one request and one Redis round trip, e.g. for a dashboard of in-flight jobs.
+def get_status_batch(body: StatusBatchRequest, user=Depends(verify_google_token)):
+    email = user["email"].lower()
+    owner = user_ref(r, email)
+    job_ids = list(dict.fromkeys(job_id.strip() for job_id in body.job_ids if job_id.strip()))
+    if len(job_ids) > STATUS_BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {STATUS_BATCH_MAX_IDS} job_ids per request")
+    log_stage(job_id="status-batch", stage="STATUS_BATCH_READ", event="STARTED", user=email, requested_count=len(job_ids))
+
+    rows = read_jobs(r, job_ids)
+    if is_job_archive_reads_enabled():
+        missing = [job_id for job_id, data in zip(job_ids, rows) if not data]
+        if missing:
+            archived = load_archived_jobs(r, email, missing, owner=owner)
+            rows = [data or archived.get(job_id) for job_id, data in zip(job_ids, rows)]
+
+    jobs: dict[str, dict] = {}
+    errors: dict[str, str] = {}
+    for job_id, data in zip(job_ids, rows):
+        if not data:
+            errors[job_id] = "Job not found"
+        elif not owns(data.get("user"), email, owner):
+            errors[job_id] = "Forbidden"
+        else:
+            data["user"] = email
+            jobs[job_id] = data
+
+    wanted = [(data, target) for data in jobs.values() for target in [download_target(data)] if target]
+    if wanted:
+        for (data, _), url in zip(wanted, signed_download_urls([target for _, target in wanted])):
+            data["download_url"] = url
+    for data in jobs.values():
+        shape_status(data)
+
+    incr("api_status_batch_total")
+    incr("api_status_batch_items_total", amount=len(job_ids))
+    log_stage(
+        job_id="status-batch",
+        stage="STATUS_BATCH_READ",
+        event="COMPLETED",
+        user=email,
+        requested_count=len(job_ids),
+        returned_count=len(jobs),
+        error_count=len(errors),
+    )
+    return {"jobs": jobs, "errors": errors}
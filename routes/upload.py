@@ -1,9 +1,17 @@
 # User value: This file helps users get reliable OCR/transcription results with clear processing behavior.
 # routes/upload.py
-from fastapi import APIRouter, UploadFile, File, Form, Depends, Header
+from fastapi import APIRouter, UploadFile, File, Form, Depends, Header, HTTPException, Query, Request
 
+from schemas.requests import DirectUploadCompleteRequest, DirectUploadInitRequest
+from schemas.responses import DirectUploadInitResponse
 from services.auth import verify_google_token
-from services.upload_orchestrator import submit_upload_job
+from services.feature_flags import is_direct_upload_enabled, is_streaming_upload_enabled
+from services.upload_orchestrator import (
+    complete_direct_upload,
+    init_direct_upload,
+    submit_streamed_upload_job,
+    submit_upload_job,
+)
 from utils.request_id import get_request_id
 
 router = APIRouter()
@@ -20,7 +28,7 @@ async def upload(
     user=Depends(verify_google_token),
 ):
     request_id = get_request_id()
-    return submit_upload_job(
+    return await submit_upload_job(
         file=file,
         job_type=job_type,
         email=user["email"],
@@ -29,3 +37,87 @@ async def upload(
         media_duration_sec=media_duration_sec,
         content_subtype=content_subtype,
     )
+
+
+@router.post("/upload/stream")
+# User value: streams large user files directly to storage so big uploads start processing sooner.
+async def upload_stream(
+    request: Request,
+    job_type: str | None = Query(default=None, alias="type"),
+    content_subtype: str | None = Query(default=None),
+    idempotency_key: str | None = Header(default=None, alias="X-Idempotency-Key"),
+    media_duration_sec: float | None = Header(default=None, alias="X-Media-Duration-Sec"),
+    content_length: int | None = Header(default=None, alias="Content-Length"),
+    user=Depends(verify_google_token),
+):
+    if not is_streaming_upload_enabled():
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error_code": "FEATURE_DISABLED",
+                "error_message": "Streaming upload is disabled",
+            },
+        )
+
+    request_id = get_request_id()
+    return await submit_streamed_upload_job(
+        body=request.stream(),
+        content_type_header=request.headers.get("content-type"),
+        content_length=content_length,
+        job_type=job_type,
+        email=user["email"],
+        request_id=request_id,
+        idempotency_key=idempotency_key,
+        media_duration_sec=media_duration_sec,
+        content_subtype=content_subtype,
+    )
+
+
+# User value: supports _require_direct_upload so the OCR/transcription journey stays clear and reliable.
+def _require_direct_upload() -> None:
+    if not is_direct_upload_enabled():
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error_code": "FEATURE_DISABLED",
+                "error_message": "Direct upload is disabled",
+            },
+        )
+
+
+@router.post("/upload/init", response_model=DirectUploadInitResponse)
+# User value: returns a storage upload URL so large files go straight to GCS instead of through the API.
+async def upload_init(
+    payload: DirectUploadInitRequest,
+    request: Request,
+    idempotency_key: str | None = Header(default=None, alias="X-Idempotency-Key"),
+    user=Depends(verify_google_token),
+):
+    _require_direct_upload()
+    request_id = get_request_id()
+    return await init_direct_upload(
+        filename=payload.filename,
+        content_type=payload.mime_type,
+        file_size_bytes=payload.file_size_bytes,
+        job_type=payload.job_type,
+        email=user["email"],
+        request_id=request_id,
+        idempotency_key=idempotency_key,
+        crc32c=payload.crc32c,
+        media_duration_sec=payload.media_duration_sec,
+        pdf_page_count=payload.pdf_page_count,
+        content_subtype=payload.content_subtype,
+        upload_mode=payload.upload_mode,
+        origin=request.headers.get("origin"),
+    )
+
+
+@router.post("/upload/complete")
+# User value: verifies a direct upload and queues the job so processing starts as soon as the file lands.
+async def upload_complete(
+    payload: DirectUploadCompleteRequest,
+    user=Depends(verify_google_token),
+):
+    _require_direct_upload()
+    request_id = get_request_id()
+    return await complete_direct_upload(job_id=payload.job_id, email=user["email"], request_id=request_id)
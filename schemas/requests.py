@@ -16,3 +16,26 @@ class IntakePrecheckRequest(BaseModel):
     file_size_bytes: Optional[int] = Field(default=None, ge=0)
     media_duration_sec: Optional[float] = Field(default=None, ge=0)
     pdf_page_count: Optional[int] = Field(default=None, ge=1)
+
+
+class DirectUploadInitRequest(BaseModel):
+    # User value: This captures declared file metadata so uploads can go straight to storage after the usual checks.
+    job_type: Literal["OCR", "TRANSCRIPTION"] = Field(..., alias="type")
+    filename: str = Field(..., min_length=1)
+    mime_type: Optional[str] = None
+    file_size_bytes: int = Field(..., ge=1)
+    crc32c: str = Field(..., min_length=8, max_length=8)
+    media_duration_sec: Optional[float] = Field(default=None, ge=0)
+    pdf_page_count: Optional[int] = Field(default=None, ge=1)
+    content_subtype: Optional[str] = None
+    upload_mode: Literal["PUT", "RESUMABLE"] = "PUT"
+
+
+class DirectUploadCompleteRequest(BaseModel):
+    # User value: This identifies the finished direct upload so the job can be verified and queued.
+    job_id: str = Field(..., min_length=1, max_length=64)
+
+
+class StatusBatchRequest(BaseModel):
+    # User value: This lists the jobs a dashboard wants refreshed in one call.
+    job_ids: list[str] = Field(..., min_length=1)
@@ -9,6 +9,18 @@ class JobCreatedResponse(BaseModel):
     status: str = "QUEUED"
 
 
+class DirectUploadInitResponse(BaseModel):
+    # User value: gives the client a ready-to-use storage URL so large files upload without passing through the API.
+    job_id: str
+    request_id: Optional[str] = None
+    reused: bool = False
+    upload_mode: Optional[Literal["PUT", "RESUMABLE"]] = None
+    upload_url: Optional[str] = None
+    upload_method: Optional[str] = None
+    required_headers: dict = Field(default_factory=dict)
+    expires_in_sec: Optional[int] = None
+
+
 class JobStatusResponse(BaseModel):
     # User value: shares live status so users know exactly where OCR/transcription stands.
     job_id: str
@@ -0,0 +1,65 @@
+# User value: This file runs the retention job that moves old finished jobs to monthly archives and frees their Redis memory.
+# scripts/archive_jobs.py
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositories.user_directory import email_for, user_ref  # noqa: E402
+from services.job_archive import JOB_RETENTION_DAYS, archive_user  # noqa: E402
+from services.redis_client import get_redis  # noqa: E402
+
+
+# User value: parses options, archives one user or every user, and prints what was (or would be) reclaimed.
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Archive finished jobs older than the retention window to gzip NDJSON in GCS and remove their Redis keys."
+    )
+    parser.add_argument("--days", type=int, default=JOB_RETENTION_DAYS, help="retention window (JOB_RETENTION_DAYS)")
+    parser.add_argument("--email", help="only archive this user")
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="only report jobs, archives and bytes that would be reclaimed")
+    parser.add_argument("--verbose", action="store_true", help="print one line per user")
+    args = parser.parse_args()
+    if args.days <= 0:
+        parser.error("--days must be positive")
+
+    r = get_redis()
+    cutoff_ts = time.time() - args.days * 86400
+    if args.email:
+        owners = [user_ref(r, args.email.strip().lower())]
+    else:
+        owners = (key[len("user_jobs:"):] for key in r.scan_iter(match="user_jobs:*", count=1000))
+
+    totals = {"users": 0, "jobs": 0, "archives": 0, "reclaim_bytes": 0, "archived": 0, "skipped": 0}
+    for owner in owners:
+        # Archive objects are named by email, so they stay readable across the user id migration.
+        email = email_for(r, owner)
+        if not email:
+            print(f"skipping {owner}: no email recorded for this user id")
+            continue
+        report = archive_user(r, email, owner=owner, cutoff_ts=cutoff_ts, dry_run=args.dry_run, batch=args.batch)
+        if not report["jobs"]:
+            continue
+        totals["users"] += 1
+        for name in ("jobs", "archives", "reclaim_bytes", "archived", "skipped"):
+            totals[name] += report[name]
+        if args.verbose:
+            print(
+                f"{email}: {report['jobs']} jobs in {report['archives']} monthly archives, "
+                f"~{report['reclaim_bytes']} bytes, archived {report['archived']}, skipped {report['skipped']}"
+            )
+
+    verb = "would reclaim" if args.dry_run else "reclaimed"
+    print(
+        f"{totals['jobs']} jobs older than {args.days} days for {totals['users']} users "
+        f"in {totals['archives']} monthly archives; {verb} ~{totals['reclaim_bytes']} bytes of Redis memory"
+    )
+    if not args.dry_run:
+        print(f"archived {totals['archived']} jobs; skipped {totals['skipped']} that changed during the run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# User value: This file lets operators block or unblock users so the change reaches every API worker at once.
+# scripts/auth_blocklist.py
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.blocklist import BLOCKED_SET, publish_block, publish_unblock  # noqa: E402
+from services.redis_client import get_redis  # noqa: E402
+from services.session_tokens import SESSION_EPOCH_KEY  # noqa: E402
+
+
+# User value: parses the command and applies it through the same publish path the API listens to.
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the API user blocklist.")
+    parser.add_argument("action", choices=["block", "unblock", "list"])
+    parser.add_argument("email", nargs="?")
+    args = parser.parse_args()
+
+    r = get_redis()
+    if args.action == "list":
+        for email in sorted(r.smembers(BLOCKED_SET)):
+            print(email)
+        return
+    if not args.email:
+        parser.error("email is required for block/unblock")
+    if args.action == "block":
+        # Revoke API session tokens first so the blocked user cannot keep polling with one.
+        epoch = r.incr(SESSION_EPOCH_KEY)
+        publish_block(r, args.email)
+        print(f"blocked {args.email.strip().lower()} (session epoch now {epoch})")
+    else:
+        publish_unblock(r, args.email)
+        print(f"unblocked {args.email.strip().lower()}")
+
+
+if __name__ == "__main__":
+    main()
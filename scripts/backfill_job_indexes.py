@@ -0,0 +1,113 @@
+# User value: This file builds (or repairs) the per-user status/type indexes and counters from the job hashes themselves.
+# scripts/backfill_job_indexes.py
+import argparse
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from redis.exceptions import WatchError  # noqa: E402
+
+from repositories.job_records import decode_job_fields, job_key, queue_job_fields  # noqa: E402
+from repositories.user_directory import user_ref  # noqa: E402
+from services.redis_client import get_redis  # noqa: E402
+from utils.job_indexes import BACKFILL_JOB_LUA, counts_field, counts_key  # noqa: E402
+
+# Fields read per job when the counters hash is rebuilt.
+COUNT_FIELDS = ("user", "status", "job_type", "type")
+
+
+# User value: converts a stored created_at into the index score so old jobs sort where users expect them.
+def created_ts(created_at) -> str:
+    text = str(created_at or "").strip()
+    if not text:
+        return ""
+    try:
+        dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return ""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return f"{dt.timestamp():.6f}"
+
+
+# User value: indexes every job of one user in pipelined batches; safe to re-run.
+def backfill_user(r, script, user_jobs_key: str, batch: int) -> int:
+    job_ids = r.lrange(user_jobs_key, 0, -1)
+    indexed = 0
+    for start in range(0, len(job_ids), batch):
+        chunk = job_ids[start : start + batch]
+        read = r.pipeline(transaction=False)
+        for job_id in chunk:
+            queue_job_fields(read, job_id, "created_at")
+        created = [decode_job_fields(("created_at",), row)["created_at"] for row in read.execute()]
+        write = r.pipeline(transaction=False)
+        for job_id, created_at in zip(chunk, created):
+            script(keys=[job_key(job_id)], args=[created_ts(created_at)], client=write)
+        indexed += sum(int(result or 0) for result in write.execute())
+    return indexed
+
+
+# User value: recomputes a user's counters hash from the job hashes, retrying if a status change lands meanwhile.
+def repair_user_counts(r, email: str, job_ids: list, batch: int, attempts: int = 5) -> dict:
+    key = counts_key(email)
+    for _ in range(attempts):
+        with r.pipeline(transaction=True) as pipe:
+            try:
+                pipe.watch(key)
+                counts: Counter = Counter()
+                for start in range(0, len(job_ids), batch):
+                    read = r.pipeline(transaction=False)
+                    for job_id in job_ids[start : start + batch]:
+                        queue_job_fields(read, job_id, *COUNT_FIELDS)
+                    for row in read.execute():
+                        user, status, job_type, legacy_type = decode_job_fields(COUNT_FIELDS, row).values()
+                        if not user or user != email or not status:
+                            continue
+                        status = status.strip().upper()
+                        job_type = (job_type or legacy_type or "").upper()
+                        counts[counts_field(status=status)] += 1
+                        if job_type:
+                            counts[counts_field(job_type=job_type)] += 1
+                            counts[counts_field(status=status, job_type=job_type)] += 1
+                pipe.multi()
+                pipe.delete(key)
+                if counts:
+                    pipe.hset(key, mapping=dict(counts))
+                pipe.execute()
+                return dict(counts)
+            except WatchError:
+                continue
+    raise RuntimeError(f"counts for {email} kept changing; re-run later")
+
+
+# User value: parses options and backfills one user or every user.
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build user_jobs_by_status/type indexes and user_job_counts for existing jobs (also repairs drift)."
+    )
+    parser.add_argument("--email", help="only backfill this user")
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--counts-only", action="store_true", help="only recompute the counters hash")
+    args = parser.parse_args()
+
+    r = get_redis()
+    script = r.register_script(BACKFILL_JOB_LUA)
+    if args.email:
+        keys = [f"user_jobs:{user_ref(r, args.email.strip().lower())}"]
+    else:
+        keys = r.scan_iter(match="user_jobs:*", count=1000)
+    users = jobs = 0
+    for key in keys:
+        if not args.counts_only:
+            jobs += backfill_user(r, script, key, args.batch)
+        email = key[len("user_jobs:"):]
+        repair_user_counts(r, email, r.lrange(key, 0, -1), args.batch)
+        users += 1
+    print(f"indexed {jobs} jobs for {users} users")
+
+
+if __name__ == "__main__":
+    main()
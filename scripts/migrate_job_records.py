@@ -0,0 +1,103 @@
+# User value: This file converts stored jobs to (or back from) the compact record format so Redis holds more history per GB.
+# scripts/migrate_job_records.py
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositories.job_records import (  # noqa: E402
+    COMPACT_JOB_LUA,
+    EXPAND_JOB_LUA,
+    JOB_KEY_PREFIX,
+    RECORD_FIELD,
+    compact_fields,
+    expand_fields,
+)
+from schemas.job_contract import TERMINAL_STATUSES  # noqa: E402
+from services.redis_client import get_redis  # noqa: E402
+
+
+# User value: supports _plain_bytes so the OCR/transcription journey stays clear and reliable.
+def _plain_bytes(fields: dict) -> int:
+    return sum(len(str(name).encode("utf-8")) + len(str(value).encode("utf-8")) for name, value in fields.items())
+
+
+# User value: plans (and unless dry-running, applies) the conversion for one batch of job hashes.
+def migrate_batch(r, script, keys: list[str], *, expand: bool, dry_run: bool) -> dict:
+    read = r.pipeline(transaction=False)
+    for key in keys:
+        read.hgetall(key)
+    rows = read.execute()
+
+    stats = {"jobs": 0, "changed": 0, "skipped": 0, "bytes_before": 0, "bytes_after": 0}
+    write = r.pipeline(transaction=False)
+    planned = 0
+    for key, raw in zip(keys, rows):
+        if not raw:
+            continue
+        stats["jobs"] += 1
+        version = raw.get("version") or ""
+        if expand:
+            restored = expand_fields(raw)
+            if not restored and RECORD_FIELD not in raw:
+                continue
+            before = {RECORD_FIELD: raw[RECORD_FIELD]}
+            after = restored
+            args = [version, *[item for pair in restored.items() for item in pair]]
+        else:
+            terminal = str(raw.get("status") or "").strip().upper() in TERMINAL_STATUSES
+            record, replaced = compact_fields(raw, terminal=terminal)
+            if not replaced:
+                continue
+            before = {name: raw[name] for name in (*replaced, RECORD_FIELD) if name in raw}
+            after = {RECORD_FIELD: record}
+            args = [version, record, *replaced]
+        # Listpack entries cost a few bytes of framing each on top of name and value.
+        stats["bytes_before"] += _plain_bytes(before) + 4 * len(before)
+        stats["bytes_after"] += _plain_bytes(after) + 4 * len(after)
+        stats["changed"] += 1
+        if not dry_run:
+            script(keys=[key], args=args, client=write)
+            planned += 1
+    if planned:
+        applied = sum(int(result or 0) for result in write.execute())
+        stats["skipped"] += planned - applied
+        stats["changed"] -= planned - applied
+    return stats
+
+
+# User value: parses options and walks every job hash in SCAN batches.
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Pack job hashes into the compact record format (finished jobs: all cold fields; others: write-once fields)."
+    )
+    parser.add_argument("--expand", action="store_true", help="undo: write packed fields back as plain hash fields")
+    parser.add_argument("--dry-run", action="store_true", help="only report how many jobs and bytes would change")
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    r = get_redis()
+    script = r.register_script(EXPAND_JOB_LUA if args.expand else COMPACT_JOB_LUA)
+    totals = {"jobs": 0, "changed": 0, "skipped": 0, "bytes_before": 0, "bytes_after": 0}
+    batch: list[str] = []
+    for key in r.scan_iter(match=f"{JOB_KEY_PREFIX}*", count=1000):
+        batch.append(key)
+        if len(batch) >= args.batch:
+            for name, value in migrate_batch(r, script, batch, expand=args.expand, dry_run=args.dry_run).items():
+                totals[name] += value
+            batch = []
+    if batch:
+        for name, value in migrate_batch(r, script, batch, expand=args.expand, dry_run=args.dry_run).items():
+            totals[name] += value
+
+    verb = "would change" if args.dry_run else "changed"
+    saved = totals["bytes_before"] - totals["bytes_after"]
+    print(
+        f"scanned {totals['jobs']} jobs; {verb} {totals['changed']}, skipped {totals['skipped']} written meanwhile; "
+        f"field bytes {totals['bytes_before']} -> {totals['bytes_after']} ({saved:+d} saved)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# User value: This file moves every per-user Redis key from the user's email to their short id (or back) without losing history.
+# scripts/migrate_user_ids.py
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositories.job_records import job_key  # noqa: E402
+from repositories.user_directory import USER_IDS_KEY, email_for, is_user_id, user_id  # noqa: E402
+from schemas.job_contract import JOB_STATUSES, JOB_TYPES  # noqa: E402
+from services.job_archive import archive_pointer_key, archived_jobs_key  # noqa: E402
+from services.redis_client import get_redis  # noqa: E402
+from utils.job_indexes import (  # noqa: E402
+    active_jobs_key,
+    counts_key,
+    status_index_key,
+    time_index_key,
+    type_index_key,
+    type_status_index_key,
+)
+from utils.status_machine import history_version_key  # noqa: E402
+
+# KEYS: source key, destination key. ARGV: merge mode.
+# Folds the source into the destination and deletes it, so keys written under the new name since the
+# flag was turned on are kept. Lists are appended (the source holds the older jobs), sorted sets and
+# sets and archive pointers are unioned, counters are added, and one-off values (idempotency keys) keep the destination.
+MERGE_USER_KEY_LUA = """
+local kind = redis.call('TYPE', KEYS[1])['ok']
+if kind == 'none' then
+  return 0
+end
+local mode = ARGV[1]
+if kind == 'list' then
+  local total = redis.call('LLEN', KEYS[1])
+  for start = 0, total - 1, 500 do
+    redis.call('RPUSH', KEYS[2], unpack(redis.call('LRANGE', KEYS[1], start, start + 499)))
+  end
+elseif kind == 'zset' then
+  redis.call('ZUNIONSTORE', KEYS[2], 2, KEYS[2], KEYS[1], 'AGGREGATE', 'MAX')
+elseif kind == 'set' then
+  redis.call('SUNIONSTORE', KEYS[2], KEYS[2], KEYS[1])
+elseif kind == 'hash' then
+  local pairs_ = redis.call('HGETALL', KEYS[1])
+  for i = 1, #pairs_, 2 do
+    if mode == 'sum' then
+      redis.call('HINCRBY', KEYS[2], pairs_[i], pairs_[i + 1])
+    else
+      redis.call('HSETNX', KEYS[2], pairs_[i], pairs_[i + 1])
+    end
+  end
+elseif kind == 'string' then
+  local ttl = redis.call('PTTL', KEYS[1])
+  if mode == 'sum' then
+    redis.call('INCRBY', KEYS[2], redis.call('GET', KEYS[1]))
+    if ttl > 0 and redis.call('PTTL', KEYS[2]) < 0 then
+      redis.call('PEXPIRE', KEYS[2], ttl)
+    end
+  elseif redis.call('EXISTS', KEYS[2]) == 0 then
+    redis.call('SET', KEYS[2], redis.call('GET', KEYS[1]))
+    if ttl > 0 then
+      redis.call('PEXPIRE', KEYS[2], ttl)
+    end
+  end
+end
+redis.call('DEL', KEYS[1])
+return 1
+"""
+
+# KEYS: job hash. ARGV: old owner, new owner. Only rewrites jobs still stored under the old owner.
+SET_JOB_OWNER_LUA = """
+if redis.call('HGET', KEYS[1], 'user') ~= ARGV[1] then
+  return 0
+end
+redis.call('HSET', KEYS[1], 'user', ARGV[2])
+return 1
+"""
+
+# Per-user keys with a fixed name, and how each is merged. Daily counters and idempotency keys carry
+# a suffix and are found with one SCAN each instead.
+SCANNED_PREFIXES = {"user_daily_jobs:": "sum", "upload_idempotency:": "keep"}
+
+
+# User value: lists every fixed-name key a user owns, paired with its merge mode.
+def user_keys(owner: str) -> list[tuple[str, str]]:
+    keys = [
+        (f"user_jobs:{owner}", "list"),
+        (archived_jobs_key(owner), "list"),
+        (archive_pointer_key(owner), "keep"),
+        (counts_key(owner), "sum"),
+        (history_version_key(owner), "sum"),
+        (time_index_key(owner), "zset"),
+        (active_jobs_key(owner), "set"),
+    ]
+    for status in JOB_STATUSES:
+        keys.append((status_index_key(owner, status), "zset"))
+    for job_type in JOB_TYPES:
+        keys.append((type_index_key(owner, job_type), "zset"))
+        for status in JOB_STATUSES:
+            keys.append((type_status_index_key(owner, job_type, status), "zset"))
+    return keys
+
+
+# User value: moves one user's keys and job ownership from one name to the other; safe to re-run.
+def migrate_user(r, merge, set_owner, old: str, new: str, *, dry_run: bool, batch: int) -> dict:
+    stats = {"keys": 0, "jobs": 0}
+    pipe = r.pipeline(transaction=False)
+    for key, _ in user_keys(old):
+        pipe.exists(key)
+    present = [(key, mode) for (key, mode), found in zip(user_keys(old), pipe.execute()) if found]
+    stats["keys"] = len(present)
+
+    live_key = f"user_jobs:{new if not dry_run else old}"
+    archived_key = archived_jobs_key(new if not dry_run else old)
+    if not dry_run:
+        pipe = r.pipeline(transaction=False)
+        for (key, mode), (new_key, _) in zip(user_keys(old), user_keys(new)):
+            if (key, mode) in present:
+                merge(keys=[key, new_key], args=[mode], client=pipe)
+        pipe.execute()
+
+    for list_key in (live_key, archived_key):
+        total = r.llen(list_key)
+        for start in range(0, total, batch):
+            job_ids = r.lrange(list_key, start, start + batch - 1)
+            pipe = r.pipeline(transaction=False)
+            for job_id in job_ids:
+                if dry_run:
+                    pipe.hget(job_key(job_id), "user")
+                else:
+                    set_owner(keys=[job_key(job_id)], args=[old, new], client=pipe)
+            results = pipe.execute()
+            stats["jobs"] += sum(1 for value in results if (value == old if dry_run else int(value or 0)))
+    return stats
+
+
+# User value: parses options, migrates each user, then the suffixed per-user keys in one SCAN per prefix.
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Rename per-user keys (user_jobs, indexes, counters, quotas, idempotency) from email to user id."
+    )
+    parser.add_argument("--reverse", action="store_true", help="undo: rename id-keyed users back to their email")
+    parser.add_argument("--email", help="only migrate this user")
+    parser.add_argument("--dry-run", action="store_true", help="only report how many users, keys and jobs would move")
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    r = get_redis()
+    merge = r.register_script(MERGE_USER_KEY_LUA)
+    set_owner = r.register_script(SET_JOB_OWNER_LUA)
+
+    # User value: picks the name a user's keys move to, assigning ids on the way forward (except in a dry run).
+    def target(owner: str):
+        if args.reverse:
+            return email_for(r, owner) if is_user_id(owner) else None
+        if is_user_id(owner):
+            return None
+        if args.dry_run:
+            return r.hget(USER_IDS_KEY, owner) or "(new id)"
+        return user_id(r, owner)
+
+    if args.email:
+        email = args.email.strip().lower()
+        owners = [r.hget(USER_IDS_KEY, email) or ""] if args.reverse else [email]
+    else:
+        owners = [key[len("user_jobs:"):] for key in r.scan_iter(match="user_jobs:*", count=1000)]
+
+    totals = {"users": 0, "keys": 0, "jobs": 0, "scanned_keys": 0}
+    for owner in owners:
+        new = target(owner)
+        if not new:
+            continue
+        stats = migrate_user(r, merge, set_owner, owner, new, dry_run=args.dry_run, batch=args.batch)
+        totals["users"] += 1
+        totals["keys"] += stats["keys"]
+        totals["jobs"] += stats["jobs"]
+
+    only = {args.email.strip().lower()} if args.email else None
+    for prefix, mode in SCANNED_PREFIXES.items():
+        pipe = r.pipeline(transaction=False)
+        for key in r.scan_iter(match=f"{prefix}*", count=1000):
+            owner, _, rest = key[len(prefix):].partition(":")
+            new = target(owner)
+            if not new or (only and only.isdisjoint({owner, new})):
+                continue
+            totals["scanned_keys"] += 1
+            if not args.dry_run:
+                merge(keys=[key, f"{prefix}{new}:{rest}"], args=[mode], client=pipe)
+            if len(pipe) >= args.batch:
+                pipe.execute()
+        pipe.execute()
+
+    verb = "would move" if args.dry_run else "moved"
+    direction = "ids to emails" if args.reverse else "emails to ids"
+    print(
+        f"{verb} {totals['users']} users from {direction}: {totals['keys']} keys, "
+        f"{totals['scanned_keys']} quota/idempotency keys, {totals['jobs']} job owners"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# User value: This file repairs drift in the per-user active-jobs sets so quota checks and /jobs/active stay correct.
+# scripts/reconcile_active_jobs.py
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositories.user_directory import user_ref  # noqa: E402
+from services.active_jobs import ACTIVE_JOBS_SWEEP_RECENT, reconcile_user  # noqa: E402
+from services.redis_client import get_redis  # noqa: E402
+from utils.job_indexes import ACTIVE_JOBS_PREFIX  # noqa: E402
+
+
+# User value: parses options, then checks every user with jobs or an active set (or just one user).
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Rebuild active_jobs:{user} from the job hashes: drop finished or missing jobs, add unfinished ones."
+    )
+    parser.add_argument("--email", help="only reconcile this user")
+    parser.add_argument("--recent", type=int, default=ACTIVE_JOBS_SWEEP_RECENT, help="newest jobs per user to check")
+    parser.add_argument("--dry-run", action="store_true", help="only report the drift")
+    parser.add_argument("--verbose", action="store_true", help="print one line per user with drift")
+    args = parser.parse_args()
+    if args.recent <= 0:
+        parser.error("--recent must be positive")
+
+    r = get_redis()
+    if args.email:
+        owners = [user_ref(r, args.email.strip().lower())]
+    else:
+        owners = {key[len("user_jobs:"):] for key in r.scan_iter(match="user_jobs:*", count=1000)}
+        owners |= {key[len(ACTIVE_JOBS_PREFIX):] for key in r.scan_iter(match=f"{ACTIVE_JOBS_PREFIX}*", count=1000)}
+
+    totals = {"users": 0, "checked": 0, "added": 0, "removed": 0}
+    for owner in sorted(owners):
+        report = reconcile_user(r, owner, recent=args.recent, dry_run=args.dry_run)
+        totals["users"] += 1
+        for name in ("checked", "added", "removed"):
+            totals[name] += report[name]
+        if args.verbose and (report["added"] or report["removed"]):
+            print(f"{owner}: checked {report['checked']}, added {report['added']}, removed {report['removed']}")
+
+    verb = "would add" if args.dry_run else "added"
+    print(
+        f"checked {totals['checked']} jobs for {totals['users']} users; "
+        f"{verb} {totals['added']}, {'would remove' if args.dry_run else 'removed'} {totals['removed']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
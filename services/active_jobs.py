@@ -0,0 +1,66 @@
+# User value: This file keeps each user's set of unfinished jobs accurate, so quota checks and the active-jobs view stay right.
+# services/active_jobs.py
+import os
+
+from repositories.job_records import decode_job_fields, job_key, queue_job_fields
+from schemas.job_contract import TERMINAL_STATUSES
+from utils.job_indexes import active_jobs_key
+from utils.metrics import incr
+
+# How many of the newest jobs in user_jobs the sweeper checks for jobs missing from the set.
+ACTIVE_JOBS_SWEEP_RECENT = int(os.getenv("ACTIVE_JOBS_SWEEP_RECENT", "200"))
+
+# KEYS: job hash, active set. ARGV: job_id, owner.
+# Decides membership from the job hash itself, in the same atomic step, so a status write that lands
+# during a sweep is never undone. Returns 1 if it added the job, -1 if it removed it, 0 if unchanged.
+RECONCILE_ACTIVE_JOB_LUA = (
+    "local TERMINAL = {"
+    + ", ".join(f"{status} = true" for status in TERMINAL_STATUSES)
+    + """}
+local f = redis.call('HMGET', KEYS[1], 'user', 'status')
+local status = string.upper(string.match(f[2] or '', '^%s*(.-)%s*$'))
+if f[1] == ARGV[2] and status ~= '' and not TERMINAL[status] then
+  return redis.call('SADD', KEYS[2], ARGV[1])
+end
+return -redis.call('SREM', KEYS[2], ARGV[1])
+"""
+)
+
+
+# User value: repairs one user's active set against their job hashes (or only reports the drift) and returns what changed.
+def reconcile_user(r, owner: str, *, recent: int = ACTIVE_JOBS_SWEEP_RECENT, dry_run: bool = False) -> dict:
+    key = active_jobs_key(owner)
+    members = set(r.smembers(key))
+    candidates = list(dict.fromkeys([*members, *r.lrange(f"user_jobs:{owner}", 0, recent - 1)]))
+    report = {"owner": owner, "checked": len(candidates), "added": 0, "removed": 0}
+    if not candidates:
+        return report
+
+    if dry_run:
+        pipe = r.pipeline(transaction=False)
+        for job_id in candidates:
+            queue_job_fields(pipe, job_id, "user", "status")
+        for job_id, row in zip(candidates, pipe.execute()):
+            row = decode_job_fields(("user", "status"), row)
+            status = str(row["status"] or "").strip().upper()
+            active = row["user"] == owner and status != "" and status not in TERMINAL_STATUSES
+            if active and job_id not in members:
+                report["added"] += 1
+            elif not active and job_id in members:
+                report["removed"] += 1
+        return report
+
+    script = r.register_script(RECONCILE_ACTIVE_JOB_LUA)
+    pipe = r.pipeline(transaction=False)
+    for job_id in candidates:
+        script(keys=[job_key(job_id), key], args=[job_id, owner], client=pipe)
+    for result in pipe.execute():
+        result = int(result or 0)
+        if result > 0:
+            report["added"] += 1
+        elif result < 0:
+            report["removed"] += 1
+    for change in ("added", "removed"):
+        if report[change]:
+            incr("active_jobs_drift_total", amount=report[change], change=change)
+    return report
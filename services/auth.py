@@ -2,34 +2,63 @@
 # services/auth.py
 import os
 import time
-import redis
 from redis.exceptions import RedisError
 from fastapi import HTTPException, Header
-from google.oauth2 import id_token
+from google.auth import jwt
 from google.auth.transport import requests
 
+from services.auth_cache import GoogleCertCache, VerifiedTokenCache, google_certs_fetcher
+from services.blocklist import BLOCKED_SET, BlocklistSnapshot, publish_block, publish_unblock
+from services.feature_flags import is_blocklist_snapshot_enabled, is_session_tokens_enabled
+from services.redis_client import get_redis
+from services.session_tokens import (
+    SESSION_EPOCH_KEY,
+    SessionEpochCache,
+    is_session_token,
+    mint_session_token,
+    verify_session_token,
+)
+
 # -----------------------------------------------------------------------------
 # Config
 # -----------------------------------------------------------------------------
 
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 TOKEN_CLOCK_SKEW_SEC = int(os.getenv("TOKEN_CLOCK_SKEW_SEC", "60"))
 ALLOWED_ISSUERS = {
     "https://accounts.google.com",
     "accounts.google.com",
 }
+GOOGLE_CERTS_URL = os.getenv("GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs")
+GOOGLE_CERTS_DEFAULT_TTL_SEC = int(os.getenv("GOOGLE_CERTS_DEFAULT_TTL_SEC", "300"))
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024"))
+AUTH_SESSION_SECRET = os.getenv("AUTH_SESSION_SECRET", "")
+AUTH_SESSION_TTL_SEC = int(os.getenv("AUTH_SESSION_TTL_SEC", "900"))
+AUTH_SESSION_EPOCH_REFRESH_SEC = int(os.getenv("AUTH_SESSION_EPOCH_REFRESH_SEC", "5"))
+AUTH_BLOCKLIST_RESYNC_SEC = int(os.getenv("AUTH_BLOCKLIST_RESYNC_SEC", "60"))
+AUTH_BLOCKLIST_MAX_STALE_SEC = int(os.getenv("AUTH_BLOCKLIST_MAX_STALE_SEC", "600"))
 
 if not GOOGLE_CLIENT_ID:
     raise RuntimeError("GOOGLE_CLIENT_ID not set")
 
-r = redis.Redis.from_url(REDIS_URL, decode_responses=True)
-
-# -----------------------------------------------------------------------------
-# Redis Keys
-# -----------------------------------------------------------------------------
-
-BLOCKED_SET = "auth:users:blocked"
+r = get_redis()
+
+# One transport session and one cert cache per process: certs are refetched only when
+# Google's Cache-Control max-age runs out, and verified tokens are reused until expiry.
+_cert_cache = GoogleCertCache(
+    google_certs_fetcher(requests.Request(), GOOGLE_CERTS_URL),
+    default_ttl_sec=GOOGLE_CERTS_DEFAULT_TTL_SEC,
+)
+_token_cache = VerifiedTokenCache(max_entries=AUTH_TOKEN_CACHE_SIZE)
+# Bumping auth:session_epoch revokes every API session token within one refresh window.
+_session_epoch = SessionEpochCache(lambda: r.get(SESSION_EPOCH_KEY), AUTH_SESSION_EPOCH_REFRESH_SEC)
+# A block published by another worker also drops the cached epoch so that user's session dies at once.
+_blocklist = BlocklistSnapshot(
+    r,
+    resync_sec=AUTH_BLOCKLIST_RESYNC_SEC,
+    max_stale_sec=AUTH_BLOCKLIST_MAX_STALE_SEC,
+    on_block=lambda _email: _session_epoch.invalidate(),
+)
 
 # -----------------------------------------------------------------------------
 # Auth Logic (DEFAULT ALLOW)
@@ -45,17 +74,44 @@ def _forbidden(error_code: str, message: str) -> HTTPException:
     return HTTPException(status_code=403, detail={"error_code": error_code, "error_message": message})
 
 
+# User value: checks the token signature against cached Google certs, refetching once if Google rotated keys.
+def _decode_google_id_token(token: str) -> dict:
+    try:
+        return jwt.decode(token, certs=_cert_cache.get(), audience=GOOGLE_CLIENT_ID)
+    except ValueError as exc:
+        if "Certificate for key id" not in str(exc):
+            raise
+    return jwt.decode(token, certs=_cert_cache.refresh_for_unknown_key(), audience=GOOGLE_CLIENT_ID)
+
+
+# User value: rejects blocked users even when their token signature is served from cache.
+def _check_blocklist(email: str) -> None:
+    if is_blocklist_snapshot_enabled():
+        blocked = _blocklist.contains(email)
+        if blocked is not None:
+            if blocked:
+                raise _forbidden("AUTH_USER_BLOCKED", "User access blocked")
+            return
+        # Snapshot not loaded yet or too stale: fall through to a direct lookup.
+    try:
+        if r.sismember(BLOCKED_SET, email):
+            raise _forbidden("AUTH_USER_BLOCKED", "User access blocked")
+    except RedisError:
+        raise _redis_unavailable()
+
+
 # User value: supports verify_google_id_token so the OCR/transcription journey stays clear and reliable.
 def verify_google_id_token(token: str) -> dict:
     if not token:
         raise _unauthorized("AUTH_MISSING_TOKEN", "Missing token")
 
+    cached = _token_cache.get(token)
+    if cached is not None:
+        _check_blocklist(str(cached["email"]).lower())
+        return cached
+
     try:
-        payload = id_token.verify_oauth2_token(
-            token,
-            requests.Request(),
-            GOOGLE_CLIENT_ID,
-        )
+        payload = _decode_google_id_token(token)
     except Exception:
         raise _unauthorized("AUTH_INVALID_TOKEN", "Invalid Google token")
 
@@ -96,28 +152,84 @@ def verify_google_id_token(token: str) -> dict:
     # -------------------------------------------------------------------------
     # Blocklist check (ONLY restriction)
     # -------------------------------------------------------------------------
-    try:
-        if r.sismember(BLOCKED_SET, email):
-            raise _forbidden("AUTH_USER_BLOCKED", "User access blocked")
-    except RedisError:
-        raise HTTPException(
-            status_code=503,
-            detail={
-                "error_code": "INFRA_REDIS",
-                "error_message": "Authentication backend temporarily unavailable",
-            },
-        )
+    _check_blocklist(email)
 
     # -------------------------------------------------------------------------
     # Default allow
     # -------------------------------------------------------------------------
+    _token_cache.put(token, payload, exp - TOKEN_CLOCK_SKEW_SEC)
     return payload
 
 
+# User value: supports _redis_unavailable so the OCR/transcription journey stays clear and reliable.
+def _redis_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail={
+            "error_code": "INFRA_REDIS",
+            "error_message": "Authentication backend temporarily unavailable",
+        },
+    )
+
+
+# User value: issues a short-lived API session token after a successful Google sign-in, when enabled.
+def issue_session_token(info: dict) -> dict | None:
+    if not is_session_tokens_enabled():
+        return None
+    try:
+        epoch = _session_epoch.get()
+    except RedisError:
+        raise _redis_unavailable()
+    token, expires_at = mint_session_token(
+        secret=AUTH_SESSION_SECRET,
+        email=str(info["email"]).lower(),
+        name=info.get("name"),
+        epoch=epoch,
+        ttl_sec=AUTH_SESSION_TTL_SEC,
+    )
+    return {"session_token": token, "session_expires_at": expires_at}
+
+
+# User value: revokes every outstanding API session token, e.g. right after blocking a user.
+def revoke_all_sessions() -> int:
+    epoch = int(r.incr(SESSION_EPOCH_KEY))
+    _session_epoch.invalidate()
+    return epoch
+
+
+# User value: starts this worker's blocklist listener when the in-memory snapshot is enabled.
+def start_blocklist_sync() -> None:
+    if is_blocklist_snapshot_enabled():
+        _blocklist.start()
+
+
+# User value: blocks a user everywhere: revokes sessions first, then notifies every worker's snapshot.
+def block_user(email: str) -> None:
+    revoke_all_sessions()
+    publish_block(r, email)
+
+
+# User value: restores access for a previously blocked user on every worker.
+def unblock_user(email: str) -> None:
+    publish_unblock(r, email)
+
+
+# User value: accepts an API session token with one HMAC check instead of a Google signature check.
+def _verify_session(token: str) -> dict:
+    try:
+        epoch = _session_epoch.get()
+    except RedisError:
+        raise _redis_unavailable()
+    claims = verify_session_token(token, secret=AUTH_SESSION_SECRET, epoch=epoch)
+    if claims is None:
+        raise _unauthorized("AUTH_INVALID_SESSION", "Session expired or revoked; sign in again")
+    return claims
+
+
 # User value: supports verify_google_token so the OCR/transcription journey stays clear and reliable.
 def verify_google_token(authorization: str = Header(None)) -> dict:
     """
-    Verifies Google ID token.
+    Verifies Google ID token (or an API session token from /auth/google).
     Access is ALLOWED by default.
     Only explicitly blocked users are denied.
     """
@@ -125,4 +237,6 @@ def verify_google_token(authorization: str = Header(None)) -> dict:
         raise _unauthorized("AUTH_MISSING_AUTH_HEADER", "Missing Authorization header")
 
     token = authorization.replace("Bearer ", "").strip()
+    if is_session_tokens_enabled() and is_session_token(token):
+        return _verify_session(token)
     return verify_google_id_token(token)
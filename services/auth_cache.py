@@ -0,0 +1,152 @@
+# User value: This file keeps sign-in checks fast by reusing Google signing certs and already-verified tokens.
+# services/auth_cache.py
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from utils.metrics import incr, observe_ms
+
+logger = logging.getLogger("api.auth")
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)", re.IGNORECASE)
+
+
+# User value: supports cache_ttl_from_headers so the OCR/transcription journey stays clear and reliable.
+def cache_ttl_from_headers(headers, default_ttl_sec: int) -> int:
+    cache_control = ""
+    for name, value in dict(headers or {}).items():
+        if str(name).lower() == "cache-control":
+            cache_control = str(value)
+            break
+    if "no-store" in cache_control.lower() or "no-cache" in cache_control.lower():
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    if not match:
+        return default_ttl_sec
+    return int(match.group(1))
+
+
+class GoogleCertCache:
+    # User value: fetches Google's signing certs once per max-age window instead of on every request.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(
+        self,
+        fetch: Callable[[], tuple[dict, dict]],
+        *,
+        default_ttl_sec: int = 300,
+        min_refresh_interval_sec: int = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._fetch = fetch
+        self._default_ttl_sec = default_ttl_sec
+        self._min_refresh_interval_sec = min_refresh_interval_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._certs: Optional[dict] = None
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+
+    # User value: returns cached certs, refreshing them (one caller at a time) once they expire.
+    def get(self) -> dict:
+        certs = self._certs
+        if certs is not None and self._clock() < self._expires_at:
+            return certs
+        with self._lock:
+            # Another request may have refreshed while we waited for the lock.
+            if self._certs is not None and self._clock() < self._expires_at:
+                return self._certs
+            return self._refresh_locked()
+
+    # User value: refetches certs after a key rotation, but never more often than the minimum interval.
+    def refresh_for_unknown_key(self) -> dict:
+        with self._lock:
+            if self._certs is not None and self._clock() - self._fetched_at < self._min_refresh_interval_sec:
+                return self._certs
+            return self._refresh_locked()
+
+    # User value: supports _refresh_locked so the OCR/transcription journey stays clear and reliable.
+    def _refresh_locked(self) -> dict:
+        started = time.perf_counter()
+        try:
+            certs, headers = self._fetch()
+        except Exception as exc:
+            incr("auth_certs_refresh_total", result="error")
+            if self._certs is None:
+                raise
+            # Keep serving the previous certs; Google rotates keys well before they stop being valid.
+            logger.warning("auth_certs_refresh_failed error=%s serving_stale=1", exc.__class__.__name__)
+            self._expires_at = self._clock() + self._min_refresh_interval_sec
+            return self._certs
+        observe_ms("auth_certs_refresh_ms", (time.perf_counter() - started) * 1000.0)
+        incr("auth_certs_refresh_total", result="ok")
+        now = self._clock()
+        self._certs = certs
+        self._fetched_at = now
+        self._expires_at = now + cache_ttl_from_headers(headers, self._default_ttl_sec)
+        return certs
+
+
+class VerifiedTokenCache:
+    # User value: remembers recently verified tokens so repeat polls skip signature checks.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.time):
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+
+    # User value: supports key_for so the OCR/transcription journey stays clear and reliable.
+    @staticmethod
+    def key_for(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    # User value: returns the verified claims for a token that has not expired yet.
+    def get(self, token: str) -> Optional[dict]:
+        if self._max_entries <= 0:
+            return None
+        key = self.key_for(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, valid_until = entry
+            if self._clock() >= valid_until:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(payload)
+
+    # User value: stores verified claims until the token's expiry, evicting the least recently used entry.
+    def put(self, token: str, payload: dict, valid_until: float) -> None:
+        if self._max_entries <= 0 or valid_until <= self._clock():
+            return
+        key = self.key_for(token)
+        with self._lock:
+            self._entries[key] = (dict(payload), valid_until)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    # User value: supports clear so the OCR/transcription journey stays clear and reliable.
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# User value: builds a fetcher that reads Google's cert endpoint through the google-auth transport.
+def google_certs_fetcher(request, certs_url: str) -> Callable[[], tuple[dict, dict]]:
+    # User value: supports fetch so the OCR/transcription journey stays clear and reliable.
+    def fetch() -> tuple[dict, dict]:
+        response = request(certs_url, method="GET")
+        if response.status != 200:
+            raise RuntimeError(f"cert fetch failed status={response.status}")
+        return json.loads(response.data.decode("utf-8")), dict(response.headers or {})
+
+    return fetch
@@ -0,0 +1,148 @@
+# User value: This file keeps blocked-user checks in memory so sign-in stays fast and survives short Redis outages.
+# services/blocklist.py
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from redis.exceptions import RedisError
+
+from utils.metrics import incr, set_gauge
+
+logger = logging.getLogger("api.auth")
+
+BLOCKED_SET = "auth:users:blocked"
+BLOCKLIST_CHANNEL = "auth:users:blocked:changes"
+
+
+# User value: supports _decode so the OCR/transcription journey stays clear and reliable.
+def _decode(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    return str(value)
+
+
+# User value: blocks a user and tells every API worker immediately.
+def publish_block(r, email: str) -> None:
+    email = email.strip().lower()
+    pipe = r.pipeline(transaction=True)
+    pipe.sadd(BLOCKED_SET, email)
+    pipe.publish(BLOCKLIST_CHANNEL, f"add:{email}")
+    pipe.execute()
+
+
+# User value: unblocks a user and tells every API worker immediately.
+def publish_unblock(r, email: str) -> None:
+    email = email.strip().lower()
+    pipe = r.pipeline(transaction=True)
+    pipe.srem(BLOCKED_SET, email)
+    pipe.publish(BLOCKLIST_CHANNEL, f"remove:{email}")
+    pipe.execute()
+
+
+class BlocklistSnapshot:
+    # User value: holds this worker's copy of the blocklist, kept current by pub/sub and periodic resyncs.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(
+        self,
+        r,
+        *,
+        resync_sec: float = 60.0,
+        max_stale_sec: float = 600.0,
+        on_block: Optional[Callable[[str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._r = r
+        self._resync_sec = resync_sec
+        self._max_stale_sec = max_stale_sec
+        self._on_block = on_block
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._members: frozenset = frozenset()
+        self._loaded_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # User value: answers from memory, or returns None when the copy is too old to trust.
+    def contains(self, email: str) -> Optional[bool]:
+        loaded_at = self._loaded_at
+        if loaded_at is None or self._clock() - loaded_at > self._max_stale_sec:
+            return None
+        return email in self._members
+
+    # User value: replaces the in-memory copy with the full set from Redis.
+    def reload(self) -> None:
+        members = frozenset(_decode(m).lower() for m in (self._r.smembers(BLOCKED_SET) or ()))
+        with self._lock:
+            self._members = members
+            self._loaded_at = self._clock()
+        set_gauge("auth_blocklist_size", len(members))
+        incr("auth_blocklist_resync_total")
+
+    # User value: applies one pub/sub change without a full reload.
+    def apply_message(self, data) -> None:
+        action, _, email = _decode(data).partition(":")
+        email = email.strip().lower()
+        with self._lock:
+            if action == "add" and email:
+                self._members = self._members | {email}
+            elif action == "remove" and email:
+                self._members = self._members - {email}
+            else:
+                return
+        if action == "add" and self._on_block:
+            self._on_block(email)
+
+    # User value: starts the background listener once per process.
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="blocklist-sync", daemon=True)
+        self._thread.start()
+
+    # User value: supports stop so the OCR/transcription journey stays clear and reliable.
+    def stop(self) -> None:
+        self._stop.set()
+
+    # User value: supports _keyspace_channel so the OCR/transcription journey stays clear and reliable.
+    def _keyspace_channel(self) -> str:
+        db = int(self._r.connection_pool.connection_kwargs.get("db", 0) or 0)
+        return f"__keyspace@{db}__:{BLOCKED_SET}"
+
+    # User value: listens for changes and resyncs, reconnecting with backoff when Redis drops.
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = self._r.pubsub(ignore_subscribe_messages=True)
+                # Keyspace events only arrive when the server has notify-keyspace-events enabled;
+                # the explicit channel and periodic resync cover servers where it is not.
+                keyspace = self._keyspace_channel()
+                pubsub.subscribe(BLOCKLIST_CHANNEL, keyspace)
+                # Subscribe first, then load, so no change can slip between the two.
+                self.reload()
+                backoff = 1.0
+                next_resync = self._clock() + self._resync_sec
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message:
+                        if _decode(message.get("channel")) == keyspace:
+                            self.reload()
+                        else:
+                            self.apply_message(message.get("data"))
+                    if self._clock() >= next_resync:
+                        self.reload()
+                        next_resync = self._clock() + self._resync_sec
+            except (RedisError, OSError) as exc:
+                incr("auth_blocklist_sync_errors_total")
+                logger.warning("auth_blocklist_sync_failed error=%s retry_in_sec=%s", exc.__class__.__name__, backoff)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
@@ -14,6 +14,19 @@ FEATURE_DURATION_PAGE_LIMITS = _flag("FEATURE_DURATION_PAGE_LIMITS", False)
 FEATURE_SMART_INTAKE = _flag("FEATURE_SMART_INTAKE", False)
 FEATURE_COST_GUARDRAIL = _flag("FEATURE_COST_GUARDRAIL", True)
 FEATURE_QUEUE_ORCHESTRATION = _flag("FEATURE_QUEUE_ORCHESTRATION", True)
+FEATURE_STREAMING_UPLOAD = _flag("FEATURE_STREAMING_UPLOAD", False)
+FEATURE_DIRECT_UPLOAD = _flag("FEATURE_DIRECT_UPLOAD", False)
+FEATURE_SESSION_TOKENS = _flag("FEATURE_SESSION_TOKENS", False)
+FEATURE_BLOCKLIST_SNAPSHOT = _flag("FEATURE_BLOCKLIST_SNAPSHOT", False)
+FEATURE_LAZY_DOWNLOAD_URLS = _flag("FEATURE_LAZY_DOWNLOAD_URLS", False)
+FEATURE_CONDITIONAL_GET = _flag("FEATURE_CONDITIONAL_GET", False)
+FEATURE_STATUS_LONG_POLL = _flag("FEATURE_STATUS_LONG_POLL", False)
+FEATURE_JOB_EVENTS_STREAM = _flag("FEATURE_JOB_EVENTS_STREAM", False)
+FEATURE_JOB_INDEXES = _flag("FEATURE_JOB_INDEXES", False)
+FEATURE_JOB_ARCHIVE_READS = _flag("FEATURE_JOB_ARCHIVE_READS", False)
+FEATURE_COMPACT_JOB_RECORDS = _flag("FEATURE_COMPACT_JOB_RECORDS", False)
+FEATURE_USER_IDS = _flag("FEATURE_USER_IDS", False)
+FEATURE_ACTIVE_JOBS_SET = _flag("FEATURE_ACTIVE_JOBS_SET", False)
 
 
 # User value: supports is_smart_intake_enabled so users only see intake agent behavior when it is safely enabled.
@@ -29,3 +42,68 @@ def is_cost_guardrail_enabled() -> bool:
 # User value: supports queue orchestration visibility so users can trust queued-job behavior.
 def is_queue_orchestration_enabled() -> bool:
     return FEATURE_QUEUE_ORCHESTRATION
+
+
+# User value: supports streaming upload rollout so large-file users get faster uploads only when it is safely enabled.
+def is_streaming_upload_enabled() -> bool:
+    return FEATURE_STREAMING_UPLOAD
+
+
+# User value: supports direct-to-storage upload rollout so large files skip the API only when it is safely enabled.
+def is_direct_upload_enabled() -> bool:
+    return FEATURE_DIRECT_UPLOAD
+
+
+# User value: supports API session token rollout so polling clients skip Google token checks only when it is safely enabled.
+def is_session_tokens_enabled() -> bool:
+    return FEATURE_SESSION_TOKENS
+
+
+# User value: supports in-memory blocklist rollout so sign-in skips a Redis lookup only when it is safely enabled.
+def is_blocklist_snapshot_enabled() -> bool:
+    return FEATURE_BLOCKLIST_SNAPSHOT
+
+
+# User value: supports lazy download link rollout so job history loads without signing links users never click.
+def is_lazy_download_urls_enabled() -> bool:
+    return FEATURE_LAZY_DOWNLOAD_URLS
+
+
+# User value: supports conditional GET rollout so polling clients get cheap 304s only once workers bump job versions.
+def is_conditional_get_enabled() -> bool:
+    return FEATURE_CONDITIONAL_GET
+
+
+# User value: supports long-poll rollout so status requests wait for changes only when it is safely enabled.
+def is_status_long_poll_enabled() -> bool:
+    return FEATURE_STATUS_LONG_POLL
+
+
+# User value: supports job events stream rollout so history views get pushed updates only when it is safely enabled.
+def is_job_events_stream_enabled() -> bool:
+    return FEATURE_JOB_EVENTS_STREAM
+
+
+# User value: supports indexed listing rollout so filtered history reads the sorted-set indexes only after they are backfilled.
+def is_job_indexes_enabled() -> bool:
+    return FEATURE_JOB_INDEXES
+
+
+# User value: supports archive read-through rollout so jobs moved out of Redis still show up once archiving has started.
+def is_job_archive_reads_enabled() -> bool:
+    return FEATURE_JOB_ARCHIVE_READS
+
+
+# User value: supports compact record rollout so new jobs are packed only once every reader decodes the packed form.
+def is_compact_job_records_enabled() -> bool:
+    return FEATURE_COMPACT_JOB_RECORDS
+
+
+# User value: supports user id rollout so keys switch from emails to short ids only after existing keys are migrated.
+def is_user_ids_enabled() -> bool:
+    return FEATURE_USER_IDS
+
+
+# User value: supports active-jobs set rollout so quota checks and /jobs/active read the set only after it is reconciled.
+def is_active_jobs_set_enabled() -> bool:
+    return FEATURE_ACTIVE_JOBS_SET
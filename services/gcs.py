@@ -30,7 +30,7 @@ def _get_client():
 # UPLOAD FILE (stream-safe)
 # ---------------------------------------------------------
 # User value: submits user files safely for OCR/transcription processing.
-def upload_file(file_obj, destination_path: str) -> dict:
+def upload_file(file_obj, destination_path: str, crc32c: str | None = None) -> dict:
     bucket_name = os.getenv("GCS_BUCKET_NAME")
     if not bucket_name:
         raise RuntimeError("GCS_BUCKET_NAME not set")
@@ -38,6 +38,9 @@ def upload_file(file_obj, destination_path: str) -> dict:
     client = _get_client()
     bucket = client.bucket(bucket_name)
     blob = bucket.blob(destination_path)
+    if crc32c:
+        # GCS rejects the write if the stored bytes do not match the checksum computed during inspection.
+        blob.crc32c = crc32c
 
     blob.upload_from_file(file_obj)
 
@@ -48,6 +51,153 @@ def upload_file(file_obj, destination_path: str) -> dict:
     }
 
 
+# ---------------------------------------------------------
+# RESUMABLE UPLOAD WRITER (chunked, streaming)
+# ---------------------------------------------------------
+# User value: streams large user files to storage chunk by chunk without API-side spooling.
+def open_resumable_upload(*, destination_path: str, chunk_size: int, content_type: str | None = None):
+    bucket_name = os.getenv("GCS_BUCKET_NAME")
+    if not bucket_name:
+        raise RuntimeError("GCS_BUCKET_NAME not set")
+
+    client = _get_client()
+    bucket = client.bucket(bucket_name)
+    blob = bucket.blob(destination_path, chunk_size=chunk_size)
+
+    writer = blob.open(
+        "wb",
+        chunk_size=chunk_size,
+        ignore_flush=True,
+        content_type=content_type or None,
+        checksum="crc32c",
+    )
+
+    return writer, {
+        "bucket": bucket_name,
+        "blob": destination_path,
+        "gcs_uri": f"gs://{bucket_name}/{destination_path}",
+    }
+
+
+# User value: cancels an unfinished resumable upload so a rejected stream leaves no open session or partial object.
+def cancel_resumable_upload(writer) -> None:
+    # BlobWriter.close() would commit whatever was written so far, so its buffer is closed directly instead;
+    # that also stops the close() run on garbage collection from finalizing the partial object.
+    writer._buffer.close()
+    if not writer._upload_and_transport:
+        return  # no chunk was sent yet, so no session was opened
+    upload, transport = writer._upload_and_transport
+    if upload.resumable_url and not upload.finished:
+        # GCS cancels a resumable session on DELETE of its session URI (it answers 499).
+        transport.request("DELETE", upload.resumable_url, headers={"Content-Length": "0"})
+
+
+# ---------------------------------------------------------
+# DELETE OBJECT (best-effort cleanup)
+# ---------------------------------------------------------
+# User value: removes rejected uploads so users are not left with orphaned stored inputs.
+def delete_blob(*, destination_path: str) -> None:
+    bucket_name = os.getenv("GCS_BUCKET_NAME")
+    if not bucket_name:
+        raise RuntimeError("GCS_BUCKET_NAME not set")
+
+    client = _get_client()
+    client.bucket(bucket_name).blob(destination_path).delete()
+
+
+# ---------------------------------------------------------
+# DIRECT CLIENT UPLOAD (signed PUT / resumable session)
+# ---------------------------------------------------------
+# User value: lets browsers upload straight to storage so large files never pass through the API.
+def generate_upload_url(
+    *,
+    destination_path: str,
+    content_type: str,
+    expiration_seconds: int,
+    crc32c: str | None = None,
+) -> tuple[str, dict]:
+    bucket_name = os.getenv("GCS_BUCKET_NAME")
+    if not bucket_name:
+        raise RuntimeError("GCS_BUCKET_NAME not set")
+
+    client = _get_client()
+    blob = client.bucket(bucket_name).blob(destination_path)
+
+    headers = {"Content-Type": content_type}
+    if crc32c:
+        # Signed into the URL so GCS rejects a PUT whose bytes do not match the declared checksum.
+        headers["x-goog-hash"] = f"crc32c={crc32c}"
+
+    url = blob.generate_signed_url(
+        version="v4",
+        expiration=timedelta(seconds=expiration_seconds),
+        method="PUT",
+        content_type=content_type,
+        headers={k: v for k, v in headers.items() if k != "Content-Type"} or None,
+    )
+    return url, headers
+
+
+# User value: starts a resumable session so very large or flaky-network uploads can resume instead of restarting.
+def create_resumable_upload_url(
+    *,
+    destination_path: str,
+    content_type: str,
+    size: int,
+    crc32c: str | None = None,
+    origin: str | None = None,
+) -> str:
+    bucket_name = os.getenv("GCS_BUCKET_NAME")
+    if not bucket_name:
+        raise RuntimeError("GCS_BUCKET_NAME not set")
+
+    client = _get_client()
+    blob = client.bucket(bucket_name).blob(destination_path)
+    if crc32c:
+        # Sent as object metadata at session start; GCS validates it when the final chunk lands.
+        blob.crc32c = crc32c
+
+    return blob.create_resumable_upload_session(
+        content_type=content_type,
+        size=size,
+        origin=origin,
+    )
+
+
+# ---------------------------------------------------------
+# OBJECT METADATA (size / checksum verification)
+# ---------------------------------------------------------
+# User value: confirms a client-uploaded file landed intact before it is queued for processing.
+def get_blob_metadata(*, destination_path: str) -> dict | None:
+    bucket_name = os.getenv("GCS_BUCKET_NAME")
+    if not bucket_name:
+        raise RuntimeError("GCS_BUCKET_NAME not set")
+
+    client = _get_client()
+    blob = client.bucket(bucket_name).get_blob(destination_path)
+    if blob is None:
+        return None
+
+    return {
+        "bucket": bucket_name,
+        "blob": destination_path,
+        "gcs_uri": f"gs://{bucket_name}/{destination_path}",
+        "size": int(blob.size or 0),
+        "crc32c": blob.crc32c,
+        "content_type": blob.content_type,
+    }
+
+
+# User value: opens a stored upload for seekable ranged reads so the API can inspect it without downloading it whole.
+def open_blob_reader(*, destination_path: str, chunk_size: int):
+    bucket_name = os.getenv("GCS_BUCKET_NAME")
+    if not bucket_name:
+        raise RuntimeError("GCS_BUCKET_NAME not set")
+
+    client = _get_client()
+    return client.bucket(bucket_name).blob(destination_path).open("rb", chunk_size=chunk_size)
+
+
 # ---------------------------------------------------------
 # UPLOAD TEXT
 # ---------------------------------------------------------
@@ -100,3 +250,36 @@ def generate_signed_url(
         ),
         response_type=response_type,
     )
+
+
+# ---------------------------------------------------------
+# WHOLE-OBJECT READ / CONDITIONAL WRITE (small archives)
+# ---------------------------------------------------------
+# User value: reads a small stored object with its generation, so a later rewrite cannot clobber a concurrent one.
+def download_bytes(*, destination_path: str) -> tuple[bytes | None, int]:
+    bucket_name = os.getenv("GCS_BUCKET_NAME")
+    if not bucket_name:
+        raise RuntimeError("GCS_BUCKET_NAME not set")
+
+    client = _get_client()
+    blob = client.bucket(bucket_name).get_blob(destination_path)
+    if blob is None:
+        return None, 0
+    return blob.download_as_bytes(if_generation_match=blob.generation), int(blob.generation)
+
+
+# User value: writes a small object only if it is still at the generation we read (0 = must not exist yet).
+def upload_bytes(*, content: bytes, destination_path: str, content_type: str, if_generation_match: int) -> dict:
+    bucket_name = os.getenv("GCS_BUCKET_NAME")
+    if not bucket_name:
+        raise RuntimeError("GCS_BUCKET_NAME not set")
+
+    client = _get_client()
+    blob = client.bucket(bucket_name).blob(destination_path)
+    blob.upload_from_string(content, content_type=content_type, if_generation_match=if_generation_match)
+
+    return {
+        "bucket": bucket_name,
+        "blob": destination_path,
+        "gcs_uri": f"gs://{bucket_name}/{destination_path}",
+    }
@@ -108,6 +108,20 @@ def _metadata_warnings(filename: str | None, mime_type: str | None) -> List[Dict
     return warnings
 
 
+# User value: flags uploads whose bytes look like a different job type so users can fix the selection.
+def _content_warnings(job_type: str, sniffed_job_type: str | None) -> List[Dict[str, str]]:
+    sniffed = str(sniffed_job_type or "").upper()
+    if sniffed not in {"OCR", "TRANSCRIPTION"} or sniffed == str(job_type or "").upper():
+        return []
+    label = "a document/image" if sniffed == "OCR" else "audio/video"
+    return [
+        _warn(
+            "CONTENT_TYPE_MISMATCH",
+            f"File content looks like {label}, which does not match the selected {job_type} job type.",
+        )
+    ]
+
+
 # User value: composes all warning checks so users receive complete pre-upload guidance in one response.
 def build_precheck_warnings(
     *,
@@ -117,10 +131,12 @@ def build_precheck_warnings(
     file_size_bytes: int | None,
     media_duration_sec: float | None,
     pdf_page_count: int | None,
+    sniffed_job_type: str | None = None,
 ) -> List[Dict[str, Any]]:
     warnings: List[Dict[str, Any]] = []
     warnings.extend(_size_warnings(job_type, file_size_bytes))
     warnings.extend(_duration_warnings(job_type, media_duration_sec))
     warnings.extend(_page_warnings(job_type, pdf_page_count))
     warnings.extend(_metadata_warnings(filename, mime_type))
+    warnings.extend(_content_warnings(job_type, sniffed_job_type))
     return warnings
@@ -0,0 +1,291 @@
+# User value: This file moves old finished jobs out of Redis into monthly archives while keeping them visible to users.
+# services/job_archive.py
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from google.api_core.exceptions import PreconditionFailed
+
+from repositories.job_records import decode_job, job_key
+from schemas.job_contract import TERMINAL_STATUSES
+from services.gcs import download_bytes, upload_bytes
+from utils.metrics import incr
+
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "90"))
+JOB_ARCHIVE_PREFIX = os.getenv("JOB_ARCHIVE_PREFIX", "job_archive").strip().strip("/")
+JOB_ARCHIVE_CACHE_SIZE = int(os.getenv("JOB_ARCHIVE_CACHE_SIZE", "64"))
+JOB_ARCHIVE_CACHE_TTL_SEC = int(os.getenv("JOB_ARCHIVE_CACHE_TTL_SEC", "600"))
+
+# Archived job ids, newest first; read after user_jobs:{user} so history pages continue past the live list.
+ARCHIVED_JOBS_PREFIX = "user_jobs_archived:"
+# Hash of job_id -> archive month (YYYY-MM); the only per-job Redis state an archived job keeps.
+ARCHIVE_POINTER_PREFIX = "user_job_archive:"
+ARCHIVE_CONTENT_TYPE = "application/x-ndjson"
+
+# KEYS: job hash, user job list, archived job list, archive pointer hash, enqueue guard.
+# ARGV: job_id, job version read when the archive was written, archive month.
+# Skips the job if anything wrote to it after it was archived, so a retried job is never dropped.
+ARCHIVE_JOB_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return 0
+end
+if (redis.call('HGET', KEYS[1], 'version') or '') ~= ARGV[2] then
+  return 0
+end
+redis.call('HSET', KEYS[4], ARGV[1], ARGV[3])
+redis.call('LREM', KEYS[3], 0, ARGV[1])
+redis.call('LPUSH', KEYS[3], ARGV[1])
+redis.call('LREM', KEYS[2], -1, ARGV[1])
+redis.call('DEL', KEYS[1], KEYS[5])
+return 1
+"""
+
+
+# User value: supports archived_jobs_key so the OCR/transcription journey stays clear and reliable.
+def archived_jobs_key(email: str) -> str:
+    return f"{ARCHIVED_JOBS_PREFIX}{email}"
+
+
+# User value: supports archive_pointer_key so the OCR/transcription journey stays clear and reliable.
+def archive_pointer_key(email: str) -> str:
+    return f"{ARCHIVE_POINTER_PREFIX}{email}"
+
+
+# User value: names one user's archive for one month; the email is hashed so object names carry no address.
+def archive_blob_path(email: str, month: str) -> str:
+    user_hash = hashlib.sha256(email.encode("utf-8")).hexdigest()[:32]
+    return f"{JOB_ARCHIVE_PREFIX}/{user_hash}/{month}.ndjson.gz"
+
+
+# User value: supports _epoch so the OCR/transcription journey stays clear and reliable.
+def _epoch(value) -> Optional[float]:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+# User value: files a job under the month it was created, so one archive covers a month of a user's history.
+def archive_month(data: dict) -> str:
+    ts = _epoch(data.get("created_at")) or _epoch(data.get("updated_at")) or 0.0
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m")
+
+
+# User value: only finished jobs whose last change is older than the cutoff are moved out of Redis.
+def is_archivable(data: dict, cutoff_ts: float) -> bool:
+    if str(data.get("status") or "").strip().upper() not in TERMINAL_STATUSES:
+        return False
+    finished = _epoch(data.get("updated_at")) or _epoch(data.get("created_at"))
+    return finished is not None and finished < cutoff_ts
+
+
+# User value: packs a month of job records as gzip NDJSON (newest first), the format users also get from /jobs/export.
+def encode_archive(records: dict[str, dict]) -> bytes:
+    ordered = sorted(records.items(), key=lambda item: (str(item[1].get("created_at") or ""), item[0]), reverse=True)
+    lines = "".join(json.dumps({**data, "job_id": job_id}, separators=(",", ":")) + "\n" for job_id, data in ordered)
+    return gzip.compress(lines.encode("utf-8"), mtime=0)
+
+
+# User value: unpacks an archive into job_id -> record.
+def decode_archive(blob: bytes) -> dict[str, dict]:
+    records = {}
+    for line in gzip.decompress(blob).decode("utf-8").splitlines():
+        if line.strip():
+            data = json.loads(line)
+            records[str(data.pop("job_id"))] = data
+    return records
+
+
+class ArchiveCache:
+    # User value: keeps recently read monthly archives in memory for a while, bounded by LRU eviction.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, max_entries: int, ttl_sec: int, clock=time.monotonic):
+        self._max_entries = max_entries
+        self._ttl_sec = ttl_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], tuple[dict, float]] = OrderedDict()
+
+    # User value: supports get so the OCR/transcription journey stays clear and reliable.
+    def get(self, key: tuple[str, str]) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            records, expires_at = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return records
+
+    # User value: supports put so the OCR/transcription journey stays clear and reliable.
+    def put(self, key: tuple[str, str], records: dict) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (records, self._clock() + self._ttl_sec)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    # User value: supports discard so the OCR/transcription journey stays clear and reliable.
+    def discard(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    # User value: supports clear so the OCR/transcription journey stays clear and reliable.
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = ArchiveCache(JOB_ARCHIVE_CACHE_SIZE, JOB_ARCHIVE_CACHE_TTL_SEC)
+
+
+# User value: reads one monthly archive through the cache; a missing archive reads as empty.
+def _load_month(email: str, month: str) -> dict[str, dict]:
+    records = _cache.get((email, month))
+    if records is not None:
+        incr("job_archive_cache_total", result="hit")
+        return records
+    incr("job_archive_cache_total", result="miss")
+    blob, _ = download_bytes(destination_path=archive_blob_path(email, month))
+    records = decode_archive(blob) if blob else {}
+    _cache.put((email, month), records)
+    return records
+
+
+# User value: brings archived jobs back for status and history reads: one HMGET, then one archive read per month.
+# Archives are always named by email; owner is the user's key name (their id once user ids are on).
+def load_archived_jobs(r, email: str, job_ids: list[str], *, owner: str = "") -> dict[str, dict]:
+    if not job_ids:
+        return {}
+    months = r.hmget(archive_pointer_key(owner or email), *job_ids)
+    by_month: dict[str, list[str]] = defaultdict(list)
+    for job_id, month in zip(job_ids, months):
+        if month:
+            by_month[month].append(job_id)
+    found = {}
+    for month, ids in by_month.items():
+        records = _load_month(email, month)
+        for job_id in ids:
+            if job_id in records:
+                # Callers decorate what they get back; never hand out the cached dict itself.
+                found[job_id] = {**records[job_id], "user": email, "archived": "1"}
+    if found:
+        incr("job_archive_reads_total", amount=len(found))
+    return found
+
+
+# User value: finds one user's archivable jobs, oldest first, with the Redis bytes each would free.
+def plan_user(
+    r, email: str, cutoff_ts: float, batch: int = 500, *, owner: str = ""
+) -> tuple[dict[str, dict[str, dict]], int, int]:
+    owner = owner or email
+    user_jobs_key = f"user_jobs:{owner}"
+    total = r.llen(user_jobs_key)
+    plan: dict[str, dict[str, dict]] = defaultdict(dict)
+    reclaim_bytes = 0
+    jobs = 0
+    # user_jobs is newest first, so walk it from the tail and stop at the first job created after the cutoff.
+    for end in range(total, 0, -batch):
+        job_ids = list(reversed(r.lrange(user_jobs_key, max(0, end - batch), end - 1)))
+        pipe = r.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.hgetall(job_key(job_id))
+            pipe.memory_usage(job_key(job_id))
+            pipe.memory_usage(f"job_enqueue_once:{job_id}")
+        rows = pipe.execute()
+        for idx, job_id in enumerate(job_ids):
+            raw, hash_bytes, guard_bytes = rows[3 * idx : 3 * idx + 3]
+            data = decode_job(raw)
+            if not data:
+                continue
+            created = _epoch(data.get("created_at"))
+            if created is not None and created >= cutoff_ts:
+                return dict(plan), jobs, reclaim_bytes
+            if data.get("user") != owner or not is_archivable(data, cutoff_ts):
+                continue
+            plan[archive_month(data)][job_id] = data
+            jobs += 1
+            # The list entry moves to user_jobs_archived and a pointer field is added; both are about the id's size.
+            reclaim_bytes += int(hash_bytes or 0) + int(guard_bytes or 0) - (2 * len(job_id) + len("YYYY-MM"))
+    return dict(plan), jobs, reclaim_bytes
+
+
+# User value: merges new records into a month's archive, retrying if another run wrote it meanwhile.
+def _write_month(email: str, month: str, records: dict[str, dict], attempts: int = 5) -> None:
+    path = archive_blob_path(email, month)
+    for _ in range(attempts):
+        blob, generation = download_bytes(destination_path=path)
+        merged = decode_archive(blob) if blob else {}
+        merged.update(records)
+        try:
+            upload_bytes(
+                content=encode_archive(merged),
+                destination_path=path,
+                content_type=ARCHIVE_CONTENT_TYPE,
+                if_generation_match=generation,
+            )
+            return
+        except PreconditionFailed:
+            continue
+    raise RuntimeError(f"archive {path} kept changing; re-run later")
+
+
+# User value: archives one user's old finished jobs (or only reports what it would do) and frees their Redis keys.
+def archive_user(
+    r,
+    email: str,
+    *,
+    cutoff_ts: float,
+    dry_run: bool = True,
+    batch: int = 500,
+    write_month: Callable[[str, str, dict], None] = _write_month,
+    owner: str = "",
+) -> dict:
+    owner = owner or email
+    plan, jobs, reclaim_bytes = plan_user(r, email, cutoff_ts, batch, owner=owner)
+    report = {"email": email, "jobs": jobs, "archives": len(plan), "reclaim_bytes": reclaim_bytes, "archived": 0, "skipped": 0}
+    if dry_run or not plan:
+        return report
+
+    script = r.register_script(ARCHIVE_JOB_LUA)
+    for month, records in sorted(plan.items()):
+        # The archive is durable before any Redis key is removed; a crash in between only leaves a spare copy.
+        write_month(email, month, records)
+        pipe = r.pipeline(transaction=False)
+        # Oldest first, so the newest archived job ends up at the head of user_jobs_archived.
+        for job_id, data in sorted(records.items(), key=lambda item: str(item[1].get("created_at") or "")):
+            script(
+                keys=[
+                    job_key(job_id),
+                    f"user_jobs:{owner}",
+                    archived_jobs_key(owner),
+                    archive_pointer_key(owner),
+                    f"job_enqueue_once:{job_id}",
+                ],
+                args=[job_id, data.get("version") or "", month],
+                client=pipe,
+            )
+        results = pipe.execute()
+        archived = sum(int(result or 0) for result in results)
+        report["archived"] += archived
+        report["skipped"] += len(results) - archived
+        _cache.discard((email, month))
+    incr("job_archive_jobs_total", amount=report["archived"])
+    return report
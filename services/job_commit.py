@@ -0,0 +1,117 @@
+# User value: This file records and enqueues a new job in one atomic Redis call so accepted uploads are never left stranded.
+# services/job_commit.py
+import json
+from datetime import datetime
+
+from utils.job_indexes import REINDEX_JOB_LUA
+from utils.status_machine import allowed_transitions_lua, history_version_key
+
+DAILY_USAGE_TTL_SEC = 172800
+
+# KEYS: job hash, idempotency key, daily usage counter, user job list, enqueue guard, queue,
+#       user history version counter (also the channel its new value is published on).
+# ARGV: job_id, target status, idempotency ttl (0 = none), count daily usage (0/1), daily ttl,
+#       enqueue guard ttl, queue payload, then field/value pairs for the job hash.
+COMMIT_AND_ENQUEUE_LUA = (
+    "local ALLOWED = "
+    + allowed_transitions_lua()
+    + "\n"
+    + REINDEX_JOB_LUA
+    + """
+local raw = redis.call('HGET', KEYS[1], 'status')
+local current = ''
+if raw then
+  current = string.upper(string.match(raw, '^%s*(.-)%s*$'))
+end
+local target = ARGV[2]
+local allowed = ALLOWED[current] or ALLOWED['']
+if not allowed[target] then
+  return {0, current, 0, -1}
+end
+
+redis.call('HSET', KEYS[1], unpack(ARGV, 8))
+redis.call('HINCRBY', KEYS[1], 'version', 1)
+reindex_job(KEYS[1], current, target, false)
+
+local idem_ttl = tonumber(ARGV[3])
+if idem_ttl > 0 then
+  redis.call('SET', KEYS[2], ARGV[1], 'EX', idem_ttl)
+end
+if ARGV[4] == '1' then
+  if redis.call('INCR', KEYS[3]) == 1 then
+    redis.call('EXPIRE', KEYS[3], tonumber(ARGV[5]))
+  end
+end
+redis.call('LPUSH', KEYS[4], ARGV[1])
+redis.call('PUBLISH', KEYS[7], redis.call('INCR', KEYS[7]))
+
+if redis.call('SET', KEYS[5], '1', 'NX', 'EX', tonumber(ARGV[6])) then
+  redis.call('RPUSH', KEYS[6], ARGV[7])
+  return {1, current, 1, redis.call('LLEN', KEYS[6])}
+end
+return {1, current, 0, -1}
+"""
+)
+
+_script = None
+
+
+# User value: supports daily_usage_key so the OCR/transcription journey stays clear and reliable.
+def daily_usage_key(email: str) -> str:
+    return f"user_daily_jobs:{email}:{datetime.utcnow().strftime('%Y%m%d')}"
+
+
+# User value: supports _commit_script so the OCR/transcription journey stays clear and reliable.
+def _commit_script(r):
+    global _script
+    if _script is None:
+        # Registered once; calls go through EVALSHA and reload the source only if the server lost it.
+        _script = r.register_script(COMMIT_AND_ENQUEUE_LUA)
+    return _script
+
+
+# User value: writes job metadata, quota usage and the queue entry together so a crash cannot strand a job.
+async def commit_and_enqueue_job(
+    r,
+    *,
+    job_id: str,
+    user_email: str,
+    queue_name: str,
+    mapping: dict,
+    payload: dict,
+    idempotency_key: str = "",
+    idempotency_ttl_sec: int = 0,
+    count_daily_usage: bool = False,
+    enqueue_ttl_sec: int = 24 * 3600,
+) -> dict:
+    fields = []
+    for name, value in mapping.items():
+        fields.extend([name, "" if value is None else value])
+
+    keys = [
+        f"job_status:{job_id}",
+        # Never written when there is no idempotency key; it only keeps the declared key count fixed.
+        idempotency_key or f"upload_idempotency:none:{job_id}",
+        daily_usage_key(user_email),
+        f"user_jobs:{user_email}",
+        f"job_enqueue_once:{job_id}",
+        queue_name,
+        history_version_key(user_email),
+    ]
+    args = [
+        job_id,
+        str(mapping.get("status") or "").strip().upper(),
+        int(idempotency_ttl_sec) if idempotency_key else 0,
+        "1" if count_daily_usage else "0",
+        DAILY_USAGE_TTL_SEC,
+        int(enqueue_ttl_sec),
+        json.dumps(payload),
+        *fields,
+    ]
+    ok, current, enqueued, queue_depth = await _commit_script(r)(keys=keys, args=args, client=r)
+    return {
+        "ok": bool(int(ok)),
+        "current_status": current or None,
+        "enqueued": bool(int(enqueued)),
+        "queue_depth": int(queue_depth) if int(enqueued) else None,
+    }
@@ -0,0 +1,357 @@
+# User value: This file lets status requests wait for a job to change instead of clients polling on a timer.
+# services/job_events.py
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from redis.exceptions import RedisError
+
+from repositories.job_records import decode_job_fields, queue_job_fields, read_job_fields_async
+from schemas.job_contract import TERMINAL_STATUSES
+from services.redis_client import get_async_redis
+from utils.metrics import incr, set_gauge
+from utils.status_machine import HISTORY_VERSION_PREFIX, JOB_EVENTS_PREFIX, history_version_key
+
+logger = logging.getLogger("api.job_events")
+
+JOBS_EVENTS_HEARTBEAT_SEC = int(os.getenv("JOBS_EVENTS_HEARTBEAT_SEC", "15"))
+JOBS_EVENTS_MAX_SEC = int(os.getenv("JOBS_EVENTS_MAX_SEC", "1800"))
+JOBS_EVENTS_SCAN_LIMIT = int(os.getenv("JOBS_EVENTS_SCAN_LIMIT", "100"))
+# Worker clocks stamp updated_at; re-send anything this close to the resume point rather than risk a gap.
+RESUME_SKEW_MS = 5000
+EVENT_FIELDS = ("status", "stage", "progress", "error_code", "version", "updated_at")
+DELTA_FIELDS = ("status", "stage", "progress", "error_code")
+
+
+# User value: supports _decode so the OCR/transcription journey stays clear and reliable.
+def _decode(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    return str(value or "")
+
+
+# User value: maps a channel to what waiters listen on: a job id, or a user's history counter name.
+def topic_from_channel(channel) -> Optional[str]:
+    name = _decode(channel)
+    if name.startswith(HISTORY_VERSION_PREFIX):
+        return name
+    if name.startswith(JOB_EVENTS_PREFIX):
+        return name[len(JOB_EVENTS_PREFIX):] or None
+    _, marker, job_id = name.partition(":job_status:")
+    if marker and name.startswith("__keyspace@"):
+        return job_id or None
+    return None
+
+
+class JobChangeHub:
+    # User value: wakes every request waiting on a job (or a user's history) from one shared Redis subscription per API process.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, r, *, reconnect_max_sec: float = 30.0):
+        self._r = r
+        self._reconnect_max_sec = reconnect_max_sec
+        self._waiters: dict[str, set[asyncio.Future]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+
+    # User value: supports waiter_count so the OCR/transcription journey stays clear and reliable.
+    def waiter_count(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    # User value: registers interest in topics before their state is re-read, so no change can be missed.
+    def register(self, *topics: str) -> asyncio.Future:
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self.watch(future, *topics)
+        return future
+
+    # User value: adds topics to an existing waiter, e.g. a job that appeared while a stream was open.
+    def watch(self, future: asyncio.Future, *topics: str) -> None:
+        for topic in topics:
+            self._waiters.setdefault(topic, set()).add(future)
+        set_gauge("job_events_waiters", self.waiter_count())
+
+    # User value: supports unregister so the OCR/transcription journey stays clear and reliable.
+    def unregister(self, future: asyncio.Future, *topics: str) -> None:
+        for topic in topics:
+            waiters = self._waiters.get(topic)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[topic]
+        set_gauge("job_events_waiters", self.waiter_count())
+
+    # User value: waits until the subscription is live (or the timeout passes) so early changes are not lost.
+    async def wait_ready(self, timeout: float) -> bool:
+        self._ensure_started()
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    # User value: wakes everyone waiting on one topic.
+    def notify(self, topic: str) -> None:
+        for future in self._waiters.get(topic, ()):
+            if not future.done():
+                future.set_result(True)
+
+    # User value: wakes every waiter so they re-read state after the subscription was interrupted.
+    def notify_all(self) -> None:
+        for topic in list(self._waiters):
+            self.notify(topic)
+
+    # User value: supports stop so the OCR/transcription journey stays clear and reliable.
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.notify_all()
+
+    # User value: supports _ensure_started so the OCR/transcription journey stays clear and reliable.
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    # User value: supports _keyspace_pattern so the OCR/transcription journey stays clear and reliable.
+    def _keyspace_pattern(self) -> str:
+        db = int(self._r.connection_pool.connection_kwargs.get("db", 0) or 0)
+        return f"__keyspace@{db}__:job_status:*"
+
+    # User value: listens for job changes, reconnecting with backoff when Redis drops.
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            pubsub = self._r.pubsub(ignore_subscribe_messages=True)
+            try:
+                # Keyspace events only arrive when the server has notify-keyspace-events enabled;
+                # the explicit channel covers writers that use the transition script.
+                await pubsub.psubscribe(f"{JOB_EVENTS_PREFIX}*", f"{HISTORY_VERSION_PREFIX}*", self._keyspace_pattern())
+                self._ready.set()
+                # Anything written while we were (re)connecting has not been announced to waiters.
+                self.notify_all()
+                backoff = 1.0
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if not message:
+                        continue
+                    topic = topic_from_channel(message.get("channel"))
+                    if topic:
+                        incr("job_events_received_total")
+                        self.notify(topic)
+            except (RedisError, OSError) as exc:
+                self._ready.clear()
+                self.notify_all()
+                incr("job_events_subscribe_errors_total")
+                logger.warning("job_events_subscribe_failed error=%s retry_in_sec=%s", exc.__class__.__name__, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self._reconnect_max_sec)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+# User value: waits until a job's version moves past `since_version` or the timeout passes; returns the latest version.
+async def wait_for_job_version(hub: JobChangeHub, r, job_id: str, since_version: int, timeout_sec: float) -> int:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_sec
+    await hub.wait_ready(min(1.0, timeout_sec))
+    while True:
+        future = hub.register(job_id)
+        try:
+            # Read after registering: a change landing in between still resolves the future.
+            version = int((await read_job_fields_async(r, job_id, "version"))["version"] or 0)
+            if version != since_version:
+                return version
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return version
+            try:
+                await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError:
+                return version
+        finally:
+            hub.unregister(future, job_id)
+
+
+_hub: Optional[JobChangeHub] = None
+_open_streams = 0
+
+
+# User value: shares one job-change subscription across all waiting requests and streams in this process.
+def get_job_change_hub() -> JobChangeHub:
+    global _hub
+    if _hub is None:
+        _hub = JobChangeHub(get_async_redis())
+    return _hub
+
+
+# User value: formats one Server-Sent Events frame.
+def sse_frame(event: str, data: dict, event_id: Optional[str] = None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+# User value: reads the browser's Last-Event-ID so a reconnecting tab only gets what changed while it was away.
+def parse_last_event_id(raw: Optional[str]) -> Optional[int]:
+    try:
+        return int(str(raw).strip()) if raw else None
+    except ValueError:
+        return None
+
+
+# User value: supports _updated_at_ms so the OCR/transcription journey stays clear and reliable.
+def _updated_at_ms(value) -> int:
+    text = _decode(value).strip()
+    if not text:
+        return 0
+    try:
+        dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return 0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+class UserJobStream:
+    # User value: tracks what one open stream has already told the browser, so only real changes are sent.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, r, email: str, *, since_ms: Optional[int] = None, scan_limit: int = JOBS_EVENTS_SCAN_LIMIT):
+        self._r = r
+        self.email = email
+        self.history_key = history_version_key(email)
+        self._since_ms = since_ms
+        self._scan_limit = scan_limit
+        self._history_version = None
+        self._initial = True
+        self.watched: dict[str, dict] = {}
+        self._seen: set[str] = set()
+
+    # User value: reads the user's active jobs and returns a frame for each one whose status, stage or progress moved.
+    async def collect(self, event_id: str) -> list[str]:
+        candidates: list[str] = []
+        history_version = await self._r.get(self.history_key)
+        if self._initial or history_version != self._history_version:
+            job_ids = [_decode(j) for j in await self._r.lrange(f"user_jobs:{self.email}", 0, self._scan_limit - 1)]
+            candidates = [j for j in job_ids if j not in self._seen]
+            # Forget jobs that scrolled out of the window so the set stays bounded on long streams.
+            self._seen &= set(job_ids)
+            self._history_version = history_version
+        job_ids = list(self.watched) + candidates
+        if not job_ids:
+            self._initial = False
+            return []
+        pipe = self._r.pipeline(transaction=False)
+        for job_id in job_ids:
+            queue_job_fields(pipe, job_id, *EVENT_FIELDS)
+        rows = await pipe.execute()
+
+        frames = []
+        for job_id, row in zip(job_ids, rows):
+            row = decode_job_fields(EVENT_FIELDS, row)
+            fields = {name: (None if value is None else _decode(value)) for name, value in row.items()}
+            frame = self._frame_for(job_id, fields, event_id)
+            if frame:
+                frames.append(frame)
+        self._initial = False
+        return frames
+
+    # User value: supports _frame_for so the OCR/transcription journey stays clear and reliable.
+    def _frame_for(self, job_id: str, fields: dict, event_id: str) -> Optional[str]:
+        status = (fields.get("status") or "").upper()
+        terminal = status in TERMINAL_STATUSES
+        known = self.watched.get(job_id)
+        if fields.get("status") is None and fields.get("version") is None:
+            self.watched.pop(job_id, None)
+            self._seen.add(job_id)
+            return None
+        if terminal:
+            self.watched.pop(job_id, None)
+        self._seen.add(job_id)
+
+        if known is None:
+            if not terminal:
+                self.watched[job_id] = fields
+            if self._initial:
+                # Fresh tabs get every active job; resuming tabs only what changed since their last event.
+                if self._since_ms is None:
+                    send = not terminal
+                else:
+                    send = _updated_at_ms(fields.get("updated_at")) >= self._since_ms - RESUME_SKEW_MS
+            else:
+                send = True
+            delta = {name: fields.get(name) for name in DELTA_FIELDS}
+        else:
+            if not terminal:
+                self.watched[job_id] = fields
+            delta = {name: fields.get(name) for name in DELTA_FIELDS if fields.get(name) != known.get(name)}
+            send = bool(delta)
+        if not send:
+            return None
+        data = {"job_id": job_id, "version": fields.get("version"), "updated_at": fields.get("updated_at"), **delta}
+        if terminal:
+            data["terminal"] = True
+        return sse_frame("job", data, event_id)
+
+
+# User value: streams a user's job changes over one connection, with heartbeats and Last-Event-ID resume.
+async def user_job_events(
+    r,
+    hub: JobChangeHub,
+    email: str,
+    *,
+    last_event_id: Optional[str] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    heartbeat_sec: float = JOBS_EVENTS_HEARTBEAT_SEC,
+    max_sec: float = JOBS_EVENTS_MAX_SEC,
+) -> AsyncIterator[str]:
+    global _open_streams
+    stream = UserJobStream(r, email, since_ms=parse_last_event_id(last_event_id))
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_sec
+    _open_streams += 1
+    set_gauge("jobs_events_open_streams", _open_streams)
+    try:
+        yield "retry: 3000\n\n"
+        await hub.wait_ready(1.0)
+        while True:
+            topics = [stream.history_key, *stream.watched]
+            future = hub.register(*topics)
+            try:
+                # Read after registering, and register jobs found by the read, so no change can slip past.
+                event_id = str(int(time.time() * 1000))
+                frames = await stream.collect(event_id)
+                added = [job_id for job_id in stream.watched if job_id not in topics]
+                if added:
+                    hub.watch(future, *added)
+                    topics.extend(added)
+                    frames.extend(await stream.collect(event_id))
+                if frames:
+                    incr("api_jobs_events_frames_total", amount=len(frames))
+                    yield "".join(frames)
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                done, _ = await asyncio.wait({future}, timeout=min(heartbeat_sec, remaining))
+                if not done:
+                    yield ": ping\n\n"
+            finally:
+                hub.unregister(future, *topics)
+            if is_disconnected is not None and await is_disconnected():
+                return
+    finally:
+        _open_streams -= 1
+        set_gauge("jobs_events_open_streams", _open_streams)
@@ -0,0 +1,71 @@
+# User value: This file streams a user's whole job history in small batches so even very long histories download quickly.
+# services/job_export.py
+import csv
+import io
+import json
+import os
+from typing import Callable, Iterator, Optional
+
+from repositories.job_records import read_jobs
+
+JOBS_EXPORT_BATCH_SIZE = int(os.getenv("JOBS_EXPORT_BATCH_SIZE", "200"))
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+EXPORT_CSV_COLUMNS = (
+    "job_id",
+    "job_type",
+    "status",
+    "stage",
+    "progress",
+    "filename",
+    "created_at",
+    "updated_at",
+    "error_code",
+    "error_message",
+    "download_url",
+)
+# Spreadsheet apps run cells starting with these as formulas; filenames are user-supplied.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+# User value: reads the user's job list newest first in pipelined batches, never holding more than one batch in memory.
+def iter_job_batches(
+    r,
+    user_jobs_key: str,
+    batch_size: int = JOBS_EXPORT_BATCH_SIZE,
+    fill_missing: Optional[Callable[[list[str]], dict[str, dict]]] = None,
+) -> Iterator[list[tuple[str, dict]]]:
+    total = r.llen(user_jobs_key)
+    for start in range(0, total, batch_size):
+        end = min(start + batch_size, total) - 1
+        # New jobs are LPUSHed onto the head; ranges counted from the tail keep pointing at the same jobs.
+        job_ids = r.lrange(user_jobs_key, start - total, end - total)
+        rows = read_jobs(r, job_ids)
+        missing = [job_id for job_id, data in zip(job_ids, rows) if not data]
+        if missing and fill_missing:
+            found = fill_missing(missing)
+            rows = [data or found.get(job_id) for job_id, data in zip(job_ids, rows)]
+        batch = [(job_id, data) for job_id, data in zip(job_ids, rows) if data]
+        if batch:
+            yield batch
+
+
+# User value: renders one batch as NDJSON lines so clients can parse the export as it arrives.
+def ndjson_chunk(items: list[dict]) -> str:
+    return "".join(json.dumps(item, separators=(",", ":"), default=str) + "\n" for item in items)
+
+
+# User value: supports _csv_cell so the OCR/transcription journey stays clear and reliable.
+def _csv_cell(value) -> str:
+    text = "" if value is None else str(value)
+    return f"'{text}" if text.startswith(_FORMULA_PREFIXES) else text
+
+
+# User value: renders one batch as CSV rows (with the header on the first batch) for spreadsheet users.
+def csv_chunk(items: list[dict], *, header: bool) -> str:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    if header:
+        writer.writerow(EXPORT_CSV_COLUMNS)
+    for item in items:
+        writer.writerow([_csv_cell(item.get(column)) for column in EXPORT_CSV_COLUMNS])
+    return buf.getvalue()
@@ -0,0 +1,435 @@
+# User value: This file counts PDF pages with bounded memory so large scans get fast, accurate OCR limits.
+# services/pdf_page_count.py
+import logging
+import mmap
+import os
+import re
+import zlib
+
+logger = logging.getLogger("api.pdf_pages")
+
+PDF_HEAD_BYTES = 1024
+PDF_TAIL_BYTES = 64 * 1024
+PDF_OBJECT_WINDOW_BYTES = 8 * 1024
+PDF_MAX_STREAM_BYTES = 8 * 1024 * 1024
+PDF_MAX_XREF_SECTIONS = 32
+PDF_SCAN_CHUNK_BYTES = 1024 * 1024
+
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_ROOT_RE = re.compile(rb"/Root\s+(\d+)\s+(\d+)\s+R")
+_PAGES_REF_RE = re.compile(rb"/Pages\s+(\d+)\s+(\d+)\s+R")
+_COUNT_RE = re.compile(rb"/Count\s+(\d+)")
+_PREV_RE = re.compile(rb"/Prev\s+(\d+)")
+_XREFSTM_RE = re.compile(rb"/XRefStm\s+(\d+)")
+_LENGTH_RE = re.compile(rb"/Length\s+(\d+)(?!\s+\d+\s+R)")
+_LINEARIZED_N_RE = re.compile(rb"/N\s+(\d+)")
+_OBJ_HEADER_RE = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj\b")
+_SUBSECTION_RE = re.compile(rb"\s*(\d+)\s+(\d+)\s*[\r\n]")
+_INT_ARRAY_RE = r"/{}\s*\[([\d\s]*)\]"
+_INT_RE = r"/{}\s+(\d+)"
+
+
+class PdfPageTally:
+    # User value: counts PDF pages across streamed chunks so OCR limits apply without holding the whole file.
+    _PAGE = b"/Type /Page"
+    _PAGES = b"/Type /Pages"
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self):
+        self._tail = b""
+        self._page = 0
+        self._pages = 0
+
+    # User value: counts pages while bytes stream by so OCR page limits still apply to streamed uploads.
+    def feed(self, data: bytes) -> None:
+        if not data:
+            return
+        window = self._tail + data
+        # Only count matches that start after the carried tail so none is counted twice.
+        skip = len(self._tail)
+        self._page += self._count_from(window, self._PAGE, skip)
+        self._pages += self._count_from(window, self._PAGES, skip)
+        self._tail = window[-(len(self._PAGES) - 1):]
+
+    @staticmethod
+    # User value: supports _count_from so the OCR/transcription journey stays clear and reliable.
+    def _count_from(window: bytes, needle: bytes, skip: int) -> int:
+        start = max(0, skip - len(needle) + 1)
+        count = 0
+        idx = window.find(needle, start)
+        while idx != -1:
+            if idx + len(needle) > skip:
+                count += 1
+            idx = window.find(needle, idx + 1)
+        return count
+
+    # User value: returns the same page estimate as the in-memory heuristic for consistent limits.
+    def result(self) -> int | None:
+        if self._page <= 0:
+            return None
+        return max(1, self._page - self._pages)
+
+
+# User value: reads the page count a linearized (web-optimized) PDF declares in its first kilobyte.
+def pages_from_linearization(head: bytes) -> int | None:
+    idx = head.find(b"/Linearized")
+    if idx == -1:
+        return None
+    start = head.rfind(b"<<", 0, idx)
+    end = head.find(b">>", idx)
+    if start == -1 or end == -1:
+        return None
+    match = _LINEARIZED_N_RE.search(head, start, end)
+    if not match:
+        return None
+    count = int(match.group(1))
+    return count if count > 0 else None
+
+
+# User value: supports _int_field so the OCR/transcription journey stays clear and reliable.
+def _int_field(text: bytes, name: str) -> int | None:
+    match = re.search(_INT_RE.format(name).encode("ascii"), text)
+    return int(match.group(1)) if match else None
+
+
+# User value: supports _int_array so the OCR/transcription journey stays clear and reliable.
+def _int_array(text: bytes, name: str) -> list[int] | None:
+    match = re.search(_INT_ARRAY_RE.format(name).encode("ascii"), text)
+    if not match:
+        return None
+    return [int(x) for x in match.group(1).split()]
+
+
+# User value: supports _dict_span so the OCR/transcription journey stays clear and reliable.
+def _dict_span(window: bytes, start: int) -> tuple[int, int] | None:
+    open_idx = window.find(b"<<", start)
+    if open_idx == -1:
+        return None
+    depth = 0
+    idx = open_idx
+    while idx < len(window) - 1:
+        pair = window[idx : idx + 2]
+        if pair == b"<<":
+            depth += 1
+            idx += 2
+            continue
+        if pair == b">>":
+            depth -= 1
+            idx += 2
+            if depth == 0:
+                return open_idx, idx
+            continue
+        idx += 1
+    return None
+
+
+# User value: undoes PNG row predictors so compressed cross-reference tables can be read.
+def _unpredict_png(data: bytes, columns: int) -> bytes:
+    row_len = columns + 1
+    out = bytearray()
+    prev = bytearray(columns)
+    for offset in range(0, len(data) - row_len + 1, row_len):
+        kind = data[offset]
+        row = bytearray(data[offset + 1 : offset + row_len])
+        for i in range(columns):
+            left = row[i - 1] if i > 0 else 0
+            up = prev[i]
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + ((left + up) >> 1)) & 0xFF
+            elif kind == 4:
+                upleft = prev[i - 1] if i > 0 else 0
+                p = left + up - upleft
+                pa, pb, pc = abs(p - left), abs(p - up), abs(p - upleft)
+                pred = left if pa <= pb and pa <= pc else (up if pb <= pc else upleft)
+                row[i] = (row[i] + pred) & 0xFF
+        out.extend(row)
+        prev = row
+    return bytes(out)
+
+
+class _PdfStructureReader:
+    # User value: follows the trailer, xref and page tree with small seeks so memory stays flat.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, file_obj, size: int):
+        self._f = file_obj
+        self._size = size
+        self._streams: dict[int, tuple[bytes, bytes] | None] = {}
+
+    # User value: supports _read_at so the OCR/transcription journey stays clear and reliable.
+    def _read_at(self, offset: int, length: int) -> bytes:
+        if offset < 0 or offset >= self._size:
+            return b""
+        self._f.seek(offset, os.SEEK_SET)
+        return self._f.read(min(length, self._size - offset))
+
+    # User value: supports _read_stream so the OCR/transcription journey stays clear and reliable.
+    def _read_stream(self, offset: int) -> tuple[bytes, bytes] | None:
+        if offset not in self._streams:
+            self._streams[offset] = self._decode_stream(offset)
+        return self._streams[offset]
+
+    # User value: supports _decode_stream so the OCR/transcription journey stays clear and reliable.
+    def _decode_stream(self, offset: int) -> tuple[bytes, bytes] | None:
+        window = self._read_at(offset, PDF_OBJECT_WINDOW_BYTES)
+        span = _dict_span(window, 0)
+        if not span:
+            return None
+        dict_text = window[span[0] : span[1]]
+        length_match = _LENGTH_RE.search(dict_text)
+        if not length_match:
+            return None
+        length = int(length_match.group(1))
+        if length > PDF_MAX_STREAM_BYTES:
+            return None
+        stream_kw = window.find(b"stream", span[1])
+        if stream_kw == -1:
+            return None
+        data_start = stream_kw + len(b"stream")
+        if window[data_start : data_start + 2] == b"\r\n":
+            data_start += 2
+        elif window[data_start : data_start + 1] in (b"\n", b"\r"):
+            data_start += 1
+        raw = self._read_at(offset + data_start, length)
+        if b"/Filter" in dict_text:
+            if b"/FlateDecode" not in dict_text:
+                return None
+            # Cap inflated output too so a crafted stream cannot expand past the memory budget.
+            raw = zlib.decompressobj().decompress(raw, PDF_MAX_STREAM_BYTES)
+        if b"/Predictor" in dict_text:
+            predictor = _int_field(dict_text, "Predictor") or 1
+            if predictor >= 10:
+                raw = _unpredict_png(raw, _int_field(dict_text, "Columns") or 1)
+            elif predictor != 1:
+                return None
+        return dict_text, raw
+
+    # User value: supports _object_text so the OCR/transcription journey stays clear and reliable.
+    def _object_text(self, offset: int, obj_num: int) -> bytes | None:
+        window = self._read_at(offset, PDF_OBJECT_WINDOW_BYTES)
+        header = _OBJ_HEADER_RE.match(window)
+        if not header or int(header.group(1)) != obj_num:
+            return None
+        end = window.find(b"endobj", header.end())
+        stream = window.find(b"stream", header.end())
+        cut = min(x for x in (end, stream, len(window)) if x != -1)
+        return window[header.end() : cut]
+
+    # User value: supports _lookup_classic so the OCR/transcription journey stays clear and reliable.
+    def _lookup_classic(self, xref_offset: int, obj_num: int) -> tuple[tuple | None, bytes]:
+        pos = xref_offset + len(b"xref")
+        while True:
+            head = self._read_at(pos, 64)
+            match = _SUBSECTION_RE.match(head)
+            if not match:
+                break
+            first, count = int(match.group(1)), int(match.group(2))
+            entries_at = pos + match.end()
+            # Entries are fixed 20-byte records, so the wanted one is read directly.
+            if first <= obj_num < first + count:
+                entry = self._read_at(entries_at + (obj_num - first) * 20, 20).split()
+                if len(entry) >= 3 and entry[2] == b"n":
+                    found = ("offset", int(entry[0]))
+                else:
+                    found = None
+                trailer = self._classic_trailer(entries_at + count * 20)
+                return found, trailer
+            pos = entries_at + count * 20
+        return None, self._classic_trailer(pos)
+
+    # User value: supports _classic_trailer so the OCR/transcription journey stays clear and reliable.
+    def _classic_trailer(self, offset: int) -> bytes:
+        window = self._read_at(offset, PDF_OBJECT_WINDOW_BYTES)
+        idx = window.find(b"trailer")
+        if idx == -1:
+            return b""
+        span = _dict_span(window, idx)
+        return window[span[0] : span[1]] if span else b""
+
+    # User value: supports _lookup_stream so the OCR/transcription journey stays clear and reliable.
+    def _lookup_stream(self, xref_offset: int, obj_num: int) -> tuple[tuple | None, bytes]:
+        decoded = self._read_stream(xref_offset)
+        if not decoded:
+            return None, b""
+        dict_text, data = decoded
+        widths = _int_array(dict_text, "W")
+        if not widths or len(widths) != 3:
+            return None, dict_text
+        index = _int_array(dict_text, "Index") or [0, _int_field(dict_text, "Size") or 0]
+        row = sum(widths)
+        base = 0
+        for i in range(0, len(index) - 1, 2):
+            first, count = index[i], index[i + 1]
+            if first <= obj_num < first + count:
+                at = (base + obj_num - first) * row
+                record = data[at : at + row]
+                if len(record) < row:
+                    return None, dict_text
+                fields = []
+                cursor = 0
+                for width in widths:
+                    fields.append(int.from_bytes(record[cursor : cursor + width], "big") if width else None)
+                    cursor += width
+                kind = 1 if fields[0] is None else fields[0]
+                if kind == 1:
+                    return ("offset", fields[1]), dict_text
+                if kind == 2:
+                    return ("objstm", fields[1], fields[2]), dict_text
+                return None, dict_text
+            base += count
+        return None, dict_text
+
+    # User value: supports _locate so the OCR/transcription journey stays clear and reliable.
+    def _locate(self, start_xref: int, obj_num: int) -> tuple | None:
+        seen = set()
+        pending = [start_xref]
+        while pending and len(seen) < PDF_MAX_XREF_SECTIONS:
+            offset = pending.pop(0)
+            if offset in seen:
+                continue
+            seen.add(offset)
+            head = self._read_at(offset, 16).lstrip()
+            if head.startswith(b"xref"):
+                found, trailer = self._lookup_classic(offset, obj_num)
+                hybrid = _XREFSTM_RE.search(trailer)
+                if not found and hybrid:
+                    found, _ = self._lookup_stream(int(hybrid.group(1)), obj_num)
+            else:
+                found, trailer = self._lookup_stream(offset, obj_num)
+            if found:
+                return found
+            prev = _PREV_RE.search(trailer)
+            if prev:
+                pending.append(int(prev.group(1)))
+        return None
+
+    # User value: supports _resolve so the OCR/transcription journey stays clear and reliable.
+    def _resolve(self, start_xref: int, obj_num: int) -> bytes | None:
+        where = self._locate(start_xref, obj_num)
+        if not where:
+            return None
+        if where[0] == "offset":
+            return self._object_text(where[1], obj_num)
+        container = self._locate(start_xref, where[1])
+        if not container or container[0] != "offset":
+            return None
+        decoded = self._read_stream(container[1])
+        if not decoded:
+            return None
+        dict_text, data = decoded
+        count = _int_field(dict_text, "N") or 0
+        first = _int_field(dict_text, "First") or 0
+        header = data[:first].split()
+        offsets = [(int(header[i]), int(header[i + 1])) for i in range(0, min(len(header), count * 2) - 1, 2)]
+        for idx, (num, rel) in enumerate(offsets):
+            if num == obj_num:
+                end = offsets[idx + 1][1] if idx + 1 < len(offsets) else len(data) - first
+                return data[first + rel : first + end]
+        return None
+
+    # User value: reads /Count from the root page tree so page limits use the PDF's own total.
+    def page_count(self) -> int | None:
+        tail_start = max(0, self._size - PDF_TAIL_BYTES)
+        tail = self._read_at(tail_start, PDF_TAIL_BYTES)
+        xrefs = _STARTXREF_RE.findall(tail)
+        if not xrefs:
+            return None
+        start_xref = int(xrefs[-1])
+
+        roots = _ROOT_RE.findall(tail)
+        if roots:
+            root_num = int(roots[-1][0])
+        else:
+            # Cross-reference streams keep the trailer dictionary on the stream object itself.
+            window = self._read_at(start_xref, PDF_OBJECT_WINDOW_BYTES)
+            match = _ROOT_RE.search(window)
+            if not match:
+                return None
+            root_num = int(match.group(1))
+
+        catalog = self._resolve(start_xref, root_num)
+        if not catalog:
+            return None
+        pages_ref = _PAGES_REF_RE.search(catalog)
+        if not pages_ref:
+            return None
+        pages_node = self._resolve(start_xref, int(pages_ref.group(1)))
+        if not pages_node:
+            return None
+        count = _COUNT_RE.search(pages_node)
+        if not count:
+            return None
+        value = int(count.group(1))
+        return value if value > 0 else None
+
+
+# User value: supports _file_size so the OCR/transcription journey stays clear and reliable.
+def _file_size(file_obj) -> int:
+    file_obj.seek(0, os.SEEK_END)
+    return int(file_obj.tell())
+
+
+# User value: reads the page count from PDF structure (linearization dict or trailer/xref page tree).
+def count_pdf_pages_structural(file_obj) -> int | None:
+    pos = file_obj.tell()
+    try:
+        size = _file_size(file_obj)
+        if size <= 0:
+            return None
+        file_obj.seek(0, os.SEEK_SET)
+        linearized = pages_from_linearization(file_obj.read(PDF_HEAD_BYTES))
+        if linearized:
+            return linearized
+        return _PdfStructureReader(file_obj, size).page_count()
+    except Exception as exc:
+        logger.info("pdf_page_count_structural_failed error=%s", exc.__class__.__name__)
+        return None
+    finally:
+        file_obj.seek(pos, os.SEEK_SET)
+
+
+# User value: scans page markers in overlapping windows so damaged PDFs still get an estimate.
+def scan_pdf_pages(file_obj, chunk_size: int = PDF_SCAN_CHUNK_BYTES) -> int | None:
+    pos = file_obj.tell()
+    tally = PdfPageTally()
+    try:
+        try:
+            fileno = file_obj.fileno()
+        except (AttributeError, OSError, ValueError):
+            fileno = None
+        if fileno is not None and _file_size(file_obj) > 0:
+            # Map on-disk spools so the scan reads page cache directly instead of copying chunks.
+            with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+                _feed_mapped(tally, mapped, chunk_size)
+            return tally.result()
+        file_obj.seek(0, os.SEEK_SET)
+        while True:
+            chunk = file_obj.read(chunk_size)
+            if not chunk:
+                break
+            tally.feed(chunk)
+        return tally.result()
+    finally:
+        file_obj.seek(pos, os.SEEK_SET)
+
+
+# User value: supports _feed_mapped so the OCR/transcription journey stays clear and reliable.
+def _feed_mapped(tally: PdfPageTally, mapped: mmap.mmap, chunk_size: int) -> None:
+    for offset in range(0, len(mapped), chunk_size):
+        tally.feed(mapped[offset : offset + chunk_size])
+
+
+# User value: returns a PDF page count with constant memory, preferring exact structure over heuristics.
+def count_pdf_pages(file_obj) -> int | None:
+    structural = count_pdf_pages_structural(file_obj)
+    if structural:
+        return structural
+    try:
+        return scan_pdf_pages(file_obj)
+    except Exception as exc:
+        logger.info("pdf_page_count_scan_failed error=%s", exc.__class__.__name__)
+        return None
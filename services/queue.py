@@ -1,19 +1,12 @@
 # User value: This file helps users get reliable OCR/transcription results with clear processing behavior.
-import redis
 import os
 import json
 from datetime import datetime
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+from services.redis_client import get_redis
 
-# 🔑 SINGLE CLIENT INSTANCE
-r = redis.Redis.from_url(
-    REDIS_URL,
-    decode_responses=True,
-    socket_keepalive=True,
-    socket_connect_timeout=2,
-    retry_on_timeout=True,
-)
+# 🔑 SINGLE CLIENT INSTANCE (shared process-wide pool)
+r = get_redis()
 
 QUEUE_NAME = os.getenv("QUEUE_NAME", "doc_jobs")
 
@@ -5,6 +5,10 @@ from datetime import datetime
 
 from fastapi import HTTPException
 
+from repositories.job_records import decode_job_fields, queue_job_fields
+from services.feature_flags import is_active_jobs_set_enabled
+from utils.job_indexes import active_jobs_key
+
 logger = logging.getLogger("api.quota")
 
 DAILY_JOB_LIMIT_PER_USER = int(os.getenv("DAILY_JOB_LIMIT_PER_USER", "0"))
@@ -15,12 +19,13 @@ MAX_TRANSCRIPTION_DURATION_SEC = int(os.getenv("MAX_TRANSCRIPTION_DURATION_SEC",
 _TERMINAL = {"COMPLETED", "FAILED", "CANCELLED"}
 
 
-# User value: submits user files safely for OCR/transcription processing.
-def enforce_upload_quotas(*, r, email: str, request_id: str, job_type: str) -> None:
+# User value: applies daily and active-job quotas on the async Redis client so uploads never block the event loop.
+async def enforce_upload_quotas_async(*, r, email: str, request_id: str, job_type: str, owner: str = "") -> None:
+    owner = owner or email
     if DAILY_JOB_LIMIT_PER_USER > 0:
         day_key = datetime.utcnow().strftime("%Y%m%d")
-        counter_key = f"user_daily_jobs:{email}:{day_key}"
-        used = int(r.get(counter_key) or "0")
+        counter_key = f"user_daily_jobs:{owner}:{day_key}"
+        used = int(await r.get(counter_key) or "0")
         if used >= DAILY_JOB_LIMIT_PER_USER:
             raise HTTPException(
                 status_code=429,
@@ -31,12 +36,21 @@ def enforce_upload_quotas(*, r, email: str, request_id: str, job_type: str) -> N
             )
 
     if ACTIVE_JOB_LIMIT_PER_USER > 0:
-        ids = r.lrange(f"user_jobs:{email}", 0, 199) or []
-        active = 0
-        for jid in ids:
-            status = str((r.hget(f"job_status:{jid}", "status") or "")).upper()
-            if status and status not in _TERMINAL:
-                active += 1
+        if is_active_jobs_set_enabled():
+            # The set is kept by every status write, so this is one SCARD however many jobs the user has.
+            active = int(await r.scard(active_jobs_key(owner)) or 0)
+        else:
+            ids = await r.lrange(f"user_jobs:{owner}", 0, 199) or []
+            # One pipelined round trip instead of one HGET per recent job.
+            async with r.pipeline(transaction=False) as pipe:
+                for jid in ids:
+                    queue_job_fields(pipe, jid, "status")
+                rows = await pipe.execute() if ids else []
+            active = 0
+            for row in rows:
+                status = str(decode_job_fields(("status",), row)["status"] or "").upper()
+                if status and status not in _TERMINAL:
+                    active += 1
         if active >= ACTIVE_JOB_LIMIT_PER_USER:
             raise HTTPException(
                 status_code=429,
@@ -55,17 +69,6 @@ def enforce_upload_quotas(*, r, email: str, request_id: str, job_type: str) -> N
     )
 
 
-# User value: supports register_daily_job_usage so the OCR/transcription journey stays clear and reliable.
-def register_daily_job_usage(*, r, email: str) -> None:
-    if DAILY_JOB_LIMIT_PER_USER <= 0:
-        return
-    day_key = datetime.utcnow().strftime("%Y%m%d")
-    counter_key = f"user_daily_jobs:{email}:{day_key}"
-    value = int(r.incr(counter_key))
-    if value == 1:
-        r.expire(counter_key, 172800)
-
-
 # User value: shows clear processing timing so users can set expectations.
 def enforce_pages_and_duration_limits(*, job_type: str, total_pages: int | None, media_duration_sec: float | None) -> None:
     if job_type == "OCR" and MAX_OCR_PAGES > 0 and total_pages is not None and total_pages > MAX_OCR_PAGES:
@@ -0,0 +1,94 @@
+# User value: This file lets signed-in users poll job status with a cheap API session token instead of a full Google check.
+# services/session_tokens.py
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Callable, Optional
+
+SESSION_TOKEN_PREFIX = "dts1."
+SESSION_EPOCH_KEY = "auth:session_epoch"
+
+
+# User value: supports _b64encode so the OCR/transcription journey stays clear and reliable.
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+# User value: supports _b64decode so the OCR/transcription journey stays clear and reliable.
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+# User value: supports _sign so the OCR/transcription journey stays clear and reliable.
+def _sign(secret: str, signing_input: str) -> str:
+    return _b64encode(hmac.new(secret.encode("utf-8"), signing_input.encode("ascii"), hashlib.sha256).digest())
+
+
+# User value: supports is_session_token so the OCR/transcription journey stays clear and reliable.
+def is_session_token(token: str) -> bool:
+    return token.startswith(SESSION_TOKEN_PREFIX)
+
+
+# User value: issues a compact signed token carrying the user's email, expiry and the current revocation epoch.
+def mint_session_token(*, secret: str, email: str, name: Optional[str], epoch: int, ttl_sec: int, now: Optional[int] = None) -> tuple[str, int]:
+    issued_at = int(time.time() if now is None else now)
+    expires_at = issued_at + int(ttl_sec)
+    claims = {"e": email, "x": expires_at, "v": int(epoch)}
+    if name:
+        claims["n"] = name
+    body = _b64encode(json.dumps(claims, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+    signing_input = SESSION_TOKEN_PREFIX + body
+    return f"{signing_input}.{_sign(secret, signing_input)}", expires_at
+
+
+# User value: returns the token's claims only when the signature matches, it is unexpired and not revoked.
+def verify_session_token(token: str, *, secret: str, epoch: int, now: Optional[int] = None) -> Optional[dict]:
+    if not is_session_token(token):
+        return None
+    signing_input, _, signature = token.rpartition(".")
+    if not signing_input or not hmac.compare_digest(signature, _sign(secret, signing_input)):
+        return None
+    try:
+        claims = json.loads(_b64decode(signing_input[len(SESSION_TOKEN_PREFIX):]))
+        email = str(claims["e"])
+        expires_at = int(claims["x"])
+        token_epoch = int(claims["v"])
+    except (ValueError, KeyError, TypeError):
+        return None
+    current = int(time.time() if now is None else now)
+    if expires_at <= current or token_epoch != int(epoch):
+        return None
+    return {"email": email, "email_verified": True, "name": claims.get("n"), "exp": expires_at, "auth_method": "session"}
+
+
+class SessionEpochCache:
+    # User value: reads the revocation epoch from Redis at most once per refresh window per process.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, read_epoch: Callable[[], Optional[str]], refresh_sec: float, clock: Callable[[], float] = time.monotonic):
+        self._read_epoch = read_epoch
+        self._refresh_sec = refresh_sec
+        self._clock = clock
+        self._value: Optional[int] = None
+        self._read_at = 0.0
+
+    # User value: returns the cached epoch, falling back to the last known value if Redis is briefly unreachable.
+    def get(self) -> int:
+        now = self._clock()
+        if self._value is not None and now - self._read_at < self._refresh_sec:
+            return self._value
+        try:
+            raw = self._read_epoch()
+        except Exception:
+            if self._value is None:
+                raise
+            return self._value
+        self._value = int(raw or 0)
+        self._read_at = now
+        return self._value
+
+    # User value: supports invalidate so the OCR/transcription journey stays clear and reliable.
+    def invalidate(self) -> None:
+        self._value = None
@@ -0,0 +1,133 @@
+# User value: This file reuses signed download links so job lists and status polls stay fast for finished jobs.
+# services/signed_urls.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from services.gcs import generate_signed_url
+from utils.metrics import incr
+
+SIGNED_URL_TTL_MIN = int(os.getenv("SIGNED_URL_TTL_MIN", "60"))
+SIGNED_URL_CACHE_SIZE = int(os.getenv("SIGNED_URL_CACHE_SIZE", "4096"))
+SIGNED_URL_SAFETY_MARGIN_SEC = int(os.getenv("SIGNED_URL_SAFETY_MARGIN_SEC", "300"))
+SIGNED_URL_SIGN_CONCURRENCY = int(os.getenv("SIGNED_URL_SIGN_CONCURRENCY", "8"))
+DEFAULT_RESPONSE_TYPE = "text/plain; charset=utf-8"
+
+
+class DownloadTarget(NamedTuple):
+    # User value: identifies one downloadable result; also the cache key for its signed URL.
+
+    bucket: str
+    blob: str
+    filename: str
+    response_type: Optional[str] = DEFAULT_RESPONSE_TYPE
+
+
+# User value: finds the stored result for a job so a download link can be signed for it.
+def download_target(data: dict) -> Optional[DownloadTarget]:
+    output_path = data.get("output_path")
+    if not output_path or not str(output_path).startswith("gs://"):
+        return None
+    bucket, _, blob = str(output_path)[len("gs://"):].partition("/")
+    if not bucket or not blob:
+        return None
+    filename = data.get("output_filename") or os.path.basename(blob) or "transcript.txt"
+    return DownloadTarget(bucket=bucket, blob=blob, filename=filename)
+
+
+class SignedUrlCache:
+    # User value: keeps recently signed URLs until shortly before they expire, bounded by LRU eviction.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, max_entries: int, clock=time.time):
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[DownloadTarget, tuple[str, float]] = OrderedDict()
+
+    # User value: supports get so the OCR/transcription journey stays clear and reliable.
+    def get(self, target: DownloadTarget) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(target)
+            if entry is None:
+                return None
+            url, reuse_until = entry
+            if self._clock() >= reuse_until:
+                del self._entries[target]
+                return None
+            self._entries.move_to_end(target)
+            return url
+
+    # User value: supports put so the OCR/transcription journey stays clear and reliable.
+    def put(self, target: DownloadTarget, url: str, reuse_until: float) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[target] = (url, reuse_until)
+            self._entries.move_to_end(target)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    # User value: supports clear so the OCR/transcription journey stays clear and reliable.
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = SignedUrlCache(SIGNED_URL_CACHE_SIZE)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+# User value: supports _get_executor so the OCR/transcription journey stays clear and reliable.
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(1, SIGNED_URL_SIGN_CONCURRENCY), thread_name_prefix="url-sign")
+        return _executor
+
+
+# User value: signs one URL and caches it until the safety margin before expiry.
+def _sign(target: DownloadTarget) -> str:
+    signed_at = time.time()
+    url = generate_signed_url(
+        bucket_name=target.bucket,
+        blob_path=target.blob,
+        expiration_minutes=SIGNED_URL_TTL_MIN,
+        download_filename=target.filename,
+        response_type=target.response_type,
+    )
+    _cache.put(target, url, signed_at + SIGNED_URL_TTL_MIN * 60 - SIGNED_URL_SAFETY_MARGIN_SEC)
+    return url
+
+
+# User value: returns signed download URLs for many results, signing only cache misses and doing so concurrently.
+def signed_download_urls(targets: list[DownloadTarget]) -> list[str]:
+    urls: list[Optional[str]] = [_cache.get(target) for target in targets]
+    # The same result can appear more than once on a page; sign it once.
+    missing = list(dict.fromkeys(t for t, url in zip(targets, urls) if url is None))
+    hits = len(targets) - sum(1 for url in urls if url is None)
+    if hits:
+        incr("signed_url_cache_total", amount=hits, result="hit")
+    if missing:
+        incr("signed_url_cache_total", amount=len(missing), result="miss")
+        if len(missing) == 1:
+            fresh = {missing[0]: _sign(missing[0])}
+        else:
+            fresh = dict(zip(missing, _get_executor().map(_sign, missing)))
+        urls = [url if url is not None else fresh[target] for target, url in zip(targets, urls)]
+    return urls
+
+
+# User value: changes at least once per safety margin, so an ETag that includes it never outlives a cached URL.
+def url_freshness_bucket(now: Optional[float] = None) -> int:
+    return int((time.time() if now is None else now) // max(1, SIGNED_URL_SAFETY_MARGIN_SEC))
+
+
+# User value: returns one signed download URL, reusing a cached one while it is still safely valid.
+def signed_download_url(target: DownloadTarget) -> str:
+    return signed_download_urls([target])[0]
@@ -0,0 +1,154 @@
+# User value: This file inspects each upload in one pass so users get fast checks without re-reading large files.
+# services/upload_inspector.py
+import base64
+import hashlib
+import os
+
+import google_crc32c
+
+from services.pdf_page_count import (
+    PDF_HEAD_BYTES,
+    PdfPageTally,
+    count_pdf_pages_structural,
+    pages_from_linearization,
+)
+
+UPLOAD_INSPECT_CHUNK_KB = int(os.getenv("UPLOAD_INSPECT_CHUNK_KB", "1024"))
+SNIFF_HEAD_BYTES = 64
+
+_TYPE_TO_JOB_TYPE = {
+    "pdf": "OCR",
+    "png": "OCR",
+    "jpeg": "OCR",
+    "gif": "OCR",
+    "tiff": "OCR",
+    "bmp": "OCR",
+    "webp": "OCR",
+    "mp3": "TRANSCRIPTION",
+    "wav": "TRANSCRIPTION",
+    "flac": "TRANSCRIPTION",
+    "ogg": "TRANSCRIPTION",
+    "aac": "TRANSCRIPTION",
+    "mp4": "TRANSCRIPTION",
+    "webm": "TRANSCRIPTION",
+    "avi": "TRANSCRIPTION",
+    "wma": "TRANSCRIPTION",
+}
+
+
+# User value: identifies real file content from magic bytes so mislabeled uploads are flagged early.
+def sniff_file_type(head: bytes) -> str:
+    if not head:
+        return "unknown"
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if head.startswith((b"II*\x00", b"MM\x00*")):
+        return "tiff"
+    if head.startswith(b"BM"):
+        return "bmp"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"RIFF" and head[8:12] == b"AVI ":
+        return "avi"
+    if head.startswith(b"ID3"):
+        return "mp3"
+    if head.startswith(b"fLaC"):
+        return "flac"
+    if head.startswith(b"OggS"):
+        return "ogg"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "webm"
+    if head.startswith(b"\x30\x26\xb2\x75\x8e\x66\xcf\x11"):
+        return "wma"
+    if len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xF6) == 0xF0:
+        return "aac"
+    if len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0:
+        return "mp3"
+    return "unknown"
+
+
+# User value: maps sniffed content to OCR/transcription so routing warnings use real file bytes.
+def sniffed_job_type(file_type: str) -> str:
+    return _TYPE_TO_JOB_TYPE.get(str(file_type or ""), "UNKNOWN")
+
+
+class UploadInspector:
+    # User value: computes size, checksums, page count and content type together so uploads are read only once.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, *, count_pdf_pages: bool = False):
+        self._size = 0
+        self._sha256 = hashlib.sha256()
+        self._crc32c = google_crc32c.Checksum()
+        self._head = bytearray()
+        self._pages = PdfPageTally() if count_pdf_pages else None
+        self._pdf_head = bytearray() if count_pdf_pages else None
+
+    @property
+    # User value: exposes bytes seen so far so size caps can be enforced mid-stream.
+    def size_bytes(self) -> int:
+        return self._size
+
+    # User value: folds one chunk into every inspection result at once.
+    def feed(self, data: bytes) -> None:
+        if not data:
+            return
+        self._size += len(data)
+        self._sha256.update(data)
+        self._crc32c.update(data)
+        if len(self._head) < SNIFF_HEAD_BYTES:
+            self._head.extend(data[: SNIFF_HEAD_BYTES - len(self._head)])
+        if self._pages is not None:
+            self._pages.feed(data)
+            if len(self._pdf_head) < PDF_HEAD_BYTES:
+                self._pdf_head.extend(data[: PDF_HEAD_BYTES - len(self._pdf_head)])
+
+    # User value: prefers the page total a linearized PDF declares over the marker heuristic.
+    def _pdf_page_count(self) -> int | None:
+        if self._pages is None:
+            return None
+        return pages_from_linearization(bytes(self._pdf_head)) or self._pages.result()
+
+    # User value: returns one inspection result that all upload checks share.
+    def result(self) -> dict:
+        file_type = sniff_file_type(bytes(self._head))
+        return {
+            "size_bytes": self._size,
+            "sha256": self._sha256.hexdigest(),
+            # Base64 of the big-endian CRC32C, the encoding GCS uses for object checksums.
+            "crc32c": base64.b64encode(self._crc32c.digest()).decode("ascii"),
+            "pdf_page_count": self._pdf_page_count(),
+            "sniffed_type": file_type,
+            "sniffed_job_type": sniffed_job_type(file_type),
+        }
+
+
+# User value: inspects a spooled upload in fixed-size chunks so large files are read once with bounded memory.
+def inspect_upload(file_obj, *, count_pdf_pages: bool = False, chunk_size: int | None = None) -> dict:
+    size = int(chunk_size or UPLOAD_INSPECT_CHUNK_KB * 1024)
+    inspector = UploadInspector(count_pdf_pages=count_pdf_pages)
+    pos = file_obj.tell()
+    file_obj.seek(0, os.SEEK_SET)
+    try:
+        while True:
+            chunk = file_obj.read(size)
+            if not chunk:
+                break
+            inspector.feed(chunk)
+    finally:
+        file_obj.seek(pos, os.SEEK_SET)
+    result = inspector.result()
+    if count_pdf_pages:
+        # Seekable spools can read the page tree's own /Count, which beats the marker heuristic.
+        result["pdf_page_count"] = count_pdf_pages_structural(file_obj) or result["pdf_page_count"]
+    return result
@@ -7,19 +7,32 @@ import os
 import re
 import uuid
 from datetime import datetime
+from typing import AsyncIterator
 
-import redis
 from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 from schemas.job_contract import CONTRACT_VERSION, JOB_TYPES, JOB_STATUS_QUEUED
+from repositories.job_records import encode_job, read_job_async
+from repositories.user_directory import owns, user_ref_async
 from services.feature_flags import (
     FEATURE_COST_GUARDRAIL,
     FEATURE_DURATION_PAGE_LIMITS,
     FEATURE_QUEUE_PARTITIONING,
     FEATURE_UPLOAD_QUOTAS,
+    is_compact_job_records_enabled,
 )
 from services.cost_guardrail import evaluate_cost_guardrail
-from services.gcs import upload_file
+from services.gcs import (
+    cancel_resumable_upload,
+    create_resumable_upload_url,
+    delete_blob,
+    generate_upload_url,
+    get_blob_metadata,
+    open_blob_reader,
+    open_resumable_upload,
+    upload_file,
+)
 from services.intake_precheck import build_precheck_warnings
 from services.intake_router import (
     OCR_EXTENSIONS as ALLOWED_OCR_EXTENSIONS,
@@ -28,20 +41,35 @@ from services.intake_router import (
     TRANSCRIPTION_MIME_PREFIXES as ALLOWED_TRANSCRIPTION_MIME_PREFIXES,
     detect_route_from_metadata,
 )
-from services.quota import enforce_pages_and_duration_limits, enforce_upload_quotas, register_daily_job_usage
+from services.job_commit import commit_and_enqueue_job
+from services.quota import DAILY_JOB_LIMIT_PER_USER, enforce_pages_and_duration_limits, enforce_upload_quotas_async
+from services.pdf_page_count import count_pdf_pages
+from services.redis_client import get_async_redis
+from services.upload_inspector import UploadInspector, inspect_upload
+from services.upload_stream import (
+    MultipartStreamReader,
+    ResumableUploadSink,
+    StreamedFile,
+    stream_chunk_size_bytes,
+)
 from utils.metrics import incr
 from utils.stage_logging import log_stage
-from utils.status_machine import transition_hset
 
 logger = logging.getLogger("api.upload")
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-r = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+# Upload handlers run on the event loop, so every Redis call on this path goes through the asyncio client.
+r = get_async_redis()
 
 QUEUE_NAME = os.getenv("QUEUE_NAME", "doc_jobs")
 QUEUE_NAME_OCR = os.getenv("QUEUE_NAME_OCR", "doc_jobs_ocr")
 QUEUE_NAME_TRANSCRIPTION = os.getenv("QUEUE_NAME_TRANSCRIPTION", "doc_jobs_transcription")
 IDEMPOTENCY_TTL_SEC = int(os.getenv("IDEMPOTENCY_TTL_SEC", "900"))
+DIRECT_UPLOAD_URL_TTL_SEC = int(os.getenv("DIRECT_UPLOAD_URL_TTL_SEC", "900"))
+# Pending records outlive the URL so a client that finished right at expiry can still complete.
+DIRECT_UPLOAD_PENDING_TTL_SEC = DIRECT_UPLOAD_URL_TTL_SEC * 2
+DIRECT_UPLOAD_MODES = {"PUT", "RESUMABLE"}
+# Ranged-read size when /upload/complete inspects a stored PDF (the structural count reads head and tail only).
+DIRECT_UPLOAD_READ_CHUNK_BYTES = 256 * 1024
 
 MAX_OCR_FILE_SIZE_MB = int(os.getenv("MAX_OCR_FILE_SIZE_MB", "200"))
 MAX_TRANSCRIPTION_FILE_SIZE_MB = int(os.getenv("MAX_TRANSCRIPTION_FILE_SIZE_MB", "200"))
@@ -55,6 +83,8 @@ DEFAULT_CONTENT_SUBTYPE = {
     "OCR": "jain_literature",
     "TRANSCRIPTION": "pravachan",
 }
+# Slack for multipart boundaries/headers when comparing Content-Length with the file size cap.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
 
 
 # User value: routes work so user OCR/transcription jobs are processed correctly.
@@ -68,22 +98,8 @@ def resolve_target_queue(job_type: str) -> str:
 
 # User value: normalizes data so users see consistent OCR/transcription results.
 def _parse_pdf_page_count(file_obj) -> int | None:
-    try:
-        pos = file_obj.tell()
-        file_obj.seek(0, os.SEEK_SET)
-        blob = file_obj.read()
-        file_obj.seek(pos, os.SEEK_SET)
-        if not blob:
-            return None
-        text = blob.decode("latin-1", errors="ignore")
-        # Lightweight heuristic to avoid adding heavy PDF dependency at API layer.
-        count = text.count("/Type /Page")
-        if count <= 0:
-            return None
-        # Some PDFs include "/Pages" nodes; keep floor at 1 for valid matches.
-        return max(1, count - text.count("/Type /Pages"))
-    except Exception:
-        return None
+    # Reads trailer/xref structure with bounded seeks and avoids adding a heavy PDF dependency at API layer.
+    return count_pdf_pages(file_obj)
 
 
 # User value: supports derive_total_pages so the OCR/transcription journey stays clear and reliable.
@@ -220,14 +236,17 @@ def _build_reuse_response(job_id: str, data: dict, request_id: str) -> dict:
 
 
 # User value: supports try_reuse_idempotent_job so the OCR/transcription journey stays clear and reliable.
-def try_reuse_idempotent_job(*, email: str, job_type: str, idem_key: str, request_id: str) -> dict | None:
-    map_key = idempotency_redis_key(email, job_type, idem_key)
-    existing_job_id = r.get(map_key)
+async def try_reuse_idempotent_job(
+    *, email: str, job_type: str, idem_key: str, request_id: str, owner: str = ""
+) -> dict | None:
+    owner = owner or email
+    map_key = idempotency_redis_key(owner, job_type, idem_key)
+    existing_job_id = await r.get(map_key)
 
     if existing_job_id:
-        data = r.hgetall(f"job_status:{existing_job_id}")
-        if data and data.get("user") == email and (data.get("job_type") or "").upper() == job_type:
-            r.expire(map_key, IDEMPOTENCY_TTL_SEC)
+        data = await read_job_async(r, existing_job_id)
+        if data and owns(data.get("user"), email, owner) and (data.get("job_type") or "").upper() == job_type:
+            await r.expire(map_key, IDEMPOTENCY_TTL_SEC)
             log_stage(
                 job_id=existing_job_id,
                 stage="UPLOAD_IDEMPOTENCY",
@@ -240,12 +259,12 @@ def try_reuse_idempotent_job(*, email: str, job_type: str, idem_key: str, reques
             incr("api_jobs_idempotent_reused_total", job_type=job_type)
             return _build_reuse_response(existing_job_id, data, request_id)
 
-        r.delete(map_key)
+        await r.delete(map_key)
 
     deterministic_job_id = derive_idempotent_job_id(email, job_type, idem_key)
-    existing = r.hgetall(f"job_status:{deterministic_job_id}")
-    if existing and existing.get("user") == email and (existing.get("job_type") or "").upper() == job_type:
-        r.set(map_key, deterministic_job_id, ex=IDEMPOTENCY_TTL_SEC)
+    existing = await read_job_async(r, deterministic_job_id)
+    if existing and owns(existing.get("user"), email, owner) and (existing.get("job_type") or "").upper() == job_type:
+        await r.set(map_key, deterministic_job_id, ex=IDEMPOTENCY_TTL_SEC)
         log_stage(
             job_id=deterministic_job_id,
             stage="UPLOAD_IDEMPOTENCY",
@@ -261,16 +280,16 @@ def try_reuse_idempotent_job(*, email: str, job_type: str, idem_key: str, reques
     return None
 
 
-# User value: submits user files safely for OCR/transcription processing.
-def submit_upload_job(
+# User value: runs pre-upload checks once so every upload path applies the same idempotency and quota rules.
+async def _prepare_submission(
     *,
-    file: UploadFile,
+    filename: str | None,
+    content_type: str | None,
     job_type: str,
     email: str,
     request_id: str,
     idempotency_key: str | None,
-    media_duration_sec: float | None = None,
-    content_subtype: str | None = None,
+    content_subtype: str | None,
 ) -> dict:
     if job_type not in JOB_TYPES:
         incr("api_jobs_submit_failed_total", reason="invalid_job_type", job_type=job_type or "")
@@ -278,6 +297,7 @@ def submit_upload_job(
         raise HTTPException(status_code=400, detail="Invalid job type")
 
     user_email = email.lower()
+    owner = await user_ref_async(r, user_email)
     queue_name = resolve_target_queue(job_type)
     idem_key = normalize_idempotency_key(idempotency_key)
     normalized_content_subtype = normalize_content_subtype(job_type, content_subtype)
@@ -291,11 +311,11 @@ def submit_upload_job(
             job_type=job_type,
             request_id=request_id,
         )
-        reused = try_reuse_idempotent_job(
-            email=user_email, job_type=job_type, idem_key=idem_key, request_id=request_id
+        reused = await try_reuse_idempotent_job(
+            email=user_email, job_type=job_type, idem_key=idem_key, request_id=request_id, owner=owner
         )
         if reused:
-            return reused
+            return {"reused": reused}
 
     job_id = derive_idempotent_job_id(user_email, job_type, idem_key) if idem_key else uuid.uuid4().hex
 
@@ -305,31 +325,67 @@ def submit_upload_job(
         event="STARTED",
         user=user_email,
         job_type=job_type,
-        filename=file.filename,
+        filename=filename,
         queue=queue_name,
         contract_version=CONTRACT_VERSION,
         request_id=request_id,
     )
 
     if FEATURE_UPLOAD_QUOTAS:
-        enforce_upload_quotas(r=r, email=user_email, request_id=request_id or "", job_type=job_type)
+        await enforce_upload_quotas_async(
+            r=r, email=user_email, request_id=request_id or "", job_type=job_type, owner=owner
+        )
 
-    route_detection = detect_route_from_metadata(file.filename, file.content_type)
+    route_detection = detect_route_from_metadata(filename, content_type)
     log_stage(
         job_id=job_id,
         stage="UPLOAD_ROUTE_DETECT",
         event="COMPLETED",
         user=user_email,
         job_type=job_type,
-        filename=file.filename,
+        filename=filename,
         request_id=request_id,
         detected_job_type=route_detection.get("detected_job_type", "UNKNOWN"),
         confidence=route_detection.get("confidence", 0.0),
         reasons="|".join(route_detection.get("reasons") or []),
     )
 
-    input_size_bytes = get_upload_size_bytes(file.file)
-    total_pages = derive_total_pages(file, job_type)
+    return {
+        "reused": None,
+        "job_id": job_id,
+        "job_type": job_type,
+        "user_email": user_email,
+        "owner": owner,
+        "queue_name": queue_name,
+        "idem_key": idem_key,
+        "content_subtype": normalized_content_subtype,
+        "request_id": request_id,
+    }
+
+
+# User value: derives OCR page count from the inspection result so page limits never re-read the file.
+def _total_pages_from_inspection(job_type: str, filename: str | None, inspection: dict) -> int | None:
+    if job_type != "OCR":
+        return None
+    if _extension(filename) == ".pdf":
+        return inspection.get("pdf_page_count")
+    return 1
+
+
+# User value: applies warnings, cost guardrail and limits so users get the same policy on every upload path.
+def _enforce_upload_policies(
+    ctx: dict,
+    *,
+    file,
+    inspection: dict,
+    total_pages: int | None,
+    media_duration_sec: float | None,
+) -> None:
+    job_id = ctx["job_id"]
+    job_type = ctx["job_type"]
+    user_email = ctx["user_email"]
+    request_id = ctx["request_id"]
+    input_size_bytes = int(inspection["size_bytes"])
 
     precheck_warnings = build_precheck_warnings(
         job_type=job_type,
@@ -338,6 +394,7 @@ def submit_upload_job(
         file_size_bytes=input_size_bytes,
         media_duration_sec=media_duration_sec,
         pdf_page_count=total_pages,
+        sniffed_job_type=inspection.get("sniffed_job_type"),
     )
     if FEATURE_COST_GUARDRAIL:
         cost_eval = evaluate_cost_guardrail(
@@ -400,23 +457,222 @@ def submit_upload_job(
             total_pages=total_pages,
             media_duration_sec=media_duration_sec,
         )
+    _validate_for_submission(ctx, file=file, input_size_bytes=input_size_bytes)
+
+
+# User value: validates file type and size with consistent logging on every upload path.
+def _validate_for_submission(ctx: dict, *, file, input_size_bytes: int) -> None:
     try:
-        validate_upload_constraints(file=file, job_type=job_type, input_size_bytes=input_size_bytes)
+        validate_upload_constraints(file=file, job_type=ctx["job_type"], input_size_bytes=input_size_bytes)
     except HTTPException as exc:
-        incr("api_jobs_submit_failed_total", reason="upload_validation_failed", job_type=job_type or "")
+        incr("api_jobs_submit_failed_total", reason="upload_validation_failed", job_type=ctx["job_type"] or "")
         log_stage(
-            job_id=job_id,
+            job_id=ctx["job_id"],
             stage="UPLOAD_VALIDATION",
             event="FAILED",
-            user=user_email,
-            job_type=job_type,
+            user=ctx["user_email"],
+            job_type=ctx["job_type"],
             filename=file.filename,
             input_size_bytes=input_size_bytes,
-            request_id=request_id,
+            request_id=ctx["request_id"],
             error=str(exc.detail),
         )
         raise
 
+
+# User value: records job metadata and enqueues work so stored uploads reliably reach workers.
+async def _commit_and_enqueue(
+    ctx: dict,
+    *,
+    filename: str,
+    input_gcs_uri: str,
+    input_size_bytes: int,
+    total_pages: int | None,
+    media_duration_sec: float | None,
+) -> dict:
+    job_id = ctx["job_id"]
+    job_type = ctx["job_type"]
+    user_email = ctx["user_email"]
+    owner = ctx.get("owner") or user_email
+    queue_name = ctx["queue_name"]
+    idem_key = ctx["idem_key"]
+    request_id = ctx["request_id"]
+    normalized_content_subtype = ctx["content_subtype"]
+
+    output_filename = make_output_filename(filename)
+    source = "ocr" if job_type == "OCR" else "file"
+
+    now_ts = datetime.utcnow().isoformat()
+    payload = {
+        "contract_version": CONTRACT_VERSION,
+        "job_id": job_id,
+        "job_type": job_type,
+        "source": source,
+        "queue": queue_name,
+        "input_gcs_uri": input_gcs_uri,
+        "filename": filename,
+        "output_filename": output_filename,
+        "input_size_bytes": input_size_bytes,
+        "request_id": request_id or "",
+        "content_subtype": normalized_content_subtype,
+    }
+
+    log_stage(
+        job_id=job_id,
+        stage="REDIS_JOB_METADATA",
+        event="STARTED",
+        user=user_email,
+        job_type=job_type,
+        source=source,
+    )
+    try:
+        # One script call replaces the transition check, metadata write, quota count and enqueue round trips.
+        committed = await commit_and_enqueue_job(
+            r,
+            job_id=job_id,
+            user_email=owner,
+            queue_name=queue_name,
+            mapping=encode_job(
+                {
+                    "contract_version": CONTRACT_VERSION,
+                    "status": JOB_STATUS_QUEUED,
+                    "stage": "Queued",
+                    "progress": 0,
+                    "user": owner,
+                    "job_type": job_type,
+                    "source": source,
+                    "input_filename": filename,
+                    "input_size_bytes": input_size_bytes,
+                    "output_filename": output_filename,
+                    "total_pages": total_pages if total_pages is not None else "",
+                    "duration_sec": media_duration_sec if media_duration_sec is not None else "",
+                    "created_at": now_ts,
+                    "updated_at": now_ts,
+                    "request_id": request_id or "",
+                    "content_subtype": normalized_content_subtype,
+                },
+                compact=is_compact_job_records_enabled(),
+            ),
+            payload=payload,
+            idempotency_key=idempotency_redis_key(owner, job_type, idem_key) if idem_key else "",
+            idempotency_ttl_sec=IDEMPOTENCY_TTL_SEC,
+            count_daily_usage=DAILY_JOB_LIMIT_PER_USER > 0,
+            enqueue_ttl_sec=IDEMPOTENCY_TTL_SEC if idem_key else 24 * 3600,
+        )
+    except Exception as exc:
+        log_stage(
+            job_id=job_id,
+            stage="REDIS_JOB_METADATA",
+            event="FAILED",
+            user=user_email,
+            job_type=job_type,
+            source=source,
+            error=f"{exc.__class__.__name__}: {exc}",
+        )
+        raise HTTPException(status_code=503, detail="Queue metadata write failed") from exc
+
+    if not committed["ok"]:
+        logger.warning(
+            "status_transition_blocked context=UPLOAD_INIT key=job_status:%s current=%s target=%s request_id=%s",
+            job_id,
+            committed["current_status"],
+            JOB_STATUS_QUEUED,
+            request_id or "",
+        )
+        raise HTTPException(
+            status_code=409,
+            detail=f"Invalid status transition to QUEUED from {committed['current_status'] or 'NONE'}",
+        )
+
+    log_stage(
+        job_id=job_id,
+        stage="REDIS_JOB_METADATA",
+        event="COMPLETED",
+        user=user_email,
+        job_type=job_type,
+        source=source,
+    )
+    if committed["enqueued"]:
+        log_stage(
+            job_id=job_id,
+            stage="REDIS_QUEUE_ENQUEUE",
+            event="COMPLETED",
+            user=user_email,
+            job_type=job_type,
+            source=source,
+            queue=queue_name,
+            queue_depth=committed["queue_depth"],
+        )
+    else:
+        log_stage(
+            job_id=job_id,
+            stage="REDIS_QUEUE_ENQUEUE",
+            event="COMPLETED",
+            user=user_email,
+            job_type=job_type,
+            source=source,
+            queue=queue_name,
+            message="duplicate_enqueue_skipped",
+        )
+        incr("api_jobs_idempotent_reused_total", job_type=job_type)
+
+    incr("api_jobs_submitted_total", job_type=job_type, source=source)
+    log_stage(
+        job_id=job_id,
+        stage="UPLOAD_REQUEST",
+        event="COMPLETED",
+        user=user_email,
+        job_type=job_type,
+        source=source,
+        contract_version=CONTRACT_VERSION,
+        request_id=request_id,
+    )
+
+    return {"job_id": job_id, "request_id": request_id, "reused": False}
+
+
+# User value: submits user files safely for OCR/transcription processing.
+async def submit_upload_job(
+    *,
+    file: UploadFile,
+    job_type: str,
+    email: str,
+    request_id: str,
+    idempotency_key: str | None,
+    media_duration_sec: float | None = None,
+    content_subtype: str | None = None,
+) -> dict:
+    ctx = await _prepare_submission(
+        filename=file.filename,
+        content_type=file.content_type,
+        job_type=job_type,
+        email=email,
+        request_id=request_id,
+        idempotency_key=idempotency_key,
+        content_subtype=content_subtype,
+    )
+    if ctx["reused"]:
+        return ctx["reused"]
+    job_id = ctx["job_id"]
+    user_email = ctx["user_email"]
+
+    # Hashing and page counting are CPU-bound and read the spool from disk, so they run off the event loop.
+    inspection = await run_in_threadpool(
+        inspect_upload,
+        file.file,
+        count_pdf_pages=job_type == "OCR" and _extension(file.filename) == ".pdf",
+    )
+    input_size_bytes = inspection["size_bytes"]
+    total_pages = _total_pages_from_inspection(job_type, file.filename, inspection)
+
+    _enforce_upload_policies(
+        ctx,
+        file=file,
+        inspection=inspection,
+        total_pages=total_pages,
+        media_duration_sec=media_duration_sec,
+    )
+
     log_stage(
         job_id=job_id,
         stage="INPUT_STORED_IN_GCS",
@@ -427,9 +683,12 @@ def submit_upload_job(
         input_size_bytes=input_size_bytes,
     )
     try:
-        gcs = upload_file(
+        # The GCS SDK is blocking, so the upload runs in the worker threadpool.
+        gcs = await run_in_threadpool(
+            upload_file,
             file_obj=file.file,
             destination_path=f"jobs/{job_id}/input/{file.filename}",
+            crc32c=inspection["crc32c"],
         )
         log_stage(
             job_id=job_id,
@@ -438,6 +697,9 @@ def submit_upload_job(
             user=user_email,
             job_type=job_type,
             input_gcs_uri=gcs.get("gcs_uri"),
+            input_sha256=inspection["sha256"],
+            input_crc32c=inspection["crc32c"],
+            sniffed_type=inspection["sniffed_type"],
         )
     except HTTPException:
         raise
@@ -452,148 +714,507 @@ def submit_upload_job(
         )
         raise HTTPException(status_code=503, detail="Failed to store upload input") from exc
 
-    output_filename = make_output_filename(file.filename)
-    source = "ocr" if job_type == "OCR" else "file"
-
-    log_stage(
-        job_id=job_id,
-        stage="REDIS_JOB_METADATA",
-        event="STARTED",
-        user=user_email,
-        job_type=job_type,
-        source=source,
+    return await _commit_and_enqueue(
+        ctx,
+        filename=file.filename,
+        input_gcs_uri=gcs["gcs_uri"],
+        input_size_bytes=input_size_bytes,
+        total_pages=total_pages,
+        media_duration_sec=media_duration_sec,
     )
+
+
+# User value: returns the per-type size cap so oversized streamed uploads stop before storing every byte.
+def max_upload_size_bytes(job_type: str) -> int:
+    if job_type == "OCR":
+        return MAX_OCR_FILE_SIZE_BYTES
+    return MAX_TRANSCRIPTION_FILE_SIZE_BYTES
+
+
+# User value: removes a stored input after a late rejection so storage does not keep unusable uploads.
+def _discard_stored_input(job_id: str, destination_path: str) -> None:
     try:
-        now_ts = datetime.utcnow().isoformat()
-        ok, current_status, _ = transition_hset(
-            r,
-            key=f"job_status:{job_id}",
-            mapping={
-                "contract_version": CONTRACT_VERSION,
-                "status": JOB_STATUS_QUEUED,
-                "stage": "Queued",
-                "progress": 0,
-                "user": user_email,
-                "job_type": job_type,
-                "source": source,
-                "input_filename": file.filename,
-                "input_size_bytes": input_size_bytes,
-                "output_filename": output_filename,
-                "total_pages": total_pages if total_pages is not None else "",
-                "duration_sec": media_duration_sec if media_duration_sec is not None else "",
-                "created_at": now_ts,
-                "updated_at": now_ts,
-                "request_id": request_id or "",
-                "content_subtype": normalized_content_subtype,
-            },
-            context="UPLOAD_INIT",
-            request_id=request_id or "",
+        delete_blob(destination_path=destination_path)
+    except Exception as exc:
+        logger.warning(
+            "upload_stream_cleanup_failed job_id=%s blob=%s error=%s",
+            job_id,
+            destination_path,
+            exc.__class__.__name__,
         )
-        if not ok:
-            raise HTTPException(status_code=409, detail=f"Invalid status transition to QUEUED from {current_status or 'NONE'}")
 
-        if idem_key:
-            r.set(idempotency_redis_key(user_email, job_type, idem_key), job_id, ex=IDEMPOTENCY_TTL_SEC)
-        register_daily_job_usage(r=r, email=user_email)
 
-        r.lpush(f"user_jobs:{user_email}", job_id)
-        log_stage(
-            job_id=job_id,
-            stage="REDIS_JOB_METADATA",
-            event="COMPLETED",
-            user=user_email,
-            job_type=job_type,
-            source=source,
+# User value: cancels a half-finished streamed upload so a rejected request leaves no open session or stored bytes.
+def _abort_stream_upload(job_id: str, writer, destination_path: str) -> None:
+    try:
+        cancel_resumable_upload(writer)
+    except Exception as exc:
+        logger.warning(
+            "upload_stream_cancel_failed job_id=%s blob=%s error=%s",
+            job_id,
+            destination_path,
+            exc.__class__.__name__,
         )
+    _discard_stored_input(job_id, destination_path)
+
+
+# User value: streams large uploads straight into storage so users wait less and the API stays responsive.
+async def submit_streamed_upload_job(
+    *,
+    body: AsyncIterator[bytes],
+    content_type_header: str | None,
+    content_length: int | None,
+    job_type: str | None,
+    email: str,
+    request_id: str,
+    idempotency_key: str | None,
+    media_duration_sec: float | None = None,
+    content_subtype: str | None = None,
+) -> dict:
+    reader = MultipartStreamReader(content_type_header)
+    chunk_size = stream_chunk_size_bytes()
+    fields: dict[str, str] = {}
+    ctx: dict | None = None
+    file_meta: StreamedFile | None = None
+    writer = None
+    sink: ResumableUploadSink | None = None
+    gcs: dict | None = None
+    destination_path = ""
+    inspector: UploadInspector | None = None
+    completed = False
+
+    try:
+        async for event in reader.iter_events(body):
+            kind = event[0]
+            if kind == "field":
+                fields[event[1]] = event[2]
+                continue
+
+            if kind == "file_start":
+                if file_meta is not None:
+                    raise _bad_request("MULTIPLE_FILES", "Only one file can be uploaded per request")
+                file_meta = StreamedFile(filename=event[2], content_type=event[3])
+                resolved_job_type = str(job_type or fields.get("type") or "").strip()
+                ctx = await _prepare_submission(
+                    filename=file_meta.filename,
+                    content_type=file_meta.content_type,
+                    job_type=resolved_job_type,
+                    email=email,
+                    request_id=request_id,
+                    idempotency_key=idempotency_key,
+                    content_subtype=content_subtype or fields.get("content_subtype"),
+                )
+                if ctx["reused"]:
+                    return ctx["reused"]
+
+                # Reject bad names/types and clearly oversized bodies before any byte is stored.
+                declared_size = 0
+                if content_length and content_length > max_upload_size_bytes(ctx["job_type"]) + MULTIPART_OVERHEAD_BYTES:
+                    declared_size = content_length
+                _validate_for_submission(ctx, file=file_meta, input_size_bytes=declared_size)
+
+                destination_path = f"jobs/{ctx['job_id']}/input/{file_meta.filename}"
+                log_stage(
+                    job_id=ctx["job_id"],
+                    stage="INPUT_STORED_IN_GCS",
+                    event="STARTED",
+                    user=ctx["user_email"],
+                    job_type=ctx["job_type"],
+                    filename=file_meta.filename,
+                    mode="stream",
+                    chunk_size=chunk_size,
+                )
+                writer, gcs = await run_in_threadpool(
+                    open_resumable_upload,
+                    destination_path=destination_path,
+                    chunk_size=chunk_size,
+                    content_type=file_meta.content_type,
+                )
+                sink = ResumableUploadSink(writer, chunk_size)
+                inspector = UploadInspector(
+                    count_pdf_pages=ctx["job_type"] == "OCR" and _extension(file_meta.filename) == ".pdf"
+                )
+                continue
+
+            if kind == "data" and sink is not None:
+                data = event[1]
+                inspector.feed(data)
+                if inspector.size_bytes > max_upload_size_bytes(ctx["job_type"]):
+                    _validate_for_submission(ctx, file=file_meta, input_size_bytes=inspector.size_bytes)
+                if sink.feed(data):
+                    await run_in_threadpool(sink.flush_ready)
+                continue
+
+            if kind == "file_end" and sink is not None:
+                await run_in_threadpool(sink.close)
+                sink = None
+                completed = True
+
+        if file_meta is None or ctx is None:
+            raise _bad_request("MISSING_FILE", "Upload body does not contain a file part")
+        if not completed:
+            raise _bad_request("INCOMPLETE_UPLOAD", "Upload body ended before the file was complete")
     except HTTPException:
+        if sink is not None:
+            await run_in_threadpool(_abort_stream_upload, ctx["job_id"], writer, destination_path)
+        elif completed and gcs:
+            await run_in_threadpool(_discard_stored_input, ctx["job_id"], destination_path)
         raise
+    except Exception as exc:
+        if sink is not None:
+            await run_in_threadpool(_abort_stream_upload, ctx["job_id"], writer, destination_path)
+        if ctx is not None and not ctx.get("reused"):
+            log_stage(
+                job_id=ctx["job_id"],
+                stage="INPUT_STORED_IN_GCS",
+                event="FAILED",
+                user=ctx["user_email"],
+                job_type=ctx["job_type"],
+                error=f"{exc.__class__.__name__}: {exc}",
+            )
+        raise HTTPException(status_code=503, detail="Failed to store upload input") from exc
+
+    inspection = inspector.result()
+    input_size_bytes = inspection["size_bytes"]
+    log_stage(
+        job_id=ctx["job_id"],
+        stage="INPUT_STORED_IN_GCS",
+        event="COMPLETED",
+        user=ctx["user_email"],
+        job_type=ctx["job_type"],
+        input_gcs_uri=gcs.get("gcs_uri"),
+        input_size_bytes=input_size_bytes,
+        input_sha256=inspection["sha256"],
+        input_crc32c=inspection["crc32c"],
+        sniffed_type=inspection["sniffed_type"],
+        mode="stream",
+    )
+
+    total_pages = _total_pages_from_inspection(ctx["job_type"], file_meta.filename, inspection)
+
+    try:
+        _enforce_upload_policies(
+            ctx,
+            file=file_meta,
+            inspection=inspection,
+            total_pages=total_pages,
+            media_duration_sec=media_duration_sec,
+        )
+    except HTTPException:
+        await run_in_threadpool(_discard_stored_input, ctx["job_id"], destination_path)
+        raise
+
+    return await _commit_and_enqueue(
+        ctx,
+        filename=file_meta.filename,
+        input_gcs_uri=gcs["gcs_uri"],
+        input_size_bytes=input_size_bytes,
+        total_pages=total_pages,
+        media_duration_sec=media_duration_sec,
+    )
+
+
+# User value: supports direct_upload_pending_key so the OCR/transcription journey stays clear and reliable.
+def direct_upload_pending_key(job_id: str) -> str:
+    return f"upload_pending:{job_id}"
+
+
+# User value: issues a storage upload URL after the usual checks so large files never pass through the API.
+async def init_direct_upload(
+    *,
+    filename: str,
+    content_type: str | None,
+    file_size_bytes: int,
+    job_type: str,
+    email: str,
+    request_id: str,
+    idempotency_key: str | None,
+    crc32c: str | None = None,
+    media_duration_sec: float | None = None,
+    pdf_page_count: int | None = None,
+    content_subtype: str | None = None,
+    upload_mode: str = "PUT",
+    origin: str | None = None,
+) -> dict:
+    mode = str(upload_mode or "PUT").strip().upper()
+    if mode not in DIRECT_UPLOAD_MODES:
+        raise _bad_request("INVALID_UPLOAD_MODE", f"upload_mode must be one of {sorted(DIRECT_UPLOAD_MODES)}")
+    if not str(crc32c or "").strip():
+        raise _bad_request("CRC32C_REQUIRED", "crc32c (base64 CRC32C of the file) is required for direct uploads")
+    if media_duration_sec is not None:
+        # Storage cannot measure media length, so a declared duration could dodge duration limits and cost checks.
+        raise _bad_request(
+            "DURATION_NOT_VERIFIABLE",
+            "media_duration_sec cannot be verified for direct uploads; omit it or use /upload/stream",
+        )
+
+    ctx = await _prepare_submission(
+        filename=filename,
+        content_type=content_type,
+        job_type=job_type,
+        email=email,
+        request_id=request_id,
+        idempotency_key=idempotency_key,
+        content_subtype=content_subtype,
+    )
+    if ctx["reused"]:
+        return ctx["reused"]
+    job_id = ctx["job_id"]
+    user_email = ctx["user_email"]
+
+    # Policies run on client-declared metadata here so bad requests fail before upload; /upload/complete
+    # re-checks size and checksum and re-runs them on the page count read from the stored file.
+    file_meta = StreamedFile(filename=filename, content_type=content_type or "")
+    declared = {"size_bytes": int(file_size_bytes), "pdf_page_count": pdf_page_count}
+    total_pages = _total_pages_from_inspection(job_type, filename, declared)
+    _enforce_upload_policies(
+        ctx,
+        file=file_meta,
+        inspection=declared,
+        total_pages=total_pages,
+        media_duration_sec=None,
+    )
+
+    destination_path = f"jobs/{job_id}/input/{filename}"
+    upload_content_type = content_type or "application/octet-stream"
+    try:
+        if mode == "RESUMABLE":
+            upload_url = await run_in_threadpool(
+                create_resumable_upload_url,
+                destination_path=destination_path,
+                content_type=upload_content_type,
+                size=int(file_size_bytes),
+                crc32c=crc32c,
+                origin=origin,
+            )
+            required_headers = {"Content-Type": upload_content_type}
+        else:
+            upload_url, required_headers = await run_in_threadpool(
+                generate_upload_url,
+                destination_path=destination_path,
+                content_type=upload_content_type,
+                expiration_seconds=DIRECT_UPLOAD_URL_TTL_SEC,
+                crc32c=crc32c,
+            )
     except Exception as exc:
         log_stage(
             job_id=job_id,
-            stage="REDIS_JOB_METADATA",
+            stage="UPLOAD_DIRECT_INIT",
             event="FAILED",
             user=user_email,
             job_type=job_type,
-            source=source,
+            request_id=request_id,
             error=f"{exc.__class__.__name__}: {exc}",
         )
-        raise HTTPException(status_code=503, detail="Queue metadata write failed") from exc
+        raise HTTPException(status_code=503, detail="Failed to create upload URL") from exc
 
-    payload = {
-        "contract_version": CONTRACT_VERSION,
-        "job_id": job_id,
-        "job_type": job_type,
-        "source": source,
-        "queue": queue_name,
-        "input_gcs_uri": gcs["gcs_uri"],
-        "filename": file.filename,
-        "output_filename": output_filename,
-        "input_size_bytes": input_size_bytes,
-        "request_id": request_id or "",
-        "content_subtype": normalized_content_subtype,
-    }
+    pending_key = direct_upload_pending_key(job_id)
+    # One MULTI/EXEC so the pending hash never exists without its TTL.
+    async with r.pipeline(transaction=True) as pipe:
+        pipe.hset(
+            pending_key,
+            mapping={
+                "job_id": job_id,
+                "job_type": job_type,
+                "user": user_email,
+                "queue_name": ctx["queue_name"],
+                "idem_key": ctx["idem_key"],
+                "content_subtype": ctx["content_subtype"],
+                "request_id": request_id or "",
+                "filename": filename,
+                "content_type": content_type or "",
+                "destination_path": destination_path,
+                "declared_size_bytes": int(file_size_bytes),
+                "declared_crc32c": crc32c or "",
+                "upload_mode": mode,
+                "created_at": datetime.utcnow().isoformat(),
+            },
+        )
+        pipe.expire(pending_key, DIRECT_UPLOAD_PENDING_TTL_SEC)
+        await pipe.execute()
 
     log_stage(
         job_id=job_id,
-        stage="REDIS_QUEUE_ENQUEUE",
-        event="STARTED",
+        stage="UPLOAD_DIRECT_INIT",
+        event="COMPLETED",
         user=user_email,
         job_type=job_type,
-        source=source,
-        queue=queue_name,
+        filename=filename,
+        request_id=request_id,
+        upload_mode=mode,
+        declared_size_bytes=int(file_size_bytes),
     )
+    incr("api_direct_upload_init_total", job_type=job_type, mode=mode)
+
+    return {
+        "job_id": job_id,
+        "request_id": request_id,
+        "reused": False,
+        "upload_mode": mode,
+        "upload_url": upload_url,
+        "upload_method": "PUT",
+        "required_headers": required_headers,
+        "expires_in_sec": DIRECT_UPLOAD_URL_TTL_SEC,
+    }
+
+
+# User value: counts PDF pages from the stored object with ranged reads so direct uploads meet the same page limits.
+def _count_stored_pdf_pages(destination_path: str) -> int | None:
+    reader = open_blob_reader(destination_path=destination_path, chunk_size=DIRECT_UPLOAD_READ_CHUNK_BYTES)
     try:
-        enqueue_guard_key = f"job_enqueue_once:{job_id}"
-        enqueue_ttl = IDEMPOTENCY_TTL_SEC if idem_key else 24 * 3600
-        should_enqueue = r.set(enqueue_guard_key, "1", nx=True, ex=enqueue_ttl)
-        if should_enqueue:
-            r.rpush(queue_name, json.dumps(payload))
-            queue_depth = r.llen(queue_name)
-            log_stage(
-                job_id=job_id,
-                stage="REDIS_QUEUE_ENQUEUE",
-                event="COMPLETED",
-                user=user_email,
-                job_type=job_type,
-                source=source,
-                queue=queue_name,
-                queue_depth=queue_depth,
-            )
-        else:
-            log_stage(
-                job_id=job_id,
-                stage="REDIS_QUEUE_ENQUEUE",
-                event="COMPLETED",
-                user=user_email,
-                job_type=job_type,
-                source=source,
-                queue=queue_name,
-                message="duplicate_enqueue_skipped",
-            )
-            incr("api_jobs_idempotent_reused_total", job_type=job_type)
+        return _parse_pdf_page_count(reader)
+    finally:
+        reader.close()
+
+
+# User value: supports _optional_int so the OCR/transcription journey stays clear and reliable.
+def _optional_int(value) -> int | None:
+    text = str(value or "").strip()
+    return int(text) if text else None
+
+
+# User value: verifies the stored file and queues the job so direct uploads start processing like regular ones.
+async def complete_direct_upload(*, job_id: str, email: str, request_id: str) -> dict:
+    user_email = email.lower()
+    owner = await user_ref_async(r, user_email)
+    pending_key = direct_upload_pending_key(job_id)
+    pending = await r.hgetall(pending_key)
+    if not pending:
+        existing = await read_job_async(r, job_id)
+        if existing and owns(existing.get("user"), user_email, owner):
+            # A retried /complete after success returns the queued job instead of failing.
+            return _build_reuse_response(job_id, existing, request_id)
+        raise HTTPException(
+            status_code=404,
+            detail={"error_code": "UPLOAD_NOT_FOUND", "error_message": "No pending upload for this job"},
+        )
+    if pending.get("user") != user_email:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    job_type = pending.get("job_type") or ""
+    destination_path = pending.get("destination_path") or ""
+    declared_size = _optional_int(pending.get("declared_size_bytes")) or 0
+    declared_crc32c = pending.get("declared_crc32c") or ""
+
+    try:
+        stored = await run_in_threadpool(get_blob_metadata, destination_path=destination_path)
     except Exception as exc:
         log_stage(
             job_id=job_id,
-            stage="REDIS_QUEUE_ENQUEUE",
+            stage="UPLOAD_DIRECT_VERIFY",
             event="FAILED",
             user=user_email,
             job_type=job_type,
-            source=source,
-            queue=queue_name,
+            request_id=request_id,
             error=f"{exc.__class__.__name__}: {exc}",
         )
-        raise HTTPException(status_code=503, detail="Queue push failed") from exc
+        raise HTTPException(status_code=503, detail="Failed to verify upload input") from exc
+
+    if stored is None:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "error_code": "UPLOAD_NOT_RECEIVED",
+                "error_message": "File has not been uploaded to the issued URL yet",
+            },
+        )
+
+    mismatch = ""
+    if stored["size"] != declared_size:
+        mismatch = f"size {stored['size']} != declared {declared_size}"
+    elif not declared_crc32c:
+        mismatch = "no declared crc32c to verify against"
+    elif stored.get("crc32c") != declared_crc32c:
+        mismatch = "crc32c does not match declared checksum"
+    if mismatch:
+        log_stage(
+            job_id=job_id,
+            stage="UPLOAD_DIRECT_VERIFY",
+            event="FAILED",
+            user=user_email,
+            job_type=job_type,
+            request_id=request_id,
+            error=mismatch,
+        )
+        incr("api_jobs_submit_failed_total", reason="direct_upload_verify_failed", job_type=job_type)
+        # Init reserves nothing (quotas are read there and again before commit, where daily usage is counted),
+        # so dropping the stored file and pending record is the whole cleanup; the client starts a fresh init.
+        await run_in_threadpool(_discard_stored_input, job_id, destination_path)
+        await r.delete(pending_key)
+        raise _bad_request(
+            "UPLOAD_VERIFICATION_FAILED",
+            f"Uploaded file does not match declared metadata: {mismatch}. Start again with /upload/init.",
+        )
 
-    incr("api_jobs_submitted_total", job_type=job_type, source=source)
     log_stage(
         job_id=job_id,
-        stage="UPLOAD_REQUEST",
+        stage="UPLOAD_DIRECT_VERIFY",
         event="COMPLETED",
         user=user_email,
         job_type=job_type,
-        source=source,
-        contract_version=CONTRACT_VERSION,
         request_id=request_id,
+        input_gcs_uri=stored["gcs_uri"],
+        input_size_bytes=stored["size"],
+        input_crc32c=stored.get("crc32c") or "",
     )
 
-    return {"job_id": job_id, "request_id": request_id, "reused": False}
+    ctx = {
+        "reused": None,
+        "job_id": job_id,
+        "job_type": job_type,
+        "user_email": user_email,
+        "owner": owner,
+        "queue_name": pending.get("queue_name") or resolve_target_queue(job_type),
+        "idem_key": pending.get("idem_key") or "",
+        "content_subtype": pending.get("content_subtype") or "",
+        "request_id": pending.get("request_id") or request_id,
+    }
+    filename = pending.get("filename") or ""
+    file_meta = StreamedFile(filename=filename, content_type=pending.get("content_type") or "")
+    inspection = {"size_bytes": stored["size"], "pdf_page_count": None}
+    if job_type == "OCR" and _extension(filename) == ".pdf":
+        try:
+            inspection["pdf_page_count"] = await run_in_threadpool(_count_stored_pdf_pages, destination_path)
+        except Exception as exc:
+            log_stage(
+                job_id=job_id,
+                stage="UPLOAD_DIRECT_VERIFY",
+                event="FAILED",
+                user=user_email,
+                job_type=job_type,
+                request_id=request_id,
+                error=f"{exc.__class__.__name__}: {exc}",
+            )
+            raise HTTPException(status_code=503, detail="Failed to inspect upload input") from exc
+    total_pages = _total_pages_from_inspection(job_type, filename, inspection)
+
+    # Same limits and guardrail as the inline path, now on what was actually stored rather than what was declared.
+    # Quotas are checked again as well: init only reads them, so uploads started in parallel must not all commit.
+    try:
+        _enforce_upload_policies(
+            ctx,
+            file=file_meta,
+            inspection=inspection,
+            total_pages=total_pages,
+            media_duration_sec=None,
+        )
+        if FEATURE_UPLOAD_QUOTAS:
+            await enforce_upload_quotas_async(
+                r=r, email=user_email, request_id=request_id or "", job_type=job_type, owner=owner
+            )
+    except HTTPException:
+        await run_in_threadpool(_discard_stored_input, job_id, destination_path)
+        await r.delete(pending_key)
+        raise
+
+    out = await _commit_and_enqueue(
+        ctx,
+        filename=filename,
+        input_gcs_uri=stored["gcs_uri"],
+        input_size_bytes=stored["size"],
+        total_pages=total_pages,
+        media_duration_sec=None,
+    )
+    await r.delete(pending_key)
+    incr("api_direct_upload_complete_total", job_type=job_type)
+    return out
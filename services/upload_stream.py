@@ -0,0 +1,179 @@
+# User value: This file streams large uploads straight to storage so users are not slowed down by API-side buffering.
+# services/upload_stream.py
+import os
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+GCS_CHUNK_ALIGN_BYTES = 256 * 1024
+UPLOAD_STREAM_MEMORY_LIMIT_MB = int(os.getenv("UPLOAD_STREAM_MEMORY_LIMIT_MB", "16"))
+
+
+# User value: keeps per-upload memory bounded so many users can upload large files at once.
+def stream_chunk_size_bytes(memory_limit_mb: int | None = None) -> int:
+    limit_mb = UPLOAD_STREAM_MEMORY_LIMIT_MB if memory_limit_mb is None else memory_limit_mb
+    # One chunk is buffered here and one inside the resumable writer, so each gets half the budget.
+    half = max(0, int(limit_mb)) * 1024 * 1024 // 2
+    return max(GCS_CHUNK_ALIGN_BYTES, (half // GCS_CHUNK_ALIGN_BYTES) * GCS_CHUNK_ALIGN_BYTES)
+
+
+# User value: supports _bad_request so the OCR/transcription journey stays clear and reliable.
+def _bad_request(error_code: str, message: str) -> HTTPException:
+    return HTTPException(status_code=400, detail={"error_code": error_code, "error_message": message})
+
+
+# User value: supports _decode so the OCR/transcription journey stays clear and reliable.
+def _decode(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value or "")
+
+
+class StreamedFile:
+    # User value: exposes upload metadata with the same shape as UploadFile so validation rules stay shared.
+    def __init__(self, filename: str, content_type: str):
+        self.filename = filename
+        self.content_type = content_type
+
+
+class MultipartStreamReader:
+    # User value: reads multipart uploads incrementally so file bytes can be forwarded as they arrive.
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, content_type_header: str | None):
+        ctype, params = parse_options_header(content_type_header or "")
+        if _decode(ctype).lower() != "multipart/form-data":
+            raise _bad_request("INVALID_CONTENT_TYPE", "Streaming upload requires multipart/form-data")
+        boundary = params.get(b"boundary") or params.get("boundary")
+        if not boundary:
+            raise _bad_request("INVALID_CONTENT_TYPE", "Missing multipart boundary")
+
+        self._events: list[tuple] = []
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._headers: dict[str, str] = {}
+        self._part: dict | None = None
+        self._parser = MultipartParser(
+            boundary,
+            callbacks={
+                "on_part_begin": self._on_part_begin,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+            },
+        )
+
+    # User value: supports _on_part_begin so the OCR/transcription journey stays clear and reliable.
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+        self._part = None
+
+    # User value: supports _on_header_field so the OCR/transcription journey stays clear and reliable.
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field.extend(data[start:end])
+
+    # User value: supports _on_header_value so the OCR/transcription journey stays clear and reliable.
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value.extend(data[start:end])
+
+    # User value: supports _on_header_end so the OCR/transcription journey stays clear and reliable.
+    def _on_header_end(self) -> None:
+        self._headers[bytes(self._header_field).decode("latin-1").strip().lower()] = bytes(self._header_value).decode(
+            "latin-1"
+        )
+        self._header_field.clear()
+        self._header_value.clear()
+
+    # User value: supports _on_headers_finished so the OCR/transcription journey stays clear and reliable.
+    def _on_headers_finished(self) -> None:
+        _, params = parse_options_header(self._headers.get("content-disposition", ""))
+        name = _decode(params.get(b"name") or params.get("name"))
+        filename = params.get(b"filename") or params.get("filename")
+        if filename is not None:
+            self._part = {"kind": "file", "name": name}
+            self._events.append(
+                ("file_start", name, _decode(filename), self._headers.get("content-type", "").strip())
+            )
+        else:
+            self._part = {"kind": "field", "name": name, "value": bytearray()}
+
+    # User value: supports _on_part_data so the OCR/transcription journey stays clear and reliable.
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._part is None or start >= end:
+            return
+        if self._part["kind"] == "file":
+            self._events.append(("data", bytes(data[start:end])))
+            return
+        value = self._part["value"]
+        if len(value) + (end - start) > 64 * 1024:
+            raise _bad_request("FORM_FIELD_TOO_LARGE", f"Form field too large: {self._part['name']}")
+        value.extend(data[start:end])
+
+    # User value: supports _on_part_end so the OCR/transcription journey stays clear and reliable.
+    def _on_part_end(self) -> None:
+        if self._part is None:
+            return
+        if self._part["kind"] == "file":
+            self._events.append(("file_end", self._part["name"]))
+        else:
+            self._events.append(("field", self._part["name"], bytes(self._part["value"]).decode("utf-8", errors="replace")))
+        self._part = None
+
+    # User value: parses the upload body incrementally so large files never sit fully in API memory.
+    async def iter_events(self, body: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+        async for chunk in body:
+            if not chunk:
+                continue
+            try:
+                self._parser.write(chunk)
+            except HTTPException:
+                raise
+            except Exception as exc:
+                raise _bad_request("MALFORMED_MULTIPART", "Upload body is not valid multipart/form-data") from exc
+            events, self._events = self._events, []
+            for event in events:
+                yield event
+        try:
+            self._parser.finalize()
+        except Exception as exc:
+            raise _bad_request("MALFORMED_MULTIPART", "Upload body is not valid multipart/form-data") from exc
+        events, self._events = self._events, []
+        for event in events:
+            yield event
+
+
+class ResumableUploadSink:
+    # User value: buffers at most one storage chunk so upload memory stays flat regardless of file size.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, writer, chunk_size: int):
+        self._writer = writer
+        self._chunk_size = int(chunk_size)
+        self._buffer = bytearray()
+
+    # User value: buffers streamed bytes and reports when a full chunk is ready for storage.
+    def feed(self, data: bytes) -> bool:
+        self._buffer.extend(data)
+        return len(self._buffer) >= self._chunk_size
+
+    # User value: forwards full chunks to storage so buffered memory stays within the configured ceiling.
+    def flush_ready(self) -> None:
+        ready = (len(self._buffer) // self._chunk_size) * self._chunk_size
+        if ready <= 0:
+            return
+        self._writer.write(bytes(self._buffer[:ready]))
+        del self._buffer[:ready]
+
+    # User value: finalizes the resumable upload so the stored input is complete before enqueue.
+    def close(self) -> None:
+        if self._buffer:
+            self._writer.write(bytes(self._buffer))
+            self._buffer.clear()
+        self._writer.close()
@@ -107,6 +107,60 @@ def validate_startup_env() -> None:
     _validate_bool_flag_env("FEATURE_SMART_INTAKE", errors)
     _validate_bool_flag_env("FEATURE_COST_GUARDRAIL", errors)
     _validate_bool_flag_env("FEATURE_QUEUE_ORCHESTRATION", errors)
+    _validate_bool_flag_env("FEATURE_STREAMING_UPLOAD", errors)
+    _validate_positive_int_env("UPLOAD_STREAM_MEMORY_LIMIT_MB", 16, errors)
+    _validate_positive_int_env("UPLOAD_INSPECT_CHUNK_KB", 1024, errors)
+    _validate_bool_flag_env("FEATURE_DIRECT_UPLOAD", errors)
+    _validate_positive_int_env("DIRECT_UPLOAD_URL_TTL_SEC", 900, errors)
+    _validate_positive_int_env("REDIS_MAX_CONNECTIONS", 50, errors)
+    _validate_positive_int_env("REDIS_POOL_TIMEOUT_MS", 5000, errors)
+    _validate_positive_int_env("REDIS_SOCKET_TIMEOUT_MS", 5000, errors)
+    _validate_positive_int_env("REDIS_CONNECT_TIMEOUT_MS", 2000, errors)
+    _validate_non_negative_int_env("REDIS_HEALTH_CHECK_INTERVAL_SEC", 30, errors)
+    _validate_non_negative_int_env("REDIS_RETRY_ATTEMPTS", 3, errors)
+    _validate_positive_int_env("REDIS_RETRY_BACKOFF_MS", 50, errors)
+    _validate_positive_int_env("REDIS_RETRY_BACKOFF_CAP_MS", 1000, errors)
+    _validate_positive_int_env("GOOGLE_CERTS_DEFAULT_TTL_SEC", 300, errors)
+    _validate_non_negative_int_env("AUTH_TOKEN_CACHE_SIZE", 1024, errors)
+    _validate_bool_flag_env("FEATURE_SESSION_TOKENS", errors)
+    _validate_positive_int_env("AUTH_SESSION_TTL_SEC", 900, errors)
+    _validate_positive_int_env("AUTH_SESSION_EPOCH_REFRESH_SEC", 5, errors)
+    _validate_bool_flag_env("FEATURE_BLOCKLIST_SNAPSHOT", errors)
+    _validate_positive_int_env("SIGNED_URL_TTL_MIN", 60, errors)
+    _validate_bool_flag_env("FEATURE_LAZY_DOWNLOAD_URLS", errors)
+    _validate_bool_flag_env("FEATURE_CONDITIONAL_GET", errors)
+    _validate_bool_flag_env("FEATURE_STATUS_LONG_POLL", errors)
+    _validate_positive_int_env("STATUS_LONG_POLL_MAX_SEC", 25, errors)
+    _validate_positive_int_env("STATUS_BATCH_MAX_IDS", 100, errors)
+    _validate_bool_flag_env("FEATURE_JOB_EVENTS_STREAM", errors)
+    _validate_bool_flag_env("FEATURE_JOB_INDEXES", errors)
+    _validate_positive_int_env("JOBS_EVENTS_HEARTBEAT_SEC", 15, errors)
+    _validate_positive_int_env("JOBS_EVENTS_MAX_SEC", 1800, errors)
+    _validate_positive_int_env("JOBS_EVENTS_SCAN_LIMIT", 100, errors)
+    _validate_positive_int_env("JOBS_EXPORT_BATCH_SIZE", 200, errors)
+    _validate_bool_flag_env("FEATURE_JOB_ARCHIVE_READS", errors)
+    _validate_positive_int_env("JOB_RETENTION_DAYS", 90, errors)
+    _validate_non_negative_int_env("JOB_ARCHIVE_CACHE_SIZE", 64, errors)
+    _validate_positive_int_env("JOB_ARCHIVE_CACHE_TTL_SEC", 600, errors)
+    _validate_bool_flag_env("FEATURE_COMPACT_JOB_RECORDS", errors)
+    _validate_positive_int_env("JOB_RECORD_ZSTD_MIN_BYTES", 256, errors)
+    _validate_bool_flag_env("FEATURE_USER_IDS", errors)
+    _validate_non_negative_int_env("USER_DIRECTORY_CACHE_SIZE", 10000, errors)
+    _validate_bool_flag_env("FEATURE_ACTIVE_JOBS_SET", errors)
+    _validate_positive_int_env("ACTIVE_JOBS_SWEEP_RECENT", 200, errors)
+    _validate_non_negative_int_env("SIGNED_URL_CACHE_SIZE", 4096, errors)
+    _validate_non_negative_int_env("SIGNED_URL_SAFETY_MARGIN_SEC", 300, errors)
+    _validate_positive_int_env("SIGNED_URL_SIGN_CONCURRENCY", 8, errors)
+    try:
+        if int(os.getenv("SIGNED_URL_SAFETY_MARGIN_SEC") or 300) >= int(os.getenv("SIGNED_URL_TTL_MIN") or 60) * 60:
+            warnings.append("SIGNED_URL_SAFETY_MARGIN_SEC >= SIGNED_URL_TTL_MIN; signed download URLs will never be reused")
+    except ValueError:
+        pass  # already reported by the integer validators above
+    _validate_positive_int_env("AUTH_BLOCKLIST_RESYNC_SEC", 60, errors)
+    _validate_positive_int_env("AUTH_BLOCKLIST_MAX_STALE_SEC", 600, errors)
+    if str(os.getenv("FEATURE_SESSION_TOKENS", "0")).strip().lower() in {"1", "true", "yes", "on"}:
+        if len(str(os.getenv("AUTH_SESSION_SECRET") or "").strip()) < 32:
+            errors.append("AUTH_SESSION_SECRET must be at least 32 characters when FEATURE_SESSION_TOKENS is enabled")
 
     if _is_blank(os.getenv("GOOGLE_APPLICATION_CREDENTIALS_JSON")):
         warnings.append(
@@ -138,5 +192,51 @@ def validate_startup_env() -> None:
             "FEATURE_SMART_INTAKE",
             "FEATURE_COST_GUARDRAIL",
             "FEATURE_QUEUE_ORCHESTRATION",
+            "FEATURE_STREAMING_UPLOAD",
+            "UPLOAD_STREAM_MEMORY_LIMIT_MB",
+            "UPLOAD_INSPECT_CHUNK_KB",
+            "FEATURE_DIRECT_UPLOAD",
+            "DIRECT_UPLOAD_URL_TTL_SEC",
+            "REDIS_MAX_CONNECTIONS",
+            "REDIS_POOL_TIMEOUT_MS",
+            "REDIS_SOCKET_TIMEOUT_MS",
+            "REDIS_CONNECT_TIMEOUT_MS",
+            "REDIS_HEALTH_CHECK_INTERVAL_SEC",
+            "REDIS_RETRY_ATTEMPTS",
+            "REDIS_RETRY_BACKOFF_MS",
+            "REDIS_RETRY_BACKOFF_CAP_MS",
+            "GOOGLE_CERTS_DEFAULT_TTL_SEC",
+            "AUTH_TOKEN_CACHE_SIZE",
+            "FEATURE_SESSION_TOKENS",
+            "AUTH_SESSION_TTL_SEC",
+            "AUTH_SESSION_EPOCH_REFRESH_SEC",
+            "FEATURE_BLOCKLIST_SNAPSHOT",
+            "AUTH_BLOCKLIST_RESYNC_SEC",
+            "AUTH_BLOCKLIST_MAX_STALE_SEC",
+            "SIGNED_URL_TTL_MIN",
+            "FEATURE_LAZY_DOWNLOAD_URLS",
+            "FEATURE_CONDITIONAL_GET",
+            "FEATURE_STATUS_LONG_POLL",
+            "STATUS_LONG_POLL_MAX_SEC",
+            "STATUS_BATCH_MAX_IDS",
+            "FEATURE_JOB_EVENTS_STREAM",
+            "FEATURE_JOB_INDEXES",
+            "JOBS_EVENTS_HEARTBEAT_SEC",
+            "JOBS_EVENTS_MAX_SEC",
+            "JOBS_EVENTS_SCAN_LIMIT",
+            "JOBS_EXPORT_BATCH_SIZE",
+            "FEATURE_JOB_ARCHIVE_READS",
+            "JOB_RETENTION_DAYS",
+            "JOB_ARCHIVE_CACHE_SIZE",
+            "JOB_ARCHIVE_CACHE_TTL_SEC",
+            "FEATURE_COMPACT_JOB_RECORDS",
+            "JOB_RECORD_ZSTD_MIN_BYTES",
+            "FEATURE_USER_IDS",
+            "USER_DIRECTORY_CACHE_SIZE",
+            "FEATURE_ACTIVE_JOBS_SET",
+            "ACTIVE_JOBS_SWEEP_RECENT",
+            "SIGNED_URL_CACHE_SIZE",
+            "SIGNED_URL_SAFETY_MARGIN_SEC",
+            "SIGNED_URL_SIGN_CONCURRENCY",
         ],
     )
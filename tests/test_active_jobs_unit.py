@@ -0,0 +1,129 @@
+# User value: This test keeps the active-jobs set, the quota check built on it and /jobs/active in agreement with real job state.
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException, Response
+
+from routes import jobs
+from services import quota
+from services.active_jobs import reconcile_user
+from utils.job_indexes import REINDEX_JOB_LUA, active_jobs_key
+
+
+class FakeActivePipeline:
+    # User value: queues hash reads and answers them together like a Redis pipeline.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, owner):
+        self.owner = owner
+        self.ops = []
+
+    # User value: supports hmget so the OCR/transcription journey stays clear and reliable.
+    def hmget(self, key, *fields):
+        self.ops.append([self.owner.hashes.get(key, {}).get(field) for field in fields])
+
+    # User value: supports hgetall so the OCR/transcription journey stays clear and reliable.
+    def hgetall(self, key):
+        self.ops.append(dict(self.owner.hashes.get(key, {})))
+
+    # User value: supports execute so the OCR/transcription journey stays clear and reliable.
+    def execute(self):
+        return self.ops
+
+
+class FakeActiveRedis:
+    # User value: keeps active-job tests offline with job hashes, a job list and the active set.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, hashes, job_ids, active):
+        self.hashes = hashes
+        self.job_ids = job_ids
+        self.sets = {active_jobs_key("u@example.com"): set(active)}
+
+    # User value: supports smembers so the OCR/transcription journey stays clear and reliable.
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    # User value: supports lrange so the OCR/transcription journey stays clear and reliable.
+    def lrange(self, key, start, end):
+        return self.job_ids[start : end + 1]
+
+    # User value: supports get so the OCR/transcription journey stays clear and reliable.
+    def get(self, key):
+        return None
+
+    # User value: supports pipeline so the OCR/transcription journey stays clear and reliable.
+    def pipeline(self, transaction=False):
+        return FakeActivePipeline(self)
+
+
+class FakeAsyncQuotaRedis:
+    # User value: answers the quota check's single SCARD and fails loudly on any per-job read.
+
+    # User value: supports scard so the OCR/transcription journey stays clear and reliable.
+    async def scard(self, key):
+        return 3 if key == active_jobs_key("u@example.com") else 0
+
+    # User value: supports lrange so the OCR/transcription journey stays clear and reliable.
+    async def lrange(self, key, start, end):
+        raise AssertionError("the active set replaces the job list scan")
+
+
+# User value: supports _job so the OCR/transcription journey stays clear and reliable.
+def _job(status, created_at, user="u@example.com"):
+    return {"user": user, "status": status, "created_at": created_at, "job_type": "OCR"}
+
+
+# User value: supports _fake so the OCR/transcription journey stays clear and reliable.
+def _fake():
+    hashes = {
+        "job_status:queued": _job("QUEUED", "2026-01-03"),
+        "job_status:running": _job("PROCESSING", "2026-01-02"),
+        "job_status:done": _job("COMPLETED", "2026-01-01"),
+        "job_status:foreign": _job("QUEUED", "2026-01-04", user="other@example.com"),
+    }
+    # "running" is missing from the set; "done" and "gone" are stale members.
+    return FakeActiveRedis(hashes, ["queued", "running", "done"], ["queued", "done", "gone", "foreign"])
+
+
+class ActiveJobsUnitTests(unittest.TestCase):
+    # User value: confirms every status write keeps the set in step: unfinished jobs join it, terminal writes remove them.
+    def test_reindex_maintains_active_set(self):
+        self.assertIn("redis.call('SREM', 'active_jobs:' .. user, id)", REINDEX_JOB_LUA)
+        self.assertIn("redis.call('SADD', 'active_jobs:' .. user, id)", REINDEX_JOB_LUA)
+
+    # User value: confirms the sweeper reports missing and stale members against the job hashes.
+    def test_reconcile_reports_drift(self):
+        report = reconcile_user(_fake(), "u@example.com", dry_run=True)
+        self.assertEqual((report["checked"], report["added"], report["removed"]), (5, 1, 3))
+
+    # User value: confirms /jobs/active lists only the caller's unfinished jobs, newest first, skipping stale members.
+    def test_active_jobs_route(self):
+        fake = _fake()
+        with patch.object(jobs, "r", fake), patch.object(jobs, "is_active_jobs_set_enabled", return_value=True), patch.object(
+            jobs, "is_conditional_get_enabled", return_value=False
+        ):
+            body = jobs.list_active_jobs(Response(), user={"email": "u@example.com"}, if_none_match=None)
+        self.assertEqual([item["job_id"] for item in body["items"]], ["queued"])
+        self.assertEqual(body["count"], 1)
+
+    # User value: confirms the endpoint stays hidden until the set has been reconciled and the flag is on.
+    def test_active_jobs_route_disabled(self):
+        with patch.object(jobs, "is_active_jobs_set_enabled", return_value=False):
+            with self.assertRaises(HTTPException) as ctx:
+                jobs.list_active_jobs(Response(), user={"email": "u@example.com"}, if_none_match=None)
+        self.assertEqual(ctx.exception.status_code, 404)
+
+    # User value: confirms the active-job quota is one SCARD instead of a scan of recent jobs.
+    def test_quota_uses_active_set(self):
+        with patch.object(quota, "ACTIVE_JOB_LIMIT_PER_USER", 3), patch.object(quota, "is_active_jobs_set_enabled", return_value=True):
+            with self.assertRaises(HTTPException) as ctx:
+                asyncio.run(
+                    quota.enforce_upload_quotas_async(r=FakeAsyncQuotaRedis(), email="u@example.com", request_id="", job_type="OCR")
+                )
+        self.assertEqual(ctx.exception.detail["error_code"], "USER_ACTIVE_QUOTA_EXCEEDED")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+# User value: This test keeps sign-in fast by proving certs and verified tokens are reused safely.
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from services import auth
+from services.auth_cache import GoogleCertCache, VerifiedTokenCache, cache_ttl_from_headers
+
+
+class FakeClock:
+    # User value: lets cache expiry be tested without sleeping.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    # User value: supports __call__ so the OCR/transcription journey stays clear and reliable.
+    def __call__(self):
+        return self.now
+
+
+class FakeBlocklistRedis:
+    # User value: keeps auth tests offline while answering blocklist lookups.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, blocked=()):
+        self.blocked = set(blocked)
+
+    # User value: supports sismember so the OCR/transcription journey stays clear and reliable.
+    def sismember(self, key, member):
+        return member in self.blocked
+
+
+class AuthCacheUnitTests(unittest.TestCase):
+    # User value: confirms the cert cache follows Google's Cache-Control header.
+    def test_cache_ttl_from_headers(self):
+        self.assertEqual(cache_ttl_from_headers({"Cache-Control": "public, max-age=19872, must-revalidate"}, 300), 19872)
+        self.assertEqual(cache_ttl_from_headers({}, 300), 300)
+        self.assertEqual(cache_ttl_from_headers({"cache-control": "no-store"}, 300), 0)
+
+    # User value: confirms certs are fetched once per max-age window.
+    def test_cert_cache_honours_max_age(self):
+        clock = FakeClock()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return {"kid": f"cert-{len(calls)}"}, {"Cache-Control": "max-age=60"}
+
+        cache = GoogleCertCache(fetch, clock=clock)
+        self.assertEqual(cache.get(), {"kid": "cert-1"})
+        clock.now += 59
+        self.assertEqual(cache.get(), {"kid": "cert-1"})
+        clock.now += 2
+        self.assertEqual(cache.get(), {"kid": "cert-2"})
+        self.assertEqual(len(calls), 2)
+
+    # User value: confirms concurrent requests trigger a single cert fetch.
+    def test_cert_refresh_is_single_flight(self):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"kid": "cert"}, {"Cache-Control": "max-age=60"}
+
+        cache = GoogleCertCache(fetch)
+        threads = [threading.Thread(target=cache.get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+
+    # User value: confirms a failed refresh keeps serving the last good certs.
+    def test_cert_refresh_failure_serves_stale_certs(self):
+        clock = FakeClock()
+        responses = [({"kid": "cert"}, {"Cache-Control": "max-age=10"})]
+
+        def fetch():
+            if not responses:
+                raise OSError("network down")
+            return responses.pop()
+
+        cache = GoogleCertCache(fetch, clock=clock)
+        cache.get()
+        clock.now += 11
+        self.assertEqual(cache.get(), {"kid": "cert"})
+
+    # User value: confirms verified tokens expire and the cache stays bounded.
+    def test_token_cache_expires_and_evicts(self):
+        clock = FakeClock()
+        cache = VerifiedTokenCache(max_entries=2, clock=clock)
+        cache.put("a", {"email": "a@x"}, clock.now + 10)
+        cache.put("b", {"email": "b@x"}, clock.now + 10)
+        self.assertEqual(cache.get("a"), {"email": "a@x"})
+        cache.put("c", {"email": "c@x"}, clock.now + 10)
+        self.assertIsNone(cache.get("b"))
+        clock.now += 10
+        self.assertIsNone(cache.get("a"))
+
+    # User value: confirms a repeat request skips signature checks but still honours the blocklist.
+    def test_verify_reuses_verified_token_and_checks_blocklist(self):
+        now = int(time.time())
+        claims = {
+            "iss": "accounts.google.com",
+            "aud": auth.GOOGLE_CLIENT_ID,
+            "email": "User@Example.com",
+            "email_verified": True,
+            "exp": now + 3600,
+        }
+        fake = FakeBlocklistRedis()
+        auth._token_cache.clear()
+        with patch("services.auth._decode_google_id_token", return_value=claims) as decoder, patch(
+            "services.auth.r", fake
+        ):
+            self.assertEqual(auth.verify_google_id_token("tok")["email"], "User@Example.com")
+            auth.verify_google_id_token("tok")
+            self.assertEqual(decoder.call_count, 1)
+            fake.blocked.add("user@example.com")
+            with self.assertRaises(auth.HTTPException) as ctx:
+                auth.verify_google_id_token("tok")
+        self.assertEqual(ctx.exception.status_code, 403)
+        auth._token_cache.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# User value: This test keeps blocked-user checks correct when they are answered from memory.
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from services import auth
+from services.blocklist import BLOCKED_SET, BlocklistSnapshot
+
+
+class FakeBlocklistRedis:
+    # User value: keeps blocklist tests offline while matching the Redis set calls used.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, members=()):
+        self.members = set(members)
+        self.down = False
+
+    # User value: supports smembers so the OCR/transcription journey stays clear and reliable.
+    def smembers(self, key):
+        return set(self.members) if key == BLOCKED_SET else set()
+
+    # User value: supports sismember so the OCR/transcription journey stays clear and reliable.
+    def sismember(self, key, member):
+        if self.down:
+            raise RedisConnectionError("down")
+        return member in self.members
+
+
+class BlocklistUnitTests(unittest.TestCase):
+    # User value: confirms the snapshot refuses to answer until it has loaded, then answers from memory.
+    def test_snapshot_load_and_messages(self):
+        fake = FakeBlocklistRedis({"A@x.com"})
+        blocked = []
+        snapshot = BlocklistSnapshot(fake, on_block=blocked.append)
+        self.assertIsNone(snapshot.contains("a@x.com"))
+        snapshot.reload()
+        self.assertTrue(snapshot.contains("a@x.com"))
+        snapshot.apply_message(b"add:B@x.com")
+        snapshot.apply_message("remove:a@x.com")
+        self.assertTrue(snapshot.contains("b@x.com"))
+        self.assertFalse(snapshot.contains("a@x.com"))
+        self.assertEqual(blocked, ["b@x.com"])
+
+    # User value: confirms a copy older than the staleness limit is not trusted.
+    def test_stale_snapshot_is_ignored(self):
+        clock = [0.0]
+        snapshot = BlocklistSnapshot(FakeBlocklistRedis(), max_stale_sec=10, clock=lambda: clock[0])
+        snapshot.reload()
+        self.assertFalse(snapshot.contains("a@x.com"))
+        clock[0] = 11
+        self.assertIsNone(snapshot.contains("a@x.com"))
+
+    # User value: confirms auth keeps working from memory while Redis is down, and still blocks listed users.
+    def test_auth_uses_snapshot_during_redis_outage(self):
+        fake = FakeBlocklistRedis({"bad@x.com"})
+        snapshot = BlocklistSnapshot(fake)
+        snapshot.reload()
+        fake.down = True
+        with patch("services.auth.is_blocklist_snapshot_enabled", return_value=True), patch(
+            "services.auth._blocklist", snapshot
+        ), patch("services.auth.r", fake):
+            auth._check_blocklist("good@x.com")
+            with self.assertRaises(HTTPException) as ctx:
+                auth._check_blocklist("bad@x.com")
+        self.assertEqual(ctx.exception.status_code, 403)
+
+    # User value: confirms the direct lookup is still used before the snapshot has loaded.
+    def test_auth_falls_back_to_redis_before_first_load(self):
+        fake = FakeBlocklistRedis()
+        fake.down = True
+        with patch("services.auth.is_blocklist_snapshot_enabled", return_value=True), patch(
+            "services.auth._blocklist", BlocklistSnapshot(fake)
+        ), patch("services.auth.r", fake):
+            with self.assertRaises(HTTPException) as ctx:
+                auth._check_blocklist("good@x.com")
+        self.assertEqual(ctx.exception.status_code, 503)
+
+
+if __name__ == "__main__":
+    unittest.main()
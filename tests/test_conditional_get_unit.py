@@ -0,0 +1,110 @@
+# User value: This test keeps status polling cheap by answering unchanged jobs with 304 instead of a full payload.
+import unittest
+from unittest.mock import patch
+
+from fastapi import Response
+
+from routes import jobs, status
+from utils.etag import if_none_match, strong_etag
+
+
+class FakeStatusRedis:
+    # User value: keeps conditional GET tests offline while counting full hash reads.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, hashes, strings=None):
+        self.hashes = hashes
+        self.strings = strings or {}
+        self.hgetall_calls = 0
+
+    # User value: supports hmget so the OCR/transcription journey stays clear and reliable.
+    def hmget(self, key, *fields):
+        data = self.hashes.get(key, {})
+        return [data.get(field) for field in fields]
+
+    # User value: supports hgetall so the OCR/transcription journey stays clear and reliable.
+    def hgetall(self, key):
+        self.hgetall_calls += 1
+        return dict(self.hashes.get(key, {}))
+
+    # User value: supports get so the OCR/transcription journey stays clear and reliable.
+    def get(self, key):
+        return self.strings.get(key)
+
+
+JOB = {
+    "user": "u@example.com",
+    "status": "PROCESSING",
+    "stage": "OCR",
+    "progress": "40",
+    "version": "3",
+    "updated_at": "2026-01-01T00:00:00",
+    "created_at": "2026-01-01T00:00:00",
+}
+
+
+class ConditionalGetUnitTests(unittest.TestCase):
+    # User value: confirms clients can send lists, weak tags or "*" as browsers and proxies do.
+    def test_if_none_match_parsing(self):
+        tag = strong_etag("a", 1)
+        self.assertTrue(if_none_match(f'"other", W/{tag}', tag))
+        self.assertTrue(if_none_match("*", tag))
+        self.assertFalse(if_none_match(None, tag))
+        self.assertNotEqual(tag, strong_etag("a", 2))
+
+    # User value: confirms an unchanged job costs one HMGET and returns no body.
+    def test_status_not_modified_skips_full_read(self):
+        fake = FakeStatusRedis({"job_status:j1": JOB})
+        with patch("routes.status.r", fake), patch("routes.status.is_conditional_get_enabled", return_value=True):
+            first = Response()
+            status.read_status("j1", first, user={"email": "u@example.com"}, if_none_match=None)
+            etag = first.headers["etag"]
+            second = status.read_status("j1", Response(), user={"email": "u@example.com"}, if_none_match=etag)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.headers["etag"], etag)
+        self.assertEqual(fake.hgetall_calls, 1)
+
+    # User value: confirms a worker write (version bump) makes the next poll return fresh data.
+    def test_status_version_bump_changes_tag(self):
+        fake = FakeStatusRedis({"job_status:j1": dict(JOB)})
+        with patch("routes.status.r", fake), patch("routes.status.is_conditional_get_enabled", return_value=True):
+            first = Response()
+            status.read_status("j1", first, user={"email": "u@example.com"}, if_none_match=None)
+            fake.hashes["job_status:j1"]["version"] = "4"
+            second = status.read_status("j1", Response(), user={"email": "u@example.com"}, if_none_match=first.headers["etag"])
+        self.assertIsInstance(second, dict)
+        self.assertEqual(fake.hgetall_calls, 2)
+
+    # User value: confirms another user's tag guess still gets the usual 403, not a 304.
+    def test_status_foreign_job_is_not_revealed(self):
+        from fastapi import HTTPException
+
+        fake = FakeStatusRedis({"job_status:j1": JOB})
+        with patch("routes.status.r", fake), patch("routes.status.is_conditional_get_enabled", return_value=True):
+            with self.assertRaises(HTTPException) as denied:
+                status.read_status("j1", Response(), user={"email": "x@example.com"}, if_none_match="*")
+        self.assertEqual(denied.exception.status_code, 403)
+
+    # User value: confirms an unchanged history page is answered from the user's version counter alone.
+    def test_jobs_list_not_modified(self):
+        fake = FakeStatusRedis({}, {"user_jobs_version:u@example.com": "7"})
+        query = ("OCR", None, 20, 0, False)
+        with patch("routes.jobs.r", fake), patch("routes.jobs.is_conditional_get_enabled", return_value=True):
+            etag = jobs.jobs_list_etag("u@example.com", "7", query)
+            out = jobs.list_jobs(
+                Response(),
+                user={"email": "u@example.com"},
+                job_type="ocr",
+                status=None,
+                limit=20,
+                offset=0,
+                include_counts=False,
+                cursor=None,
+                if_none_match=etag,
+            )
+        self.assertEqual(out.status_code, 304)
+        self.assertNotEqual(etag, jobs.jobs_list_etag("u@example.com", "8", query))
+
+
+if __name__ == "__main__":
+    unittest.main()
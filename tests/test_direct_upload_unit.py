@@ -0,0 +1,351 @@
+# User value: This test keeps direct-to-storage uploads safe so only verified files reach the processing queue.
+import asyncio
+import io
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+from services.job_commit import daily_usage_key
+from services.upload_orchestrator import complete_direct_upload, direct_upload_pending_key, init_direct_upload
+
+
+class FakeAsyncPipeline:
+    # User value: queues writes and applies them together on execute, like a MULTI/EXEC block.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, owner):
+        self.owner = owner
+        self.ops = []
+
+    # User value: supports __aenter__ so the OCR/transcription journey stays clear and reliable.
+    async def __aenter__(self):
+        return self
+
+    # User value: supports __aexit__ so the OCR/transcription journey stays clear and reliable.
+    async def __aexit__(self, *exc):
+        return False
+
+    # User value: supports hset so the OCR/transcription journey stays clear and reliable.
+    def hset(self, key, mapping):
+        self.ops.append(self.owner.hset(key, mapping=mapping))
+
+    # User value: supports expire so the OCR/transcription journey stays clear and reliable.
+    def expire(self, key, ttl):
+        self.ops.append(self.owner.expire(key, ttl))
+
+    # User value: supports execute so the OCR/transcription journey stays clear and reliable.
+    async def execute(self):
+        return [await op for op in self.ops]
+
+
+class FakeAsyncRedis:
+    # User value: keeps direct upload tests offline while matching the asyncio Redis call shapes.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self):
+        self.hashes: dict[str, dict] = {}
+        self.strings: dict[str, str] = {}
+        self.lists: dict[str, list] = {}
+        self.ttls: dict[str, int] = {}
+
+    # User value: supports get so the OCR/transcription journey stays clear and reliable.
+    async def get(self, key):
+        return self.strings.get(key)
+
+    # User value: supports set so the OCR/transcription journey stays clear and reliable.
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = str(value)
+        return True
+
+    # User value: supports hgetall so the OCR/transcription journey stays clear and reliable.
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    # User value: supports hset so the OCR/transcription journey stays clear and reliable.
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    # User value: supports expire so the OCR/transcription journey stays clear and reliable.
+    async def expire(self, key, ttl):
+        self.ttls[key] = ttl
+        return True
+
+    # User value: supports delete so the OCR/transcription journey stays clear and reliable.
+    async def delete(self, key):
+        return int(self.hashes.pop(key, None) is not None or self.strings.pop(key, None) is not None)
+
+    # User value: supports pipeline so the OCR/transcription journey stays clear and reliable.
+    def pipeline(self, transaction=True):
+        return FakeAsyncPipeline(self)
+
+    # User value: supports lpush so the OCR/transcription journey stays clear and reliable.
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    # User value: supports rpush so the OCR/transcription journey stays clear and reliable.
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    # User value: supports llen so the OCR/transcription journey stays clear and reliable.
+    async def llen(self, key):
+        return len(self.lists.get(key, []))
+
+
+# User value: records commits in the fake store so tests see the same effects as the Redis script.
+async def fake_commit_and_enqueue_job(r, *, job_id, user_email, queue_name, mapping, payload, **_):
+    key = f"job_status:{job_id}"
+    if key in r.hashes:
+        return {"ok": True, "current_status": r.hashes[key].get("status"), "enqueued": False, "queue_depth": None}
+    await r.hset(key, mapping=mapping)
+    usage_key = daily_usage_key(user_email)
+    r.strings[usage_key] = str(int(r.strings.get(usage_key) or 0) + 1)
+    await r.lpush(f"user_jobs:{user_email}", job_id)
+    await r.rpush(queue_name, payload)
+    return {"ok": True, "current_status": None, "enqueued": True, "queue_depth": await r.llen(queue_name)}
+
+
+# User value: runs one init call with storage signing stubbed out.
+def _init(fake, **overrides):
+    kwargs = {
+        "filename": "talk.mp3",
+        "content_type": "audio/mpeg",
+        "file_size_bytes": 2048,
+        "job_type": "TRANSCRIPTION",
+        "email": "U@Example.com",
+        "request_id": "rid-1",
+        "idempotency_key": None,
+        "crc32c": "AAAAAA==",
+    }
+    kwargs.update(overrides)
+
+    async def run_case():
+        with patch("services.upload_orchestrator.r", fake), patch(
+            "services.upload_orchestrator.generate_upload_url",
+            return_value=("https://storage.example/signed", {"Content-Type": "audio/mpeg"}),
+        ) as signer:
+            return await init_direct_upload(**kwargs), signer
+
+    return asyncio.run(run_case())
+
+
+# User value: builds a PDF-shaped body whose page markers the counter can tally.
+def _pdf_bytes(pages):
+    return b"%PDF-1.4\n" + b"<< /Type /Page >>\n" * pages + b"%%EOF\n"
+
+
+# User value: runs complete for a stored PDF with storage reads served from memory.
+def _complete_pdf(fake, out, body):
+    stored = {"gcs_uri": f"gs://b/jobs/{out['job_id']}/input/scan.pdf", "size": len(body), "crc32c": "AAAAAA=="}
+
+    async def run_case():
+        with patch("services.upload_orchestrator.r", fake), patch(
+            "services.upload_orchestrator.get_blob_metadata", return_value=stored
+        ), patch("services.upload_orchestrator.open_blob_reader", return_value=io.BytesIO(body)), patch(
+            "services.upload_orchestrator.commit_and_enqueue_job", fake_commit_and_enqueue_job
+        ), patch("services.upload_orchestrator.delete_blob") as deleter, patch(
+            "services.upload_orchestrator.FEATURE_DURATION_PAGE_LIMITS", True
+        ), patch("services.upload_orchestrator.FEATURE_COST_GUARDRAIL", False), patch(
+            "services.quota.MAX_OCR_PAGES", 10
+        ):
+            try:
+                return await complete_direct_upload(job_id=out["job_id"], email="u@example.com", request_id="rid-2"), deleter
+            except HTTPException as exc:
+                return exc, deleter
+
+    return asyncio.run(run_case())
+
+
+# User value: declares a one-page PDF at init, the way a client trying to dodge page limits would.
+def _init_pdf(fake, body):
+    return _init(
+        fake,
+        filename="scan.pdf",
+        content_type="application/pdf",
+        file_size_bytes=len(body),
+        job_type="OCR",
+        pdf_page_count=1,
+    )[0]
+
+
+class DirectUploadUnitTests(unittest.TestCase):
+    # User value: confirms init returns a signed URL and remembers what the client promised to upload.
+    def test_init_returns_url_and_records_pending_upload(self):
+        fake = FakeAsyncRedis()
+        out, signer = _init(fake)
+        self.assertEqual(out["upload_url"], "https://storage.example/signed")
+        self.assertEqual(signer.call_args.kwargs["destination_path"], f"jobs/{out['job_id']}/input/talk.mp3")
+        pending = fake.hashes[direct_upload_pending_key(out["job_id"])]
+        self.assertEqual(pending["declared_size_bytes"], "2048")
+        self.assertEqual(pending["user"], "u@example.com")
+        self.assertIn(direct_upload_pending_key(out["job_id"]), fake.ttls)
+        self.assertNotIn(f"job_status:{out['job_id']}", fake.hashes)
+
+    # User value: confirms oversized declarations are rejected before any URL is signed.
+    def test_init_rejects_oversized_declaration(self):
+        fake = FakeAsyncRedis()
+        with patch("services.upload_orchestrator.MAX_TRANSCRIPTION_FILE_SIZE_BYTES", 1024):
+            with self.assertRaises(HTTPException) as ctx:
+                _init(fake)
+        self.assertEqual(ctx.exception.detail.get("error_code"), "FILE_TOO_LARGE")
+        self.assertEqual(fake.hashes, {})
+
+    # User value: confirms init refuses uploads without a checksum, so complete can always verify the bytes.
+    def test_init_requires_crc32c(self):
+        fake = FakeAsyncRedis()
+        with self.assertRaises(HTTPException) as ctx:
+            _init(fake, crc32c=None)
+        self.assertEqual(ctx.exception.detail.get("error_code"), "CRC32C_REQUIRED")
+        self.assertEqual(fake.hashes, {})
+
+    # User value: confirms a pending upload with no recorded checksum fails verification instead of skipping it.
+    def test_complete_rejects_missing_declared_crc32c(self):
+        fake = FakeAsyncRedis()
+        out, _ = _init(fake)
+        fake.hashes[direct_upload_pending_key(out["job_id"])]["declared_crc32c"] = ""
+        stored = {"gcs_uri": "gs://b/x", "size": 2048, "crc32c": "AAAAAA=="}
+
+        async def run_case():
+            with patch("services.upload_orchestrator.r", fake), patch(
+                "services.upload_orchestrator.get_blob_metadata", return_value=stored
+            ), patch("services.upload_orchestrator.delete_blob"):
+                with self.assertRaises(HTTPException) as ctx:
+                    await complete_direct_upload(job_id=out["job_id"], email="u@example.com", request_id="rid-2")
+                return ctx.exception
+
+        self.assertEqual(asyncio.run(run_case()).detail.get("error_code"), "UPLOAD_VERIFICATION_FAILED")
+
+    # User value: confirms a declared media duration is refused, since storage cannot confirm it.
+    def test_init_rejects_declared_duration(self):
+        fake = FakeAsyncRedis()
+        with self.assertRaises(HTTPException) as ctx:
+            _init(fake, media_duration_sec=30.0)
+        self.assertEqual(ctx.exception.detail.get("error_code"), "DURATION_NOT_VERIFIABLE")
+        self.assertEqual(fake.hashes, {})
+
+    # User value: confirms page limits apply to the stored PDF, not the page count the client declared.
+    def test_complete_enforces_page_limit_on_stored_pdf(self):
+        fake = FakeAsyncRedis()
+        body = _pdf_bytes(25)
+        out = _init_pdf(fake, body)
+        exc, deleter = _complete_pdf(fake, out, body)
+        self.assertIsInstance(exc, HTTPException)
+        self.assertEqual(exc.detail.get("error_code"), "PAGE_LIMIT_EXCEEDED")
+        deleter.assert_called_once()
+        self.assertNotIn(direct_upload_pending_key(out["job_id"]), fake.hashes)
+        self.assertNotIn(f"job_status:{out['job_id']}", fake.hashes)
+
+    # User value: confirms the job records the page count read from storage.
+    def test_complete_records_stored_page_count(self):
+        fake = FakeAsyncRedis()
+        body = _pdf_bytes(3)
+        out = _init_pdf(fake, body)
+        result, _ = _complete_pdf(fake, out, body)
+        self.assertFalse(result["reused"])
+        self.assertEqual(fake.hashes[f"job_status:{out['job_id']}"]["total_pages"], "3")
+
+    # User value: confirms mismatched uploads are deleted and never queued.
+    def test_complete_rejects_size_mismatch(self):
+        fake = FakeAsyncRedis()
+        out, _ = _init(fake)
+        stored = {"gcs_uri": "gs://b/x", "size": 10, "crc32c": "AAAAAA=="}
+
+        async def run_case():
+            with patch("services.upload_orchestrator.r", fake), patch(
+                "services.upload_orchestrator.get_blob_metadata", return_value=stored
+            ), patch("services.upload_orchestrator.delete_blob") as deleter:
+                with self.assertRaises(HTTPException) as ctx:
+                    await complete_direct_upload(job_id=out["job_id"], email="u@example.com", request_id="rid-2")
+                return ctx.exception, deleter
+
+        exc, deleter = asyncio.run(run_case())
+        self.assertEqual(exc.detail.get("error_code"), "UPLOAD_VERIFICATION_FAILED")
+        deleter.assert_called_once()
+        self.assertEqual(sum(len(v) for k, v in fake.lists.items() if k.startswith("doc_jobs")), 0)
+
+    # User value: confirms a failed verification leaves nothing behind and a fresh init under the same key can finish.
+    def test_failed_verification_requires_fresh_init(self):
+        fake = FakeAsyncRedis()
+        out, _ = _init(fake, idempotency_key="retry-1")
+        bad = {"gcs_uri": "gs://b/x", "size": 10, "crc32c": "AAAAAA=="}
+        good = {"gcs_uri": f"gs://b/jobs/{out['job_id']}/input/talk.mp3", "size": 2048, "crc32c": "AAAAAA=="}
+
+        async def complete(stored):
+            with patch("services.upload_orchestrator.r", fake), patch(
+                "services.upload_orchestrator.get_blob_metadata", return_value=stored
+            ), patch("services.upload_orchestrator.delete_blob"), patch(
+                "services.upload_orchestrator.commit_and_enqueue_job", fake_commit_and_enqueue_job
+            ):
+                try:
+                    return await complete_direct_upload(job_id=out["job_id"], email="u@example.com", request_id="rid-2")
+                except HTTPException as exc:
+                    return exc
+
+        failed = asyncio.run(complete(bad))
+        self.assertEqual(failed.detail.get("error_code"), "UPLOAD_VERIFICATION_FAILED")
+        self.assertIn("/upload/init", failed.detail.get("error_message"))
+        self.assertEqual(fake.hashes, {})
+        self.assertEqual(asyncio.run(complete(good)).detail.get("error_code"), "UPLOAD_NOT_FOUND")
+
+        again, _ = _init(fake, idempotency_key="retry-1")
+        self.assertEqual(again["job_id"], out["job_id"])
+        self.assertFalse(asyncio.run(complete(good))["reused"])
+        self.assertEqual(sum(len(v) for k, v in fake.lists.items() if k.startswith("doc_jobs")), 1)
+
+    # User value: confirms uploads started together cannot all commit past the daily limit.
+    def test_complete_rechecks_daily_quota(self):
+        fake = FakeAsyncRedis()
+
+        async def complete(job_id):
+            stored = {"gcs_uri": f"gs://b/jobs/{job_id}/input/talk.mp3", "size": 2048, "crc32c": "AAAAAA=="}
+            with patch("services.upload_orchestrator.r", fake), patch(
+                "services.upload_orchestrator.get_blob_metadata", return_value=stored
+            ), patch("services.upload_orchestrator.delete_blob") as deleter, patch(
+                "services.upload_orchestrator.commit_and_enqueue_job", fake_commit_and_enqueue_job
+            ):
+                try:
+                    return await complete_direct_upload(job_id=job_id, email="u@example.com", request_id="rid-2")
+                except HTTPException as exc:
+                    deleter.assert_called_once()
+                    return exc
+
+        with patch("services.upload_orchestrator.FEATURE_UPLOAD_QUOTAS", True), patch(
+            "services.quota.DAILY_JOB_LIMIT_PER_USER", 1
+        ):
+            first, _ = _init(fake)
+            second, _ = _init(fake)
+            self.assertFalse(asyncio.run(complete(first["job_id"]))["reused"])
+            rejected = asyncio.run(complete(second["job_id"]))
+
+        self.assertEqual(rejected.status_code, 429)
+        self.assertEqual(rejected.detail.get("error_code"), "USER_DAILY_QUOTA_EXCEEDED")
+        self.assertNotIn(direct_upload_pending_key(second["job_id"]), fake.hashes)
+        self.assertNotIn(f"job_status:{second['job_id']}", fake.hashes)
+        self.assertEqual(sum(len(v) for k, v in fake.lists.items() if k.startswith("doc_jobs")), 1)
+
+    # User value: confirms a verified upload is queued once and a retried complete reuses the job.
+    def test_complete_enqueues_verified_upload(self):
+        fake = FakeAsyncRedis()
+        out, _ = _init(fake)
+        stored = {"gcs_uri": f"gs://b/jobs/{out['job_id']}/input/talk.mp3", "size": 2048, "crc32c": "AAAAAA=="}
+
+        async def run_case():
+            with patch("services.upload_orchestrator.r", fake), patch(
+                "services.upload_orchestrator.get_blob_metadata", return_value=stored
+            ), patch("services.upload_orchestrator.commit_and_enqueue_job", fake_commit_and_enqueue_job):
+                first = await complete_direct_upload(job_id=out["job_id"], email="u@example.com", request_id="rid-2")
+                again = await complete_direct_upload(job_id=out["job_id"], email="u@example.com", request_id="rid-3")
+                return first, again
+
+        first, again = asyncio.run(run_case())
+        self.assertFalse(first["reused"])
+        self.assertTrue(again["reused"])
+        self.assertEqual(fake.hashes[f"job_status:{out['job_id']}"]["input_size_bytes"], "2048")
+        self.assertNotIn(direct_upload_pending_key(out["job_id"]), fake.hashes)
+        self.assertEqual(sum(len(v) for k, v in fake.lists.items() if k.startswith("doc_jobs")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
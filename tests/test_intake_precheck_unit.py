@@ -83,5 +83,19 @@ class IntakePrecheckWarningsUnitTests(unittest.TestCase):
         self.assertIn("UNCERTAIN_FILE_TYPE", codes)
 
 
+    # User value: validates warning generation when file bytes contradict the selected job type.
+    def test_warns_sniffed_content_mismatch(self):
+        warnings = build_precheck_warnings(
+            job_type="OCR",
+            filename="scan.pdf",
+            mime_type="application/pdf",
+            file_size_bytes=1024,
+            media_duration_sec=None,
+            pdf_page_count=1,
+            sniffed_job_type="TRANSCRIPTION",
+        )
+        codes = {w["code"] for w in warnings}
+        self.assertIn("CONTENT_TYPE_MISMATCH", codes)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,120 @@
+# User value: This test keeps archived jobs readable while old finished jobs leave Redis on schedule.
+import time
+import unittest
+from unittest.mock import patch
+
+from services import job_archive
+from services.job_archive import ArchiveCache, archive_month, decode_archive, encode_archive, is_archivable
+
+
+class FakeArchivePipeline:
+    # User value: answers job hash and memory reads together like a Redis pipeline.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, owner):
+        self.owner = owner
+        self.results = []
+
+    # User value: supports hgetall so the OCR/transcription journey stays clear and reliable.
+    def hgetall(self, key):
+        self.results.append(dict(self.owner.hashes.get(key, {})))
+
+    # User value: supports memory_usage so the OCR/transcription journey stays clear and reliable.
+    def memory_usage(self, key):
+        self.results.append(500 if key in self.owner.hashes else None)
+
+    # User value: supports execute so the OCR/transcription journey stays clear and reliable.
+    def execute(self):
+        return self.results
+
+
+class FakeArchiveRedis:
+    # User value: keeps retention tests offline with a newest-first job list and an archive pointer hash.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, job_ids, hashes, pointers=None):
+        self.job_ids = job_ids
+        self.hashes = hashes
+        self.pointers = pointers or {}
+
+    # User value: supports llen so the OCR/transcription journey stays clear and reliable.
+    def llen(self, key):
+        return len(self.job_ids)
+
+    # User value: supports lrange so the OCR/transcription journey stays clear and reliable.
+    def lrange(self, key, start, end):
+        return self.job_ids[start : end + 1]
+
+    # User value: supports hmget so the OCR/transcription journey stays clear and reliable.
+    def hmget(self, key, *fields):
+        return [self.pointers.get(field) for field in fields]
+
+    # User value: supports pipeline so the OCR/transcription journey stays clear and reliable.
+    def pipeline(self, transaction=False):
+        return FakeArchivePipeline(self)
+
+
+# User value: supports _job so the OCR/transcription journey stays clear and reliable.
+def _job(created_at, status="COMPLETED", **extra):
+    return {"user": "u@example.com", "status": status, "created_at": created_at, "updated_at": created_at, **extra}
+
+
+class JobArchiveUnitTests(unittest.TestCase):
+    # User value: confirms only finished jobs past the retention window are archived, filed by creation month.
+    def test_archivable_and_month(self):
+        cutoff = time.time()
+        self.assertTrue(is_archivable(_job("2025-03-31T23:59:59"), cutoff))
+        self.assertFalse(is_archivable(_job("2025-03-31T23:59:59", status="PROCESSING"), cutoff))
+        self.assertFalse(is_archivable(_job("2999-01-01T00:00:00"), cutoff))
+        self.assertEqual(archive_month(_job("2025-03-31T23:59:59")), "2025-03")
+
+    # User value: confirms an archive round-trips every field and stays byte-identical for the same records.
+    def test_archive_round_trip(self):
+        records = {"a": _job("2025-01-02T00:00:00", progress="100"), "b": _job("2025-01-05T00:00:00")}
+        blob = encode_archive(records)
+        self.assertEqual(decode_archive(blob), records)
+        self.assertEqual(blob, encode_archive(dict(reversed(records.items()))))
+
+    # User value: confirms the dry run reports jobs and reclaimable bytes without touching Redis or storage.
+    def test_dry_run_plans_oldest_jobs_only(self):
+        hashes = {
+            "job_status:new": _job("2999-01-01T00:00:00"),
+            "job_status:running": _job("2025-02-01T00:00:00", status="RUNNING"),
+            "job_status:feb": _job("2025-02-01T00:00:00"),
+            "job_status:jan": _job("2025-01-01T00:00:00", status="FAILED"),
+        }
+        fake = FakeArchiveRedis(["new", "running", "feb", "jan"], hashes)
+        with patch.object(job_archive, "upload_bytes") as upload:
+            report = job_archive.archive_user(fake, "u@example.com", cutoff_ts=time.time(), dry_run=True, batch=2)
+        upload.assert_not_called()
+        self.assertEqual((report["jobs"], report["archives"], report["archived"]), (2, 2, 0))
+        self.assertEqual(report["reclaim_bytes"], 2 * (500 - (2 * 3 + 7)))
+
+    # User value: confirms archived jobs are read back through the cache with one storage read per month.
+    def test_load_archived_jobs_reads_each_month_once(self):
+        blob = encode_archive({"a": _job("2025-01-02T00:00:00"), "b": _job("2025-01-05T00:00:00")})
+        fake = FakeArchiveRedis([], {}, pointers={"a": "2025-01", "b": "2025-01"})
+        with patch.object(job_archive, "_cache", ArchiveCache(8, 60)), patch.object(
+            job_archive, "download_bytes", return_value=(blob, 3)
+        ) as download:
+            first = job_archive.load_archived_jobs(fake, "u@example.com", ["a", "b", "missing"])
+            again = job_archive.load_archived_jobs(fake, "u@example.com", ["a"])
+        self.assertEqual(sorted(first), ["a", "b"])
+        self.assertEqual(first["a"]["archived"], "1")
+        self.assertEqual(again["a"]["status"], "COMPLETED")
+        self.assertEqual(download.call_count, 1)
+
+    # User value: confirms the archive cache stays bounded and forgets entries after its TTL.
+    def test_archive_cache_bounds(self):
+        now = [0.0]
+        cache = ArchiveCache(2, 10, clock=lambda: now[0])
+        for month in ("2025-01", "2025-02", "2025-03"):
+            cache.put(("u", month), {"m": month})
+        self.assertIsNone(cache.get(("u", "2025-01")))
+        self.assertEqual(cache.get(("u", "2025-03")), {"m": "2025-03"})
+        now[0] = 11.0
+        self.assertIsNone(cache.get(("u", "2025-03")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# User value: This test keeps the atomic job commit script aligned with status rules so queued jobs are never lost.
+import asyncio
+import json
+import unittest
+
+from services.job_commit import COMMIT_AND_ENQUEUE_LUA, commit_and_enqueue_job
+
+
+class RecordingScriptClient:
+    # User value: captures EVALSHA calls so the script contract can be checked without a Redis server.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    # User value: supports register_script so the OCR/transcription journey stays clear and reliable.
+    def register_script(self, source):
+        from redis.commands.core import AsyncScript
+
+        return AsyncScript(self, source)
+
+    # User value: supports get_encoder so the OCR/transcription journey stays clear and reliable.
+    def get_encoder(self):
+        from redis.asyncio import Redis
+
+        return Redis(decode_responses=True).get_encoder()
+
+    # User value: supports evalsha so the OCR/transcription journey stays clear and reliable.
+    async def evalsha(self, sha, numkeys, *args):
+        self.calls.append((sha, numkeys, args))
+        return self.result
+
+
+class JobCommitUnitTests(unittest.TestCase):
+    # User value: confirms the server-side script enforces the same transition table as Python.
+    def test_script_embeds_transition_table(self):
+        self.assertIn('["COMPLETED"] = {["COMPLETED"] = true}', COMMIT_AND_ENQUEUE_LUA)
+        self.assertIn("redis.call('RPUSH', KEYS[6], ARGV[7])", COMMIT_AND_ENQUEUE_LUA)
+
+    # User value: confirms one EVALSHA call carries every key and the queue payload.
+    def test_commit_sends_one_evalsha_with_all_keys(self):
+        client = RecordingScriptClient([1, "", 1, 4])
+        out = asyncio.run(
+            commit_and_enqueue_job(
+                client,
+                job_id="j1",
+                user_email="u@example.com",
+                queue_name="doc_jobs",
+                mapping={"status": "queued", "progress": 0, "total_pages": None},
+                payload={"job_id": "j1"},
+                idempotency_key="upload_idempotency:u@example.com:OCR:k",
+                idempotency_ttl_sec=900,
+                count_daily_usage=True,
+            )
+        )
+        self.assertEqual(out, {"ok": True, "current_status": None, "enqueued": True, "queue_depth": 4})
+        self.assertEqual(len(client.calls), 1)
+        _, numkeys, args = client.calls[0]
+        keys, argv = args[:numkeys], args[numkeys:]
+        self.assertEqual(keys[0], "job_status:j1")
+        self.assertEqual(keys[1], "upload_idempotency:u@example.com:OCR:k")
+        self.assertEqual(keys[3:6], ("user_jobs:u@example.com", "job_enqueue_once:j1", "doc_jobs"))
+        self.assertEqual(keys[6], "user_jobs_version:u@example.com")
+        self.assertEqual(argv[1], "QUEUED")
+        self.assertEqual(json.loads(argv[6]), {"job_id": "j1"})
+        self.assertEqual(argv[7:], ("status", "queued", "progress", 0, "total_pages", ""))
+
+    # User value: confirms a blocked transition is reported instead of silently enqueued.
+    def test_blocked_transition_is_reported(self):
+        client = RecordingScriptClient([0, "COMPLETED", 0, -1])
+        out = asyncio.run(
+            commit_and_enqueue_job(
+                client,
+                job_id="j2",
+                user_email="u@example.com",
+                queue_name="doc_jobs",
+                mapping={"status": "QUEUED"},
+                payload={},
+            )
+        )
+        self.assertFalse(out["ok"])
+        self.assertEqual(out["current_status"], "COMPLETED")
+        self.assertIsNone(out["queue_depth"])
+
+
+if __name__ == "__main__":
+    unittest.main()
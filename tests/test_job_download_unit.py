@@ -0,0 +1,63 @@
+# User value: This test keeps job history fast and downloads safe by signing links only when a user clicks one.
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+from routes import jobs
+
+
+class FakeJobsRedis:
+    # User value: keeps download tests offline while answering job hash lookups.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, hashes):
+        self.hashes = hashes
+
+    # User value: supports hmget so the OCR/transcription journey stays clear and reliable.
+    def hmget(self, key, *fields):
+        data = self.hashes.get(key, {})
+        return [data.get(field) for field in fields]
+
+
+JOB = {"user": "u@example.com", "status": "COMPLETED", "output_path": "gs://b/jobs/j1/out.txt", "output_filename": "talk.txt"}
+
+
+class JobDownloadUnitTests(unittest.TestCase):
+    # User value: confirms the owner is redirected to a signed link for their result.
+    def test_owner_gets_redirect(self):
+        with patch("routes.jobs.r", FakeJobsRedis({"job_status:j1": JOB})), patch(
+            "routes.jobs.signed_download_urls", return_value=["https://signed/out"]
+        ) as signer:
+            response = jobs.download_job_output("j1", user={"email": "U@example.com"})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.headers["location"], "https://signed/out")
+        self.assertEqual(signer.call_args.args[0][0].filename, "talk.txt")
+
+    # User value: confirms other users and unfinished jobs never get a link.
+    def test_forbidden_and_not_ready(self):
+        fake = FakeJobsRedis({"job_status:j1": JOB, "job_status:j2": {"user": "u@example.com", "status": "PROCESSING"}})
+        with patch("routes.jobs.r", fake), patch("routes.jobs.signed_download_urls") as signer:
+            with self.assertRaises(HTTPException) as forbidden:
+                jobs.download_job_output("j1", user={"email": "other@example.com"})
+            with self.assertRaises(HTTPException) as not_ready:
+                jobs.download_job_output("j2", user={"email": "u@example.com"})
+            with self.assertRaises(HTTPException) as missing:
+                jobs.download_job_output("nope", user={"email": "u@example.com"})
+        self.assertEqual((forbidden.exception.status_code, not_ready.exception.status_code, missing.exception.status_code), (403, 409, 404))
+        signer.assert_not_called()
+
+    # User value: confirms lazy mode lists stable links without any signing calls.
+    def test_lazy_listing_skips_signing(self):
+        items = [dict(JOB, job_id=f"j{i}") for i in range(200)] + [{"job_id": "q", "status": "QUEUED"}]
+        with patch("routes.jobs.is_lazy_download_urls_enabled", return_value=True), patch(
+            "routes.jobs.signed_download_urls"
+        ) as signer:
+            jobs._attach_download_urls(items)
+        signer.assert_not_called()
+        self.assertEqual(items[5]["download_url"], "/jobs/j5/download")
+        self.assertNotIn("download_url", items[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
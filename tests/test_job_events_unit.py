@@ -0,0 +1,193 @@
+# User value: This test keeps long-poll status requests waking promptly when a job changes and never hanging past their wait.
+import asyncio
+import unittest
+
+import json
+
+from services.job_events import JobChangeHub, UserJobStream, topic_from_channel, wait_for_job_version
+
+
+class FakePubSub:
+    # User value: delivers queued job events without a Redis server.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, messages):
+        self.messages = messages
+        self.patterns = ()
+
+    # User value: supports psubscribe so the OCR/transcription journey stays clear and reliable.
+    async def psubscribe(self, *patterns):
+        self.patterns = patterns
+
+    # User value: supports get_message so the OCR/transcription journey stays clear and reliable.
+    async def get_message(self, timeout):
+        if self.messages:
+            return self.messages.pop(0)
+        await asyncio.sleep(0.005)
+        return None
+
+    # User value: supports aclose so the OCR/transcription journey stays clear and reliable.
+    async def aclose(self):
+        return None
+
+
+class FakeEventsRedis:
+    # User value: answers version reads and hands out one shared fake subscription.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, version):
+        self.version = version
+        self.messages = []
+        self.pubsubs = []
+        self.connection_pool = type("Pool", (), {"connection_kwargs": {"db": 0}})()
+
+    # User value: supports pubsub so the OCR/transcription journey stays clear and reliable.
+    def pubsub(self, ignore_subscribe_messages=True):
+        self.pubsubs.append(FakePubSub(self.messages))
+        return self.pubsubs[-1]
+
+    # User value: supports hmget so the OCR/transcription journey stays clear and reliable.
+    async def hmget(self, key, *fields):
+        return [str(self.version) for _ in fields]
+
+
+class FakeStreamPipeline:
+    # User value: batches job hash reads like a Redis pipeline.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, hashes):
+        self.hashes = hashes
+        self.reads = []
+
+    # User value: supports hmget so the OCR/transcription journey stays clear and reliable.
+    def hmget(self, key, *fields):
+        self.reads.append((key, fields))
+
+    # User value: supports execute so the OCR/transcription journey stays clear and reliable.
+    async def execute(self):
+        return [[self.hashes.get(key, {}).get(field) for field in fields] for key, fields in self.reads]
+
+
+class FakeStreamRedis:
+    # User value: holds a user's job list and job hashes for stream tests.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, job_ids, hashes):
+        self.job_ids = job_ids
+        self.hashes = hashes
+        self.history_version = "1"
+
+    # User value: supports get so the OCR/transcription journey stays clear and reliable.
+    async def get(self, key):
+        return self.history_version
+
+    # User value: supports lrange so the OCR/transcription journey stays clear and reliable.
+    async def lrange(self, key, start, end):
+        return self.job_ids[start : end + 1]
+
+    # User value: supports pipeline so the OCR/transcription journey stays clear and reliable.
+    def pipeline(self, transaction=False):
+        return FakeStreamPipeline(self.hashes)
+
+
+# User value: supports _payloads so the OCR/transcription journey stays clear and reliable.
+def _payloads(frames):
+    return [json.loads(frame.split("data: ", 1)[1]) for frame in frames]
+
+
+class JobEventsUnitTests(unittest.TestCase):
+    # User value: confirms every announcement style maps back to what changed.
+    def test_topic_from_channel(self):
+        self.assertEqual(topic_from_channel(b"job_events:j1"), "j1")
+        self.assertEqual(topic_from_channel("__keyspace@0__:job_status:j2"), "j2")
+        self.assertEqual(topic_from_channel("user_jobs_version:u@example.com"), "user_jobs_version:u@example.com")
+        self.assertIsNone(topic_from_channel("auth:users:blocked:changes"))
+
+    # User value: confirms a waiting request returns as soon as the job's version moves.
+    def test_waiter_wakes_on_event(self):
+        async def scenario():
+            fake = FakeEventsRedis(4)
+            hub = JobChangeHub(fake)
+            waiter = asyncio.create_task(wait_for_job_version(hub, fake, "j1", 4, 5.0))
+            await asyncio.sleep(0.02)
+            self.assertEqual(hub.waiter_count(), 1)
+            fake.version = 5
+            fake.messages.append({"channel": "job_events:j1", "data": "5"})
+            version = await asyncio.wait_for(waiter, 1.0)
+            await hub.stop()
+            return version, hub.waiter_count(), fake.pubsubs[0].patterns
+
+        version, left, patterns = asyncio.run(scenario())
+        self.assertEqual((version, left), (5, 0))
+        self.assertEqual(patterns, ("job_events:*", "user_jobs_version:*", "__keyspace@0__:job_status:*"))
+
+    # User value: confirms events for other jobs do not wake the request and the wait still ends on time.
+    def test_waiter_times_out_without_change(self):
+        async def scenario():
+            fake = FakeEventsRedis(4)
+            hub = JobChangeHub(fake)
+            fake.messages.append({"channel": "job_events:other", "data": "1"})
+            version = await wait_for_job_version(hub, fake, "j1", 4, 0.05)
+            await hub.stop()
+            return version
+
+        self.assertEqual(asyncio.run(scenario()), 4)
+
+    # User value: confirms a client that is already behind gets an answer without waiting.
+    def test_stale_version_returns_immediately(self):
+        async def scenario():
+            fake = FakeEventsRedis(7)
+            hub = JobChangeHub(fake)
+            version = await asyncio.wait_for(wait_for_job_version(hub, fake, "j1", 3, 30.0), 2.0)
+            await hub.stop()
+            return version
+
+        self.assertEqual(asyncio.run(scenario()), 7)
+
+    # User value: confirms a fresh tab gets its active jobs, then only the fields that actually changed.
+    def test_stream_sends_snapshot_then_deltas(self):
+        fake = FakeStreamRedis(
+            ["a", "b"],
+            {
+                "job_status:a": {"status": "PROCESSING", "stage": "OCR", "progress": "10", "version": "3"},
+                "job_status:b": {"status": "COMPLETED", "version": "9"},
+            },
+        )
+
+        async def scenario():
+            stream = UserJobStream(fake, "u@example.com")
+            first = await stream.collect("1")
+            fake.hashes["job_status:a"].update(progress="60", version="4")
+            second = await stream.collect("2")
+            fake.hashes["job_status:a"].update(status="COMPLETED", version="5")
+            third = await stream.collect("3")
+            return first, second, third, stream.watched
+
+        first, second, third, watched = asyncio.run(scenario())
+        self.assertEqual([p["job_id"] for p in _payloads(first)], ["a"])
+        self.assertEqual(_payloads(second)[0], {"job_id": "a", "version": "4", "updated_at": None, "progress": "60"})
+        self.assertTrue(_payloads(third)[0]["terminal"])
+        self.assertEqual(watched, {})
+
+    # User value: confirms a reconnecting tab learns about jobs that finished while it was away, and nothing older.
+    def test_stream_resume_replays_recent_changes_only(self):
+        fake = FakeStreamRedis(
+            ["new", "old"],
+            {
+                "job_status:new": {"status": "FAILED", "version": "7", "updated_at": "2026-01-01T00:10:00"},
+                "job_status:old": {"status": "PROCESSING", "version": "2", "updated_at": "2026-01-01T00:00:00"},
+            },
+        )
+        since_ms = 1767226140000  # 2026-01-01T00:09:00Z
+
+        async def scenario():
+            stream = UserJobStream(fake, "u@example.com", since_ms=since_ms)
+            return await stream.collect("1"), stream.watched
+
+        frames, watched = asyncio.run(scenario())
+        self.assertEqual([p["job_id"] for p in _payloads(frames)], ["new"])
+        self.assertIn("old", watched)
+
+
+if __name__ == "__main__":
+    unittest.main()
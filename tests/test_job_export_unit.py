@@ -0,0 +1,104 @@
+# User value: This test keeps full-history exports complete, bounded in memory and safe to open in a spreadsheet.
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+from routes import jobs
+from services.job_export import csv_chunk, iter_job_batches
+
+
+class FakeExportPipeline:
+    # User value: queues hash reads and answers them together like a Redis pipeline.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, owner):
+        self.owner = owner
+        self.keys = []
+
+    # User value: supports hgetall so the OCR/transcription journey stays clear and reliable.
+    def hgetall(self, key):
+        self.keys.append(key)
+
+    # User value: supports execute so the OCR/transcription journey stays clear and reliable.
+    def execute(self):
+        self.owner.pipelines += 1
+        return [dict(self.owner.hashes.get(key, {})) for key in self.keys]
+
+
+class FakeExportRedis:
+    # User value: keeps export tests offline with a job list that can grow mid-export.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, job_ids, hashes):
+        self.job_ids = list(job_ids)
+        self.hashes = hashes
+        self.pipelines = 0
+        self.on_lrange = None
+
+    # User value: supports llen so the OCR/transcription journey stays clear and reliable.
+    def llen(self, key):
+        return len(self.job_ids)
+
+    # User value: supports lrange so the OCR/transcription journey stays clear and reliable.
+    def lrange(self, key, start, end):
+        n = len(self.job_ids)
+        start = max(0, start + n if start < 0 else start)
+        end = end + n if end < 0 else end
+        out = self.job_ids[start : end + 1]
+        if self.on_lrange:
+            self.on_lrange(self)
+        return out
+
+    # User value: supports pipeline so the OCR/transcription journey stays clear and reliable.
+    def pipeline(self, transaction=False):
+        return FakeExportPipeline(self)
+
+
+# User value: supports _job so the OCR/transcription journey stays clear and reliable.
+def _job(job_id, **extra):
+    return {"user": "u@example.com", "status": "COMPLETED", "job_type": "OCR", "filename": f"{job_id}.pdf", **extra}
+
+
+class JobExportUnitTests(unittest.TestCase):
+    # User value: confirms jobs created during an export neither shift nor duplicate the rows being streamed.
+    def test_batches_are_stable_while_jobs_are_added(self):
+        ids = [f"j{i}" for i in range(7, 0, -1)]
+        fake = FakeExportRedis(ids, {f"job_status:{job_id}": _job(job_id) for job_id in ids})
+        fake.on_lrange = lambda owner: owner.job_ids.insert(0, f"new{len(owner.job_ids)}")
+        exported = [job_id for batch in iter_job_batches(fake, "user_jobs:u@example.com", 3) for job_id, _ in batch]
+        self.assertEqual(exported, ids)
+        self.assertEqual(fake.pipelines, 3)
+
+    # User value: confirms user-supplied filenames cannot run as spreadsheet formulas.
+    def test_csv_escapes_formulas(self):
+        text = csv_chunk([{"job_id": "j1", "filename": "=HYPERLINK(\"x\")", "progress": 100}], header=True)
+        header, row = text.splitlines()
+        self.assertTrue(header.startswith("job_id,job_type,status"))
+        self.assertIn("'=HYPERLINK", row)
+
+    # User value: confirms the export streams every job with unsigned download links by default.
+    def test_export_streams_ndjson(self):
+        ids = ["j2", "j1", "gone"]
+        hashes = {
+            "job_status:j2": _job("j2", output_path="gs://bucket/out/j2.txt"),
+            "job_status:j1": _job("j1", status="FAILED"),
+        }
+        fake = FakeExportRedis(ids, hashes)
+
+        # User value: supports collect so the OCR/transcription journey stays clear and reliable.
+        async def collect(resp):
+            return "".join([chunk async for chunk in resp.body_iterator])
+
+        with patch("routes.jobs.r", fake), patch("routes.jobs._attach_download_urls") as sign:
+            resp = jobs.export_jobs(user={"email": "u@example.com"}, export_format="ndjson", include_urls=False)
+            body = asyncio.run(collect(resp))
+        sign.assert_not_called()
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([line["job_id"] for line in lines], ["j2", "j1"])
+        self.assertEqual(lines[0]["download_url"], "/jobs/j2/download")
+        self.assertEqual(resp.media_type, "application/x-ndjson")
+
+
+if __name__ == "__main__":
+    unittest.main()
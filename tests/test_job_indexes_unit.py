@@ -0,0 +1,121 @@
+# User value: This test keeps filtered job history fast by serving it from per-user indexes in a fixed number of Redis calls.
+import unittest
+from unittest.mock import patch
+
+from routes import jobs
+from scripts.backfill_job_indexes import created_ts
+from utils.job_indexes import REINDEX_JOB_LUA, counts_field, index_key_for
+from utils.page_cursor import NEWER, PageCursor, decode_cursor, encode_cursor
+from utils.status_machine import TRANSITION_HSET_LUA
+
+
+class FakeIndexPipeline:
+    # User value: records index reads and replays canned results in one execute.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, owner):
+        self.owner = owner
+        self.calls = []
+
+    # User value: supports __getattr__ so the OCR/transcription journey stays clear and reliable.
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args))
+
+    # User value: supports execute so the OCR/transcription journey stays clear and reliable.
+    def execute(self):
+        self.owner.executed.append(self.calls)
+        return [self.owner.results.get(call, 0) for call in self.calls]
+
+
+class FakeIndexRedis:
+    # User value: keeps index listing tests offline while counting pipelines.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, results):
+        self.results = results
+        self.executed = []
+
+    # User value: supports pipeline so the OCR/transcription journey stays clear and reliable.
+    def pipeline(self, transaction=False):
+        return FakeIndexPipeline(self)
+
+
+class JobIndexesUnitTests(unittest.TestCase):
+    # User value: confirms each filter combination maps to exactly one index.
+    def test_index_key_for(self):
+        self.assertEqual(index_key_for("u@example.com", status="FAILED", job_type=None), "user_jobs_by_status:u@example.com:FAILED")
+        self.assertEqual(index_key_for("u@example.com", status=None, job_type="ocr"), "user_jobs_by_type:u@example.com:OCR")
+        self.assertEqual(
+            index_key_for("u@example.com", status="failed", job_type="OCR"), "user_jobs_by_type_status:u@example.com:OCR:FAILED"
+        )
+        self.assertIsNone(index_key_for("u@example.com", status=None, job_type=None))
+
+    # User value: confirms counters use the same field names the listing reads and only move with index membership.
+    def test_counts_fields(self):
+        self.assertEqual(counts_field(status="failed"), "status:FAILED")
+        self.assertEqual(counts_field(job_type="ocr"), "type:OCR")
+        self.assertEqual(counts_field(status="FAILED", job_type="OCR"), "type_status:OCR:FAILED")
+        self.assertIn("if redis.call('ZADD', by_status .. new_status, ts, id) == 1 then", REINDEX_JOB_LUA)
+
+    # User value: confirms status changes move the job between indexes inside the same atomic script.
+    def test_transition_script_reindexes(self):
+        self.assertIn("reindex_job(KEYS[1], current, ARGV[1], false)", TRANSITION_HSET_LUA)
+        self.assertIn("ZREM", TRANSITION_HSET_LUA)
+
+    # User value: confirms a filtered, counted page is one pipeline (one range read, one counters read) at any history size.
+    def test_indexed_page_is_one_round_trip(self):
+        key = "user_jobs_by_type_status:u@example.com:OCR:FAILED"
+        fake = FakeIndexRedis(
+            {
+                ("zrevrange", (key, 20, 30)): ["j9", "j8", "j7", "j6", "j5", "j4", "j3", "j2", "j1", "j0", "jx"],
+                ("hgetall", ("user_job_counts:u@example.com",)): {
+                    "type:OCR": "12000",
+                    "type_status:OCR:FAILED": "4000",
+                    "type_status:OCR:COMPLETED": "8000",
+                    "status:FAILED": "9000",
+                },
+            }
+        )
+        with patch("routes.jobs.r", fake):
+            page, has_more, total, counts_by_status, counts_by_type = jobs._indexed_page(
+                "u@example.com", status="FAILED", job_type="OCR", limit=10, offset=20, include_counts=True, total_user_jobs=20000
+            )
+        self.assertEqual(len(fake.executed), 1)
+        self.assertEqual([name for name, _ in fake.executed[0]], ["zrevrange", "hgetall"])
+        self.assertEqual((len(page), has_more, total), (10, True, 4000))
+        self.assertEqual(counts_by_status["COMPLETED"], 8000)
+        self.assertEqual(counts_by_type, {"TRANSCRIPTION": 0, "OCR": 12000})
+
+    # User value: confirms cursors round-trip and that tampered or foreign tokens are rejected.
+    def test_cursor_round_trip(self):
+        cursor = PageCursor("1767225600.000001", "job-a", NEWER)
+        self.assertEqual(decode_cursor(encode_cursor(cursor)), cursor)
+        for token in ("", "not-a-cursor", encode_cursor(PageCursor("nan", "job-a")), encode_cursor(PageCursor("1", ""))):
+            with self.assertRaises(ValueError):
+                decode_cursor(token)
+
+    # User value: confirms an older page starts right after the cursor job, including jobs that share its timestamp.
+    def test_cursor_page_breaks_ties_by_job_id(self):
+        key = "user_jobs_by_time:u@example.com"
+        fake = FakeIndexRedis(
+            {
+                ("zrangebyscore", (key, "100.000000", "100.000000")): ["a", "b", "c"],
+                ("zrevrangebyscore", (key, "(100.000000", "-inf")): ["z", "y", "x"],
+                ("zrangebyscore", (key, "(100.000000", "+inf")): ["m", "n", "o"],
+            }
+        )
+        with patch("routes.jobs.r", fake):
+            older, older_more, _ = jobs._cursor_page(key, PageCursor("100.000000", "b"), 3, None)
+            newer, newer_more, _ = jobs._cursor_page(key, PageCursor("100.000000", "b", NEWER), 3, None)
+        self.assertEqual((older, older_more), (["a", "z", "y"], True))
+        self.assertEqual((newer, newer_more), (["n", "m", "c"], True))
+        self.assertEqual(len(fake.executed), 2)
+
+    # User value: confirms backfilled jobs keep their original order by creation time.
+    def test_backfill_score_from_created_at(self):
+        self.assertEqual(created_ts("2026-01-01T00:00:00"), "1767225600.000000")
+        self.assertEqual(created_ts(""), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
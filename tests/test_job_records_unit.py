@@ -0,0 +1,111 @@
+# User value: This test keeps compact job records readable exactly like plain ones, so history never changes shape.
+import json
+import unittest
+
+from repositories import job_records
+from repositories.job_records import (
+    CREATE_PACKED_FIELDS,
+    RECORD_FIELD,
+    VALUE_ENUMS,
+    compact_fields,
+    decode_job,
+    decode_job_fields,
+    encode_job,
+    expand_fields,
+    pack_record,
+    queue_job_fields,
+    read_job_fields,
+    unpack_record,
+)
+from schemas.job_contract import CONTRACT_VERSION
+
+
+class FakeRecordRedis:
+    # User value: keeps record tests offline and remembers which hash fields each HMGET asked for.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, hashes):
+        self.hashes = hashes
+        self.hmget_calls = []
+
+    # User value: supports hmget so the OCR/transcription journey stays clear and reliable.
+    def hmget(self, key, *fields):
+        self.hmget_calls.append(fields)
+        data = self.hashes.get(key, {})
+        return [data.get(field) for field in fields]
+
+
+# User value: supports _finished_job so the OCR/transcription journey stays clear and reliable.
+def _finished_job(**extra):
+    return {
+        "contract_version": CONTRACT_VERSION,
+        "user": "u@example.com",
+        "status": "COMPLETED",
+        "version": "9",
+        "source": "ocr",
+        "input_filename": "granth.pdf",
+        "input_size_bytes": "123456",
+        "content_subtype": "pravachan",
+        "request_id": "0a1b2c",
+        "segment_quality": json.dumps([{"start_sec": i * 30.0, "score": 0.9} for i in range(40)]),
+        **extra,
+    }
+
+
+class JobRecordsUnitTests(unittest.TestCase):
+    # User value: confirms every value comes back as the same string, including enum, number and compressed ones.
+    def test_record_round_trip(self):
+        fields = {name: value for name, value in _finished_job().items() if name not in ("user", "status", "version")}
+        fields["retry_of_job_id"] = "007"
+        fields["custom_field"] = "kept by name"
+        self.assertEqual(unpack_record(pack_record(fields)), fields)
+        self.assertIn(CONTRACT_VERSION, VALUE_ENUMS["contract_version"])
+
+    # User value: confirms a compacted finished job decodes to the original and shrinks.
+    def test_compact_finished_job(self):
+        raw = _finished_job()
+        record, replaced = compact_fields(raw, terminal=True)
+        stored = {name: value for name, value in raw.items() if name not in replaced}
+        stored[RECORD_FIELD] = record
+        self.assertEqual(decode_job(stored), raw)
+        self.assertNotIn("status", replaced)
+        self.assertLess(sum(len(k) + len(v) for k, v in stored.items()), sum(len(k) + len(v) for k, v in raw.items()))
+        self.assertEqual(expand_fields(stored), {name: raw[name] for name in replaced})
+
+    # User value: confirms fields a worker writes after the record was packed take precedence.
+    def test_plain_fields_win(self):
+        stored = {"status": "FAILED", "error_message": "new", RECORD_FIELD: pack_record({"error_message": "old"})}
+        self.assertEqual(decode_job(stored)["error_message"], "new")
+
+    # User value: confirms new jobs are only packed when the flag is on, and only their write-once fields.
+    def test_encode_job(self):
+        mapping = {"status": "QUEUED", "input_filename": "a.pdf", "source": "ocr"}
+        self.assertIs(encode_job(mapping, compact=False), mapping)
+        stored = encode_job(mapping, compact=True)
+        self.assertEqual(set(stored), {"status", RECORD_FIELD})
+        self.assertEqual(decode_job(stored), mapping)
+        self.assertIn("input_filename", CREATE_PACKED_FIELDS)
+
+    # User value: confirms hot-field reads stay one small HMGET and cold fields are found inside the record.
+    def test_read_job_fields(self):
+        raw = encode_job({"status": "COMPLETED", "output_path": "o.docx", "output_filename": "x.docx"}, compact=True)
+        fake = FakeRecordRedis({job_records.job_key("j1"): raw})
+        self.assertEqual(read_job_fields(fake, "j1", "status", "output_path"), {"status": "COMPLETED", "output_path": "o.docx"})
+        self.assertEqual(fake.hmget_calls[-1], ("status", "output_path"))
+        self.assertEqual(read_job_fields(fake, "j1", "status", "output_filename")["output_filename"], "x.docx")
+        self.assertEqual(fake.hmget_calls[-1], ("status", "output_filename", RECORD_FIELD))
+        self.assertEqual(read_job_fields(fake, "missing", "output_filename"), {"output_filename": None})
+
+    # User value: confirms pipelined reads queue the same HMGET and decode rows exactly like read_job_fields.
+    def test_queue_job_fields(self):
+        raw = encode_job({"status": "QUEUED", "output_filename": "x.docx"}, compact=True)
+        fake = FakeRecordRedis({job_records.job_key("j1"): raw})
+        fields = ("status", "output_filename")
+        queue_job_fields(fake, "j1", *fields)
+        self.assertEqual(fake.hmget_calls[-1], ("status", "output_filename", RECORD_FIELD))
+        row = fake.hmget(job_records.job_key("j1"), *fake.hmget_calls[-1])
+        self.assertEqual(decode_job_fields(fields, row), {"status": "QUEUED", "output_filename": "x.docx"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+# User value: This test keeps PDF page counts exact and memory-bounded so OCR limits stay trustworthy.
+import tempfile
+import unittest
+import zlib
+from io import BytesIO
+
+from services.pdf_page_count import (
+    count_pdf_pages,
+    count_pdf_pages_structural,
+    pages_from_linearization,
+    scan_pdf_pages,
+)
+
+
+# User value: builds a classic xref-table PDF so the trailer path is tested on real structure.
+def _classic_pdf(page_count: int, *, compact: bool = False, head: bytes = b"") -> bytes:
+    page_type = b"/Type/Page" if compact else b"/Type /Page"
+    kids = " ".join(f"{3 + i} 0 R" for i in range(page_count)).encode("ascii")
+    bodies = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + kids + b"] /Count " + str(page_count).encode("ascii") + b" >>",
+    ] + [b"<< " + page_type + b" /Parent 2 0 R >>" for _ in range(page_count)]
+    out = bytearray(b"%PDF-1.4\n" + head)
+    offsets = []
+    for idx, body in enumerate(bodies, start=1):
+        offsets.append(len(out))
+        out += f"{idx} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(bodies) + 1}\n0000000000 65535 f \n".encode("ascii")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("ascii")
+    out += f"trailer\n<< /Size {len(bodies) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii")
+    return bytes(out)
+
+
+# User value: appends an incremental update so the newest xref section wins like in PDF readers.
+def _with_incremental_update(blob: bytes, page_count: int) -> bytes:
+    prev = int(blob.rsplit(b"startxref\n", 1)[1].split(b"\n", 1)[0])
+    out = bytearray(blob)
+    offset = len(out)
+    out += f"2 0 obj\n<< /Type /Pages /Kids [] /Count {page_count} >>\nendobj\n".encode("ascii")
+    xref = len(out)
+    out += f"xref\n2 1\n{offset:010d} 00000 n \n".encode("ascii")
+    out += f"trailer\n<< /Size 3 /Root 1 0 R /Prev {prev} >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii")
+    return bytes(out)
+
+
+# User value: builds a PDF 1.5 file with compressed object and xref streams like modern scanners emit.
+def _object_stream_pdf(page_count: int) -> bytes:
+    kids = " ".join(f"{3 + i} 0 R" for i in range(page_count))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode("ascii"),
+    ] + [b"<< /Type /Page /Parent 2 0 R >>" for _ in range(page_count)]
+    header, payload = [], bytearray()
+    for idx, body in enumerate(objects, start=1):
+        header.append(f"{idx} {len(payload)}")
+        payload += body + b"\n"
+    header_bytes = (" ".join(header) + "\n").encode("ascii")
+    stm_num = len(objects) + 1
+    xref_num = stm_num + 1
+    packed = zlib.compress(header_bytes + bytes(payload))
+
+    out = bytearray(b"%PDF-1.5\n")
+    stm_offset = len(out)
+    out += (
+        f"{stm_num} 0 obj\n<< /Type /ObjStm /N {len(objects)} /First {len(header_bytes)} "
+        f"/Filter /FlateDecode /Length {len(packed)} >>\nstream\n"
+    ).encode("ascii")
+    out += packed + b"\nendstream\nendobj\n"
+    xref_offset = len(out)
+
+    rows = [bytes([0, 0, 0, 0, 0, 0xFF, 0xFF])]
+    rows += [bytes([2]) + stm_num.to_bytes(4, "big") + idx.to_bytes(2, "big") for idx in range(len(objects))]
+    rows += [bytes([1]) + stm_offset.to_bytes(4, "big") + b"\x00\x00"]
+    rows += [bytes([1]) + xref_offset.to_bytes(4, "big") + b"\x00\x00"]
+    encoded, prev = bytearray(), bytes(7)
+    for row in rows:
+        encoded += b"\x02" + bytes((a - b) & 0xFF for a, b in zip(row, prev))
+        prev = row
+    xref_data = zlib.compress(bytes(encoded))
+    out += (
+        f"{xref_num} 0 obj\n<< /Type /XRef /Size {xref_num + 1} /W [1 4 2] /Root 1 0 R "
+        f"/Filter /FlateDecode /DecodeParms << /Predictor 12 /Columns 7 >> /Length {len(xref_data)} >>\nstream\n"
+    ).encode("ascii")
+    out += xref_data + b"\nendstream\nendobj\n"
+    out += f"startxref\n{xref_offset}\n%%EOF\n".encode("ascii")
+    return bytes(out)
+
+
+class PdfPageCountUnitTests(unittest.TestCase):
+    # User value: confirms the root page tree /Count is used for classic PDFs.
+    def test_classic_xref_reads_root_count(self):
+        blob = _classic_pdf(5, compact=True)
+        self.assertEqual(count_pdf_pages_structural(BytesIO(blob)), 5)
+        # The marker scan misses compact "/Type/Page" markers, the page tree does not.
+        self.assertNotEqual(scan_pdf_pages(BytesIO(blob)), 5)
+
+    # User value: confirms incremental saves report the latest page count.
+    def test_incremental_update_uses_newest_section(self):
+        blob = _with_incremental_update(_classic_pdf(4), 9)
+        self.assertEqual(count_pdf_pages(BytesIO(blob)), 9)
+
+    # User value: confirms compressed object streams still yield an exact count.
+    def test_object_stream_pdf_is_counted(self):
+        self.assertEqual(count_pdf_pages(BytesIO(_object_stream_pdf(12))), 12)
+
+    # User value: confirms linearized PDFs are counted from the first kilobyte.
+    def test_linearized_head_is_used(self):
+        head = b"1 0 obj\n<< /Linearized 1 /L 9999 /H [ 10 20 ] /O 3 /E 100 /N 42 /T 900 >>\nendobj\n"
+        self.assertEqual(pages_from_linearization(b"%PDF-1.4\n" + head), 42)
+        blob = b"%PDF-1.4\n" + head + b"garbage without trailer"
+        self.assertEqual(count_pdf_pages(BytesIO(blob)), 42)
+
+    # User value: keeps a heuristic estimate for damaged PDFs without a usable trailer.
+    def test_broken_trailer_falls_back_to_scan(self):
+        blob = _classic_pdf(3).split(b"xref\n")[0]
+        self.assertIsNone(count_pdf_pages_structural(BytesIO(blob)))
+        self.assertEqual(count_pdf_pages(BytesIO(blob)), 3)
+
+    # User value: confirms on-disk spools are scanned and the read position is restored.
+    def test_on_disk_scan_restores_position(self):
+        blob = b"%PDF-1.4\n" + b"<< /Type /Page >>\n" * 6
+        with tempfile.TemporaryFile() as handle:
+            handle.write(blob)
+            handle.seek(3)
+            self.assertEqual(scan_pdf_pages(handle, chunk_size=5), 6)
+            self.assertEqual(count_pdf_pages(handle), 6)
+            self.assertEqual(handle.tell(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+# User value: This test keeps every route on one bounded, measured Redis pool so load spikes degrade predictably.
+import unittest
+
+from services import redis_client
+from utils.metrics import snapshot
+
+
+class RedisClientUnitTests(unittest.TestCase):
+    # User value: confirms modules share one client and one blocking pool instead of building their own.
+    def test_factory_returns_shared_blocking_pool(self):
+        client = redis_client.get_redis()
+        self.assertIs(client, redis_client.get_redis())
+        self.assertIs(client, redis_client.redis_client)
+        pool = client.connection_pool
+        self.assertEqual(pool.max_connections, redis_client.REDIS_MAX_CONNECTIONS)
+        self.assertAlmostEqual(pool.timeout, redis_client.REDIS_POOL_TIMEOUT_MS / 1000.0)
+        self.assertTrue(pool.connection_kwargs["decode_responses"])
+        self.assertEqual(pool.connection_kwargs["health_check_interval"], redis_client.REDIS_HEALTH_CHECK_INTERVAL_SEC)
+
+    # User value: confirms the async client is shared and sized the same way.
+    def test_async_factory_is_shared(self):
+        client = redis_client.get_async_redis()
+        self.assertIs(client, redis_client.get_async_redis())
+        self.assertEqual(client.connection_pool.max_connections, redis_client.REDIS_MAX_CONNECTIONS)
+
+    # User value: confirms pool wait and saturation land in the metrics snapshot.
+    def test_checkout_metrics_are_recorded(self):
+        redis_client._record_checkout("unit", 0.0, 5, 10)
+        out = snapshot()
+        self.assertIn("redis_pool_wait_ms|pool=unit", out["timers_ms"])
+        self.assertEqual(out["gauges"]["redis_pool_in_use|pool=unit"], 5.0)
+        self.assertEqual(out["gauges"]["redis_pool_saturation|pool=unit"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# User value: This test keeps API session tokens tamper-proof and revocable so fast polling never weakens sign-in.
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+from services import auth
+from services.session_tokens import SessionEpochCache, mint_session_token, verify_session_token
+
+SECRET = "s" * 32
+
+
+class SessionTokensUnitTests(unittest.TestCase):
+    # User value: confirms a freshly minted token verifies and carries the user's email.
+    def test_round_trip(self):
+        token, expires_at = mint_session_token(secret=SECRET, email="u@example.com", name="U", epoch=3, ttl_sec=60, now=1000)
+        claims = verify_session_token(token, secret=SECRET, epoch=3, now=1001)
+        self.assertEqual(claims["email"], "u@example.com")
+        self.assertEqual(claims["exp"], expires_at)
+        self.assertEqual(expires_at, 1060)
+
+    # User value: confirms tampered, expired, revoked or foreign-secret tokens are rejected.
+    def test_rejects_invalid_tokens(self):
+        token, _ = mint_session_token(secret=SECRET, email="u@example.com", name=None, epoch=3, ttl_sec=60, now=1000)
+        prefix, body, signature = token.split(".")
+        forged_body = mint_session_token(secret=SECRET, email="admin@example.com", name=None, epoch=3, ttl_sec=60, now=1000)[0].split(".")[1]
+        self.assertIsNone(verify_session_token(f"{prefix}.{forged_body}.{signature}", secret=SECRET, epoch=3, now=1001))
+        self.assertIsNone(verify_session_token(token, secret=SECRET, epoch=3, now=1060))
+        self.assertIsNone(verify_session_token(token, secret=SECRET, epoch=4, now=1001))
+        self.assertIsNone(verify_session_token(token, secret="t" * 32, epoch=3, now=1001))
+        self.assertIsNone(verify_session_token("dts1.garbage", secret=SECRET, epoch=3, now=1001))
+
+    # User value: confirms the epoch is read from Redis once per refresh window and survives brief outages.
+    def test_epoch_cache_refresh_and_fallback(self):
+        clock = [0.0]
+        reads = []
+
+        def read():
+            reads.append(1)
+            if len(reads) > 1:
+                raise ConnectionError("down")
+            return "7"
+
+        cache = SessionEpochCache(read, refresh_sec=5, clock=lambda: clock[0])
+        self.assertEqual(cache.get(), 7)
+        clock[0] = 4
+        self.assertEqual(cache.get(), 7)
+        clock[0] = 6
+        self.assertEqual(cache.get(), 7)
+        self.assertEqual(len(reads), 2)
+
+    # User value: confirms the auth dependency accepts session tokens without any Google verification.
+    def test_verify_google_token_accepts_session_token(self):
+        token, _ = mint_session_token(secret=SECRET, email="u@example.com", name=None, epoch=0, ttl_sec=60)
+        with patch("services.auth.is_session_tokens_enabled", return_value=True), patch(
+            "services.auth.AUTH_SESSION_SECRET", SECRET
+        ), patch("services.auth._session_epoch", SessionEpochCache(lambda: None, refresh_sec=5)), patch(
+            "services.auth.verify_google_id_token"
+        ) as google_verify:
+            user = auth.verify_google_token(f"Bearer {token}")
+            with self.assertRaises(HTTPException) as ctx:
+                auth.verify_google_token(f"Bearer {token[:-2]}xx")
+        self.assertEqual(user["email"], "u@example.com")
+        google_verify.assert_not_called()
+        self.assertEqual(ctx.exception.detail["error_code"], "AUTH_INVALID_SESSION")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+# User value: This test keeps download links fast by proving signed URLs are reused safely and signed in parallel.
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from services import signed_urls
+from services.signed_urls import DownloadTarget, SignedUrlCache, download_target, signed_download_urls
+
+
+class SignedUrlsUnitTests(unittest.TestCase):
+    # User value: supports setUp so users get deterministic behavior regardless of local env leftovers.
+    def setUp(self):
+        signed_urls._cache.clear()
+
+    # User value: confirms stored results map to the right bucket, object and download name.
+    def test_download_target_parses_output_path(self):
+        target = download_target({"output_path": "gs://b/jobs/j1/out.txt", "output_filename": "talk.txt"})
+        self.assertEqual(target, DownloadTarget("b", "jobs/j1/out.txt", "talk.txt"))
+        self.assertIsNone(download_target({"output_path": "https://already/signed"}))
+        self.assertIsNone(download_target({}))
+
+    # User value: confirms links are reused until the safety margin and evicted beyond the LRU bound.
+    def test_cache_respects_margin_and_bound(self):
+        clock = [0.0]
+        cache = SignedUrlCache(max_entries=1, clock=lambda: clock[0])
+        a, b = DownloadTarget("b", "a", "a.txt"), DownloadTarget("b", "b", "b.txt")
+        cache.put(a, "url-a", 100)
+        self.assertEqual(cache.get(a), "url-a")
+        clock[0] = 100
+        self.assertIsNone(cache.get(a))
+        cache.put(a, "url-a", 200)
+        cache.put(b, "url-b", 200)
+        self.assertIsNone(cache.get(a))
+        self.assertEqual(cache.get(b), "url-b")
+
+    # User value: confirms a page signs each missing link once, concurrently, and reuses them next time.
+    def test_page_signs_misses_concurrently_then_hits(self):
+        active = [0]
+        peak = [0]
+        lock = threading.Lock()
+
+        def fake_sign(*, bucket_name, blob_path, expiration_minutes, download_filename, response_type):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return f"https://signed/{blob_path}"
+
+        targets = [DownloadTarget("b", f"o{i}", "t.txt") for i in range(6)] + [DownloadTarget("b", "o0", "t.txt")]
+        with patch("services.signed_urls.generate_signed_url", side_effect=fake_sign) as signer:
+            urls = signed_download_urls(targets)
+            again = signed_download_urls(targets)
+        self.assertEqual(urls[0], "https://signed/o0")
+        self.assertEqual(urls[-1], "https://signed/o0")
+        self.assertEqual(urls, again)
+        self.assertEqual(signer.call_count, 6)
+        self.assertGreater(peak[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
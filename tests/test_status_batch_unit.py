@@ -0,0 +1,74 @@
+# User value: This test keeps dashboard refreshes cheap by loading many jobs in one call with the same checks as single reads.
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+from routes import status
+from schemas.requests import StatusBatchRequest
+
+
+class FakeBatchPipeline:
+    # User value: answers queued hash reads in one execute, like a Redis pipeline.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, owner):
+        self.owner = owner
+        self.keys = []
+
+    # User value: supports hgetall so the OCR/transcription journey stays clear and reliable.
+    def hgetall(self, key):
+        self.keys.append(key)
+
+    # User value: supports execute so the OCR/transcription journey stays clear and reliable.
+    def execute(self):
+        self.owner.round_trips += 1
+        return [dict(self.owner.hashes.get(key, {})) for key in self.keys]
+
+
+class FakeBatchRedis:
+    # User value: keeps batch status tests offline while counting Redis round trips.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, hashes):
+        self.hashes = hashes
+        self.round_trips = 0
+
+    # User value: supports pipeline so the OCR/transcription journey stays clear and reliable.
+    def pipeline(self, transaction=False):
+        return FakeBatchPipeline(self)
+
+
+HASHES = {
+    "job_status:a": {"user": "u@example.com", "status": "FAILED", "stage": "OCR"},
+    "job_status:b": {"user": "u@example.com", "status": "COMPLETED", "output_path": "gs://b/jobs/b/out.txt"},
+    "job_status:c": {"user": "other@example.com", "status": "PROCESSING"},
+}
+
+
+class StatusBatchUnitTests(unittest.TestCase):
+    # User value: confirms every job is read in one round trip and shaped like a single status read.
+    def test_batch_reads_once_and_normalizes(self):
+        fake = FakeBatchRedis(HASHES)
+        body = StatusBatchRequest(job_ids=["a", "b", "c", "missing", "a"])
+        with patch("routes.status.r", fake), patch("routes.status.signed_download_urls", return_value=["https://signed/b"]) as signer:
+            out = status.get_status_batch(body, user={"email": "U@example.com"})
+        self.assertEqual(fake.round_trips, 1)
+        self.assertEqual(sorted(out["jobs"]), ["a", "b"])
+        self.assertEqual(out["jobs"]["a"]["error_code"], "PROCESSING_FAILED")
+        self.assertEqual(out["jobs"]["b"]["download_url"], "https://signed/b")
+        self.assertEqual(out["errors"], {"c": "Forbidden", "missing": "Job not found"})
+        self.assertEqual(len(signer.call_args.args[0]), 1)
+
+    # User value: confirms oversized batches are rejected before touching Redis.
+    def test_batch_limit(self):
+        fake = FakeBatchRedis(HASHES)
+        with patch("routes.status.r", fake), patch("routes.status.STATUS_BATCH_MAX_IDS", 2):
+            with self.assertRaises(HTTPException) as raised:
+                status.get_status_batch(StatusBatchRequest(job_ids=["a", "b", "c"]), user={"email": "u@example.com"})
+        self.assertEqual(raised.exception.status_code, 400)
+        self.assertEqual(fake.round_trips, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
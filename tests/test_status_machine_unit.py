@@ -0,0 +1,102 @@
+# User value: This test keeps status changes race-free so a finished job is never flipped back by a late request.
+import unittest
+
+from utils.status_machine import TRANSITION_HSET_LUA, transition_hset
+
+
+class RecordingScriptClient:
+    # User value: captures EVALSHA calls so the transition script can be checked without a Redis server.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+        self.hset_calls = []
+        self.counter_calls = []
+
+    # User value: supports register_script so the OCR/transcription journey stays clear and reliable.
+    def register_script(self, source):
+        from redis.commands.core import Script
+
+        return Script(self, source)
+
+    # User value: supports get_encoder so the OCR/transcription journey stays clear and reliable.
+    def get_encoder(self):
+        from redis import Redis
+
+        return Redis(decode_responses=True).get_encoder()
+
+    # User value: supports evalsha so the OCR/transcription journey stays clear and reliable.
+    def evalsha(self, sha, numkeys, *args):
+        self.calls.append((sha, numkeys, args))
+        return self.result
+
+    # User value: supports hset so the OCR/transcription journey stays clear and reliable.
+    def hset(self, key, mapping):
+        self.hset_calls.append((key, mapping))
+
+    # User value: supports hincrby so the OCR/transcription journey stays clear and reliable.
+    def hincrby(self, key, field, amount):
+        self.counter_calls.append((key, field, amount))
+
+    # User value: supports incr so the OCR/transcription journey stays clear and reliable.
+    def incr(self, key):
+        self.counter_calls.append((key,))
+
+    # User value: supports publish so the OCR/transcription journey stays clear and reliable.
+    def publish(self, channel, message):
+        self.counter_calls.append(("publish", channel))
+
+    # User value: fails loudly if the old read-then-write path is used.
+    def hgetall(self, key):
+        raise AssertionError("transition_hset must not read the whole job hash")
+
+
+class StatusMachineUnitTests(unittest.TestCase):
+    # User value: confirms the server-side check uses the same transition table as Python.
+    def test_script_embeds_transition_table(self):
+        self.assertIn('["FAILED"] = {["FAILED"] = true}', TRANSITION_HSET_LUA)
+        self.assertIn("redis.call('HSET', KEYS[1], unpack(ARGV, 2))", TRANSITION_HSET_LUA)
+        self.assertIn("redis.call('HINCRBY', KEYS[1], 'version', 1)", TRANSITION_HSET_LUA)
+
+    # User value: confirms an allowed change is checked and written in one call.
+    def test_transition_is_one_script_call(self):
+        client = RecordingScriptClient([1, "QUEUED"])
+        out = transition_hset(
+            client,
+            key="job_status:j1",
+            mapping={"status": "processing", "progress": 5, "stage": None},
+            context="TEST",
+        )
+        self.assertEqual(out, (True, "QUEUED", "PROCESSING"))
+        self.assertEqual(len(client.calls), 1)
+        _, numkeys, args = client.calls[0]
+        self.assertEqual(args[:numkeys], ("job_status:j1",))
+        self.assertEqual(args[numkeys:], ("PROCESSING", "status", "processing", "progress", 5, "stage", ""))
+
+    # User value: confirms a terminal status blocks the change and is reported back.
+    def test_blocked_transition_reports_current_status(self):
+        client = RecordingScriptClient([0, "COMPLETED"])
+        with self.assertLogs("api.status_machine", level="WARNING"):
+            out = transition_hset(client, key="job_status:j2", mapping={"status": "CANCELLED"}, context="TEST")
+        self.assertEqual(out, (False, "COMPLETED", "CANCELLED"))
+
+    # User value: confirms updates without a status skip the script entirely.
+    def test_update_without_status_is_plain_write(self):
+        client = RecordingScriptClient(None)
+        out = transition_hset(client, key="job_status:j3", mapping={"stage": "OCR"}, context="TEST")
+        self.assertEqual(out, (True, None, None))
+        self.assertEqual(client.calls, [])
+        self.assertEqual(client.hset_calls, [("job_status:j3", {"stage": "OCR"})])
+        self.assertEqual(client.counter_calls, [("job_status:j3", "version", 1), ("publish", "job_events:j3")])
+
+    # User value: confirms a user's history version is bumped with the job when their email is given.
+    def test_user_email_adds_history_key(self):
+        client = RecordingScriptClient([1, "PROCESSING"])
+        transition_hset(client, key="job_status:j4", mapping={"status": "CANCELLED"}, context="TEST", user_email="u@example.com")
+        _, numkeys, args = client.calls[0]
+        self.assertEqual(args[:numkeys], ("job_status:j4", "user_jobs_version:u@example.com"))
+
+
+if __name__ == "__main__":
+    unittest.main()
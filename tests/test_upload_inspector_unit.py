@@ -0,0 +1,56 @@
+# User value: This test keeps single-pass upload inspection accurate so checks and limits stay trustworthy.
+import base64
+import hashlib
+import unittest
+from io import BytesIO
+
+import google_crc32c
+
+from services.upload_inspector import UploadInspector, inspect_upload, sniff_file_type, sniffed_job_type
+
+
+class UploadInspectorUnitTests(unittest.TestCase):
+    # User value: confirms size and checksums match a direct full-file computation.
+    def test_inspection_matches_direct_hashes(self):
+        payload = b"%PDF-1.7\n" + bytes(range(256)) * 500
+        out = inspect_upload(BytesIO(payload), chunk_size=1000)
+        self.assertEqual(out["size_bytes"], len(payload))
+        self.assertEqual(out["sha256"], hashlib.sha256(payload).hexdigest())
+        expected_crc = base64.b64encode(google_crc32c.Checksum(payload).digest()).decode("ascii")
+        self.assertEqual(out["crc32c"], expected_crc)
+        self.assertEqual(out["sniffed_type"], "pdf")
+        self.assertEqual(out["sniffed_job_type"], "OCR")
+
+    # User value: confirms chunk size does not change inspection results.
+    def test_chunking_does_not_change_result(self):
+        payload = b"%PDF-1.4\n<< /Type /Pages >>\n" + b"<< /Type /Page >>\n" * 7
+        whole = UploadInspector(count_pdf_pages=True)
+        whole.feed(payload)
+        pieces = UploadInspector(count_pdf_pages=True)
+        for idx in range(0, len(payload), 3):
+            pieces.feed(payload[idx : idx + 3])
+        self.assertEqual(whole.result(), pieces.result())
+        self.assertEqual(pieces.result()["pdf_page_count"], 7)
+
+    # User value: keeps the caller's file position so later storage uploads read the full file.
+    def test_inspect_upload_restores_position(self):
+        buf = BytesIO(b"ID3" + b"\x00" * 100)
+        buf.seek(5)
+        inspect_upload(buf)
+        self.assertEqual(buf.tell(), 5)
+
+    # User value: recognizes common OCR and transcription formats from magic bytes.
+    def test_sniff_known_formats(self):
+        self.assertEqual(sniff_file_type(b"\x89PNG\r\n\x1a\n...."), "png")
+        self.assertEqual(sniff_file_type(b"\xff\xd8\xff\xe0"), "jpeg")
+        self.assertEqual(sniff_file_type(b"RIFF\x00\x00\x00\x00WAVEfmt "), "wav")
+        self.assertEqual(sniff_file_type(b"\x00\x00\x00\x20ftypM4A "), "mp4")
+        self.assertEqual(sniff_file_type(b"\xff\xfb\x90\x00"), "mp3")
+        self.assertEqual(sniff_file_type(b"\xff\xf1\x50\x80"), "aac")
+        self.assertEqual(sniff_file_type(b"hello"), "unknown")
+        self.assertEqual(sniffed_job_type("wav"), "TRANSCRIPTION")
+        self.assertEqual(sniffed_job_type("unknown"), "UNKNOWN")
+
+
+if __name__ == "__main__":
+    unittest.main()
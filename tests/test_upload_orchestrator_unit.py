@@ -1,6 +1,9 @@
 # User value: This file helps users get reliable OCR/transcription results with clear processing behavior.
+import asyncio
+import threading
 import unittest
 from io import BytesIO
+from unittest.mock import patch
 from fastapi import HTTPException
 
 from services.upload_orchestrator import (
@@ -10,6 +13,7 @@ from services.upload_orchestrator import (
     make_output_filename,
     normalize_idempotency_key,
     resolve_target_queue,
+    submit_upload_job,
     validate_upload_constraints,
 )
 
@@ -22,6 +26,58 @@ class DummyUploadFile:
         self.file = BytesIO(b"dummy")
 
 
+class FakeAsyncRedis:
+    # User value: keeps submit tests offline while matching the asyncio Redis call shapes.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self):
+        self.hashes: dict[str, dict] = {}
+        self.strings: dict[str, str] = {}
+        self.lists: dict[str, list] = {}
+
+    # User value: supports get so the OCR/transcription journey stays clear and reliable.
+    async def get(self, key):
+        return self.strings.get(key)
+
+    # User value: supports set so the OCR/transcription journey stays clear and reliable.
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = str(value)
+        return True
+
+    # User value: supports hgetall so the OCR/transcription journey stays clear and reliable.
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    # User value: supports hset so the OCR/transcription journey stays clear and reliable.
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    # User value: supports lpush so the OCR/transcription journey stays clear and reliable.
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    # User value: supports rpush so the OCR/transcription journey stays clear and reliable.
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    # User value: supports llen so the OCR/transcription journey stays clear and reliable.
+    async def llen(self, key):
+        return len(self.lists.get(key, []))
+
+
+# User value: records commits in the fake store so tests see the same effects as the Redis script.
+async def fake_commit_and_enqueue_job(r, *, job_id, user_email, queue_name, mapping, payload, **_):
+    key = f"job_status:{job_id}"
+    if key in r.hashes:
+        return {"ok": True, "current_status": r.hashes[key].get("status"), "enqueued": False, "queue_depth": None}
+    await r.hset(key, mapping=mapping)
+    await r.lpush(f"user_jobs:{user_email}", job_id)
+    await r.rpush(queue_name, payload)
+    return {"ok": True, "current_status": None, "enqueued": True, "queue_depth": await r.llen(queue_name)}
+
+
 class UploadOrchestratorUnitTests(unittest.TestCase):
     # User value: normalizes data so users see consistent OCR/transcription results.
     def test_make_output_filename_normalizes(self):
@@ -74,6 +130,37 @@ class UploadOrchestratorUnitTests(unittest.TestCase):
         file = DummyUploadFile("img.png", "image/png")
         self.assertEqual(derive_total_pages(file, "OCR"), 1)
 
+    # User value: confirms uploads use async Redis and keep blocking storage work off the event loop.
+    def test_submit_upload_job_offloads_storage_and_enqueues(self):
+        fake = FakeAsyncRedis()
+        threads = {}
+
+        # User value: supports fake_upload so the OCR/transcription journey stays clear and reliable.
+        def fake_upload(file_obj, destination_path, crc32c=None):
+            threads["upload"] = threading.get_ident()
+            return {"gcs_uri": f"gs://bucket/{destination_path}"}
+
+        async def run_case():
+            threads["loop"] = threading.get_ident()
+            file = DummyUploadFile("talk.mp3", "audio/mpeg")
+            with patch("services.upload_orchestrator.r", fake), patch(
+                "services.upload_orchestrator.upload_file", side_effect=fake_upload
+            ), patch("services.upload_orchestrator.commit_and_enqueue_job", fake_commit_and_enqueue_job):
+                return await submit_upload_job(
+                    file=file,
+                    job_type="TRANSCRIPTION",
+                    email="U@Example.com",
+                    request_id="rid-1",
+                    idempotency_key=None,
+                )
+
+        out = asyncio.run(run_case())
+        self.assertFalse(out["reused"])
+        self.assertNotEqual(threads["upload"], threads["loop"])
+        self.assertEqual(fake.hashes[f"job_status:{out['job_id']}"]["status"], "QUEUED")
+        self.assertEqual(fake.lists["user_jobs:u@example.com"], [out["job_id"]])
+        self.assertEqual(sum(len(v) for k, v in fake.lists.items() if k.startswith("doc_jobs")), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,190 @@
+# User value: This test keeps streamed uploads correct so large files reach workers intact.
+import asyncio
+import unittest
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+from services.gcs import cancel_resumable_upload
+from services.upload_orchestrator import _parse_pdf_page_count, submit_streamed_upload_job
+from services.pdf_page_count import PdfPageTally
+from services.upload_stream import (
+    GCS_CHUNK_ALIGN_BYTES,
+    MultipartStreamReader,
+    ResumableUploadSink,
+    stream_chunk_size_bytes,
+)
+
+BOUNDARY = "----unit-boundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+# User value: builds a multipart body the same way browsers do for upload tests.
+def _multipart_body(fields: dict, filename: str, file_type: str, payload: bytes) -> bytes:
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n\r\n{value}\r\n".encode("utf-8")
+        )
+    parts.append(
+        (
+            f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: {file_type}\r\n\r\n"
+        ).encode("utf-8")
+        + payload
+        + b"\r\n"
+    )
+    parts.append(f"--{BOUNDARY}--\r\n".encode("utf-8"))
+    return b"".join(parts)
+
+
+# User value: replays a body in small pieces like a slow network connection would.
+async def _chunked(body: bytes, size: int):
+    for idx in range(0, len(body), size):
+        yield body[idx : idx + size]
+
+
+class FakeWriter:
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self):
+        self.writes = []
+        self.closed = False
+
+    # User value: supports write so the OCR/transcription journey stays clear and reliable.
+    def write(self, data: bytes) -> int:
+        self.writes.append(bytes(data))
+        return len(data)
+
+    # User value: supports close so the OCR/transcription journey stays clear and reliable.
+    def close(self) -> None:
+        self.closed = True
+
+
+class UploadStreamUnitTests(unittest.TestCase):
+    # User value: keeps memory ceiling config aligned with storage chunk rules.
+    def test_chunk_size_is_aligned_and_bounded(self):
+        self.assertEqual(stream_chunk_size_bytes(16), 8 * 1024 * 1024)
+        self.assertEqual(stream_chunk_size_bytes(0), GCS_CHUNK_ALIGN_BYTES)
+        self.assertEqual(stream_chunk_size_bytes(3) % GCS_CHUNK_ALIGN_BYTES, 0)
+
+    # User value: confirms fields and file bytes are parsed correctly even when split across reads.
+    def test_reader_emits_fields_and_file_bytes(self):
+        payload = b"%PDF-1.4 " + b"x" * 5000
+        body = _multipart_body({"type": "OCR"}, "scan.pdf", "application/pdf", payload)
+
+        async def run_case():
+            reader = MultipartStreamReader(CONTENT_TYPE)
+            return [event async for event in reader.iter_events(_chunked(body, 7))]
+
+        events = asyncio.run(run_case())
+        self.assertEqual(events[0], ("field", "type", "OCR"))
+        self.assertEqual(events[1][:3], ("file_start", "file", "scan.pdf"))
+        self.assertEqual(events[1][3], "application/pdf")
+        data = b"".join(e[1] for e in events if e[0] == "data")
+        self.assertEqual(data, payload)
+        self.assertEqual(events[-1], ("file_end", "file"))
+
+    # User value: rejects non-multipart bodies with a clear validation error.
+    def test_reader_rejects_non_multipart(self):
+        with self.assertRaises(HTTPException) as ctx:
+            MultipartStreamReader("application/json")
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    # User value: keeps streamed page counts identical to the existing in-memory heuristic.
+    def test_page_tally_matches_in_memory_heuristic(self):
+        blob = b"%PDF-1.4\n" + b"<< /Type /Pages /Count 3 >>\n" + b"<< /Type /Page >>\n" * 3 + b"%%EOF"
+        for size in (1, 5, 11, 64):
+            tally = PdfPageTally()
+            for idx in range(0, len(blob), size):
+                tally.feed(blob[idx : idx + size])
+            self.assertEqual(tally.result(), _parse_pdf_page_count(BytesIO(blob)))
+            self.assertEqual(tally.result(), 3)
+
+    # User value: ensures only whole chunks are forwarded so buffered memory stays bounded.
+    def test_sink_flushes_whole_chunks(self):
+        writer = FakeWriter()
+        sink = ResumableUploadSink(writer, chunk_size=4)
+        self.assertFalse(sink.feed(b"abc"))
+        self.assertTrue(sink.feed(b"defghij"))
+        sink.flush_ready()
+        self.assertEqual(writer.writes, [b"abcdefgh"])
+        sink.close()
+        self.assertEqual(writer.writes, [b"abcdefgh", b"ij"])
+        self.assertTrue(writer.closed)
+
+    # User value: confirms streamed uploads reach storage and the queue with correct size metadata.
+    def test_streamed_submit_forwards_bytes_and_enqueues(self):
+        payload = b"ID3" + b"a" * 3000
+        body = _multipart_body({"type": "TRANSCRIPTION"}, "talk.mp3", "audio/mpeg", payload)
+        writer = FakeWriter()
+        gcs = {"gcs_uri": "gs://bucket/jobs/x/input/talk.mp3"}
+
+        async def run_case():
+            with patch(
+                "services.upload_orchestrator.open_resumable_upload", return_value=(writer, gcs)
+            ), patch(
+                "services.upload_orchestrator._commit_and_enqueue", return_value={"job_id": "j1", "reused": False}
+            ) as commit:
+                out = await submit_streamed_upload_job(
+                    body=_chunked(body, 1024),
+                    content_type_header=CONTENT_TYPE,
+                    content_length=len(body),
+                    job_type=None,
+                    email="U@Example.com",
+                    request_id="rid-1",
+                    idempotency_key=None,
+                )
+                return out, commit.call_args
+
+        out, commit_call = asyncio.run(run_case())
+        self.assertEqual(out["job_id"], "j1")
+        self.assertEqual(b"".join(writer.writes), payload)
+        self.assertTrue(writer.closed)
+        self.assertEqual(commit_call.kwargs["input_size_bytes"], len(payload))
+        self.assertEqual(commit_call.kwargs["input_gcs_uri"], gcs["gcs_uri"])
+
+    # User value: stops oversized uploads early so storage does not keep unusable files.
+    def test_streamed_submit_rejects_oversized_before_storage(self):
+        body = _multipart_body({"type": "OCR"}, "scan.pdf", "application/pdf", b"%PDF" + b"0" * 1024)
+        writer = FakeWriter()
+
+        async def run_case():
+            with patch("services.upload_orchestrator.MAX_OCR_FILE_SIZE_BYTES", 10), patch(
+                "services.upload_orchestrator.open_resumable_upload", return_value=(writer, {"gcs_uri": "gs://b/x"})
+            ), patch("services.upload_orchestrator.cancel_resumable_upload") as cancel, patch(
+                "services.upload_orchestrator.delete_blob"
+            ) as deleter:
+                with self.assertRaises(HTTPException) as ctx:
+                    await submit_streamed_upload_job(
+                        body=_chunked(body, 256),
+                        content_type_header=CONTENT_TYPE,
+                        content_length=None,
+                        job_type=None,
+                        email="u@example.com",
+                        request_id="rid-2",
+                        idempotency_key=None,
+                    )
+                return ctx.exception, cancel, deleter
+
+        exc, cancel, deleter = asyncio.run(run_case())
+        self.assertEqual(exc.status_code, 400)
+        self.assertEqual(exc.detail.get("error_code"), "FILE_TOO_LARGE")
+        self.assertFalse(writer.closed)
+        cancel.assert_called_once_with(writer)
+        self.assertTrue(deleter.call_args.kwargs["destination_path"].endswith("/input/scan.pdf"))
+
+    # User value: confirms cancelling drops the open storage session without committing the partial object.
+    def test_cancel_resumable_upload_deletes_session(self):
+        upload = SimpleNamespace(resumable_url="https://storage.example/session", finished=False)
+        transport = SimpleNamespace(calls=[])
+        transport.request = lambda method, url, headers=None: transport.calls.append((method, url))
+        writer = SimpleNamespace(_buffer=BytesIO(b"partial"), _upload_and_transport=(upload, transport))
+        cancel_resumable_upload(writer)
+        self.assertTrue(writer._buffer.closed)
+        self.assertEqual(transport.calls, [("DELETE", "https://storage.example/session")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# User value: This test keeps every user's short id stable, cached and only used once the rollout flag is on.
+import unittest
+from unittest.mock import patch
+
+from repositories import user_directory
+from repositories.user_directory import UserIdCache, email_for, is_user_id, owns, user_id, user_ref
+
+
+class FakeDirectoryRedis:
+    # User value: keeps directory tests offline with the two directory hashes and an id sequence.
+
+    # User value: supports __init__ so the OCR/transcription journey stays clear and reliable.
+    def __init__(self):
+        self.hashes = {user_directory.USER_IDS_KEY: {}, user_directory.USER_EMAILS_KEY: {}}
+        self.seq = 0
+        self.calls = 0
+
+    # User value: supports hget so the OCR/transcription journey stays clear and reliable.
+    def hget(self, key, field):
+        self.calls += 1
+        return self.hashes[key].get(field)
+
+    # User value: runs the assign script's logic in Python, the way Redis would run it atomically.
+    def register_script(self, source):
+        # User value: supports assign so the OCR/transcription journey stays clear and reliable.
+        def assign(keys, args, client=None):
+            ids, emails, _ = keys
+            if args[0] not in self.hashes[ids]:
+                self.seq += 1
+                self.hashes[ids][args[0]] = str(self.seq)
+                self.hashes[emails][str(self.seq)] = args[0]
+            return self.hashes[ids][args[0]]
+
+        return assign
+
+
+class UserDirectoryUnitTests(unittest.TestCase):
+    # User value: supports setUp so the OCR/transcription journey stays clear and reliable.
+    def setUp(self):
+        patcher = patch.multiple(user_directory, _cache=UserIdCache(2), _sync_script=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    # User value: confirms ids are assigned once, reused from the cache, and map back to the email.
+    def test_assigns_and_caches_ids(self):
+        fake = FakeDirectoryRedis()
+        first = user_id(fake, "a@example.com")
+        calls = fake.calls
+        self.assertEqual(user_id(fake, "a@example.com"), first)
+        self.assertEqual(fake.calls, calls)
+        self.assertNotEqual(user_id(fake, "b@example.com"), first)
+        self.assertEqual(email_for(fake, first), "a@example.com")
+        self.assertTrue(is_user_id(first))
+        self.assertFalse(is_user_id("a@example.com"))
+
+    # User value: confirms the cache stays bounded by evicting the least recently used email.
+    def test_cache_bounds(self):
+        cache = UserIdCache(2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+
+    # User value: confirms keys keep using the email until the flag is on, with no Redis call.
+    def test_user_ref_follows_flag(self):
+        fake = FakeDirectoryRedis()
+        with patch.object(user_directory, "is_user_ids_enabled", return_value=False):
+            self.assertEqual(user_ref(fake, "a@example.com"), "a@example.com")
+        self.assertEqual(fake.calls, 0)
+        with patch.object(user_directory, "is_user_ids_enabled", return_value=True):
+            self.assertEqual(user_ref(fake, "a@example.com"), "1")
+
+    # User value: confirms jobs stored under either the email or the id belong to the user, and nobody else's do.
+    def test_owns(self):
+        self.assertTrue(owns("7", "a@example.com", "7"))
+        self.assertTrue(owns("a@example.com", "a@example.com", "7"))
+        self.assertFalse(owns("8", "a@example.com", "7"))
+        self.assertFalse(owns(None, "a@example.com", "a@example.com"))
+
+
+if __name__ == "__main__":
+    unittest.main()
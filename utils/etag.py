@@ -0,0 +1,25 @@
+# User value: This file lets polling clients skip unchanged job data with standard HTTP conditional requests.
+# utils/etag.py
+import hashlib
+from typing import Optional
+
+
+# User value: builds a strong ETag from the values that determine a response body.
+def strong_etag(*parts) -> str:
+    digest = hashlib.sha256("\x1f".join("" if p is None else str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+# User value: checks If-None-Match (including lists, weak tags and "*") against the current ETag.
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
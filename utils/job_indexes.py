@@ -0,0 +1,148 @@
+# User value: This file keeps per-user status/type indexes so filtered job history loads in a few Redis calls at any size.
+# utils/job_indexes.py
+from typing import Optional
+
+from schemas.job_contract import JOB_STATUSES, TERMINAL_STATUSES
+
+TIME_INDEX_PREFIX = "user_jobs_by_time:"
+STATUS_INDEX_PREFIX = "user_jobs_by_status:"
+TYPE_INDEX_PREFIX = "user_jobs_by_type:"
+TYPE_STATUS_INDEX_PREFIX = "user_jobs_by_type_status:"
+COUNTS_PREFIX = "user_job_counts:"
+ACTIVE_JOBS_PREFIX = "active_jobs:"
+
+
+# User value: names the sorted set of all of a user's jobs by creation time, the base for unfiltered cursor pages.
+def time_index_key(email: str) -> str:
+    return f"{TIME_INDEX_PREFIX}{email}"
+
+
+# User value: supports status_index_key so the OCR/transcription journey stays clear and reliable.
+def status_index_key(email: str, status: str) -> str:
+    return f"{STATUS_INDEX_PREFIX}{email}:{status.upper()}"
+
+
+# User value: supports type_index_key so the OCR/transcription journey stays clear and reliable.
+def type_index_key(email: str, job_type: str) -> str:
+    return f"{TYPE_INDEX_PREFIX}{email}:{job_type.upper()}"
+
+
+# User value: supports type_status_index_key so the OCR/transcription journey stays clear and reliable.
+def type_status_index_key(email: str, job_type: str, status: str) -> str:
+    return f"{TYPE_STATUS_INDEX_PREFIX}{email}:{job_type.upper()}:{status.upper()}"
+
+
+# User value: names the per-user counters hash (status:S, type:T, type_status:T:S) that answers include_counts in one read.
+def counts_key(email: str) -> str:
+    return f"{COUNTS_PREFIX}{email}"
+
+
+# User value: names the set of the user's unfinished jobs, so quota checks and the active-jobs view need one read.
+def active_jobs_key(email: str) -> str:
+    return f"{ACTIVE_JOBS_PREFIX}{email}"
+
+
+# User value: supports counts_field so the OCR/transcription journey stays clear and reliable.
+def counts_field(*, status: Optional[str] = None, job_type: Optional[str] = None) -> str:
+    if status and job_type:
+        return f"type_status:{job_type.upper()}:{status.upper()}"
+    if job_type:
+        return f"type:{job_type.upper()}"
+    return f"status:{(status or '').upper()}"
+
+
+# User value: picks the one sorted set that holds exactly the jobs matching a listing filter.
+def index_key_for(email: str, *, status: Optional[str], job_type: Optional[str], unfiltered: Optional[str] = None) -> Optional[str]:
+    if status and job_type:
+        return type_status_index_key(email, job_type, status)
+    if status:
+        return status_index_key(email, status)
+    if job_type:
+        return type_index_key(email, job_type)
+    return unfiltered
+
+
+# Lua helper shared by the transition and commit scripts. Index key names are built from the job
+# hash (single-instance Redis, like the rest of this API), so callers cannot pass a stale status.
+# reindex_job(key, old_status, new_status, sweep): moves the job between status indexes, scored by
+# created_ts (set from the server clock the first time a job is indexed, kept as a fixed
+# six-decimal string so cursors can quote the exact score back). sweep=true removes the
+# job from every status index first, for backfills where the previous status is unknown.
+# The counters hash only moves when ZADD/ZREM actually changed membership, so it always agrees
+# with the indexes even for jobs that were never indexed. The job also joins active_jobs:{user}
+# while its status is not terminal and leaves it on the terminal write.
+REINDEX_JOB_LUA = (
+    "local INDEXED_STATUSES = {"
+    + ", ".join(f"'{status}'" for status in JOB_STATUSES)
+    + "}\nlocal TERMINAL = {"
+    + ", ".join(f"{status} = true" for status in TERMINAL_STATUSES)
+    + """}
+local function reindex_job(key, old_status, new_status, sweep)
+  local f = redis.call('HMGET', key, 'user', 'job_type', 'type', 'created_ts')
+  local user = f[1]
+  if not user or user == '' or new_status == '' then
+    return
+  end
+  local jtype = string.upper(f[2] or f[3] or '')
+  local ts = f[4]
+  if not ts or not tonumber(ts) then
+    local now = redis.call('TIME')
+    ts = now[1] .. '.' .. string.format('%06d', tonumber(now[2]))
+    redis.call('HSET', key, 'created_ts', ts)
+  end
+  local id = (string.gsub(key, '^job_status:', ''))
+  local by_status = '""" + STATUS_INDEX_PREFIX + """' .. user .. ':'
+  local by_type_status = '""" + TYPE_STATUS_INDEX_PREFIX + """' .. user .. ':' .. jtype .. ':'
+  local counts = '""" + COUNTS_PREFIX + """' .. user
+  redis.call('ZADD', '""" + TIME_INDEX_PREFIX + """' .. user, ts, id)
+  local stale = {}
+  if sweep then
+    stale = INDEXED_STATUSES
+  elseif old_status ~= '' and old_status ~= new_status then
+    stale = {old_status}
+  end
+  for _, status in ipairs(stale) do
+    if status ~= new_status then
+      if redis.call('ZREM', by_status .. status, id) == 1 then
+        redis.call('HINCRBY', counts, 'status:' .. status, -1)
+      end
+      if jtype ~= '' and redis.call('ZREM', by_type_status .. status, id) == 1 then
+        redis.call('HINCRBY', counts, 'type_status:' .. jtype .. ':' .. status, -1)
+      end
+    end
+  end
+  if redis.call('ZADD', by_status .. new_status, ts, id) == 1 then
+    redis.call('HINCRBY', counts, 'status:' .. new_status, 1)
+  end
+  if jtype ~= '' then
+    if redis.call('ZADD', '""" + TYPE_INDEX_PREFIX + """' .. user .. ':' .. jtype, ts, id) == 1 then
+      redis.call('HINCRBY', counts, 'type:' .. jtype, 1)
+    end
+    if redis.call('ZADD', by_type_status .. new_status, ts, id) == 1 then
+      redis.call('HINCRBY', counts, 'type_status:' .. jtype .. ':' .. new_status, 1)
+    end
+  end
+  if TERMINAL[new_status] then
+    redis.call('SREM', '""" + ACTIVE_JOBS_PREFIX + """' .. user, id)
+  else
+    redis.call('SADD', '""" + ACTIVE_JOBS_PREFIX + """' .. user, id)
+  end
+end
+"""
+)
+
+# KEYS: job hash. ARGV: creation time (epoch seconds) to use when the job has no created_ts yet.
+BACKFILL_JOB_LUA = (
+    REINDEX_JOB_LUA
+    + """
+local raw = redis.call('HGET', KEYS[1], 'status')
+if not raw then
+  return 0
+end
+if ARGV[1] ~= '' then
+  redis.call('HSETNX', KEYS[1], 'created_ts', ARGV[1])
+end
+reindex_job(KEYS[1], '', string.upper(string.match(raw, '^%s*(.-)%s*$')), true)
+return 1
+"""
+)
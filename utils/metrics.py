@@ -8,6 +8,7 @@ _LOCK = threading.Lock()
 
 _COUNTERS: dict[str, int] = {}
 _TIMERS: dict[str, dict[str, float]] = {}
+_GAUGES: dict[str, float] = {}
 
 
 # User value: supports _tagged_name so the OCR/transcription journey stays clear and reliable.
@@ -32,10 +33,8 @@ def incr(name: str, amount: int = 1, **tags) -> None:
     )
 
 
-# User value: supports observe_ms so the OCR/transcription journey stays clear and reliable.
-def observe_ms(name: str, duration_ms: float, **tags) -> None:
-    metric = _tagged_name(name, {k: str(v) for k, v in tags.items()})
-    value = float(max(0.0, duration_ms))
+# User value: supports _record_timer so the OCR/transcription journey stays clear and reliable.
+def _record_timer(metric: str, value: float) -> None:
     with _LOCK:
         current = _TIMERS.get(metric)
         if not current:
@@ -45,15 +44,35 @@ def observe_ms(name: str, duration_ms: float, **tags) -> None:
             current["sum_ms"] += value
             current["min_ms"] = min(current["min_ms"], value)
             current["max_ms"] = max(current["max_ms"], value)
+
+
+# User value: supports observe_ms so the OCR/transcription journey stays clear and reliable.
+def observe_ms(name: str, duration_ms: float, **tags) -> None:
+    metric = _tagged_name(name, {k: str(v) for k, v in tags.items()})
+    value = float(max(0.0, duration_ms))
+    _record_timer(metric, value)
     logger.info(
         "metric_timer_observe",
         extra={"metric_name": metric, "metric_type": "timer_ms", "value_ms": round(value, 3)},
     )
 
 
+# User value: aggregates hot-path timings (one per Redis command) without writing a log line for each one.
+def record_ms(name: str, duration_ms: float, **tags) -> None:
+    _record_timer(_tagged_name(name, {k: str(v) for k, v in tags.items()}), float(max(0.0, duration_ms)))
+
+
+# User value: keeps the latest value of a level-style metric (such as pool usage) for the metrics endpoint.
+def set_gauge(name: str, value: float, **tags) -> None:
+    metric = _tagged_name(name, {k: str(v) for k, v in tags.items()})
+    with _LOCK:
+        _GAUGES[metric] = float(value)
+
+
 # User value: supports snapshot so the OCR/transcription journey stays clear and reliable.
 def snapshot() -> dict:
     with _LOCK:
         counters = deepcopy(_COUNTERS)
         timers = deepcopy(_TIMERS)
-    return {"counters": counters, "timers_ms": timers}
+        gauges = dict(_GAUGES)
+    return {"counters": counters, "timers_ms": timers, "gauges": gauges}
@@ -0,0 +1,37 @@
+# User value: This file makes job history pages stable: a cursor remembers the exact job a page ended on.
+# utils/page_cursor.py
+import base64
+import json
+import math
+from typing import NamedTuple
+
+CURSOR_VERSION = 1
+OLDER = "older"
+NEWER = "newer"
+
+
+class PageCursor(NamedTuple):
+    # User value: one position in a user's history (creation score + job id) and which way to page from it.
+
+    score: str
+    job_id: str
+    direction: str = OLDER
+
+
+# User value: turns a position into an opaque token clients pass back unchanged.
+def encode_cursor(cursor: PageCursor) -> str:
+    raw = json.dumps({"v": CURSOR_VERSION, "s": cursor.score, "j": cursor.job_id, "d": cursor.direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+# User value: reads a token back, rejecting anything this API did not issue.
+def decode_cursor(token: str) -> PageCursor:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        score, job_id, direction = str(raw["s"]), str(raw["j"]), str(raw.get("d") or OLDER)
+        finite = math.isfinite(float(score))
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise ValueError("invalid cursor") from None
+    if raw.get("v") != CURSOR_VERSION or direction not in (OLDER, NEWER) or not job_id or not finite:
+        raise ValueError("invalid cursor")
+    return PageCursor(score=score, job_id=job_id, direction=direction)
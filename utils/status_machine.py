@@ -9,6 +9,7 @@ from schemas.job_contract import (
     JOB_STATUS_FAILED,
     JOB_STATUS_CANCELLED,
 )
+from utils.job_indexes import REINDEX_JOB_LUA
 
 logger = logging.getLogger("api.status_machine")
 
@@ -59,17 +60,96 @@ def is_allowed_transition(current: Optional[str], target: Optional[str]) -> bool
     return target_n in allowed
 
 
-# User value: supports transition_hset so the OCR/transcription journey stays clear and reliable.
-def transition_hset(r, *, key: str, mapping: dict, context: str, request_id: str = "") -> tuple[bool, Optional[str], Optional[str]]:
-    target = _norm(mapping.get("status"))
-    if not target:
-        r.hset(key, mapping=mapping)
-        return True, None, None
+# User value: compiles the transition table for Redis scripts so server-side checks match these rules exactly.
+def allowed_transitions_lua() -> str:
+    rows = []
+    for current, targets in _ALLOWED.items():
+        # The empty string stands for "no status yet", matching the None row above.
+        allowed = ", ".join(f'["{target}"] = true' for target in sorted(targets))
+        rows.append(f'["{current or ""}"] = {{{allowed}}}')
+    return "{" + ", ".join(rows) + "}"
+
+
+HISTORY_VERSION_PREFIX = "user_jobs_version:"
+
+
+# User value: names the per-user counter that changes whenever the user's job history changes.
+# The counter's new value is also published on a channel of the same name.
+def history_version_key(email: str) -> str:
+    return f"{HISTORY_VERSION_PREFIX}{email}"
+
+
+JOB_EVENTS_PREFIX = "job_events:"
+
+
+# User value: names the channel that announces every write to a job, so long-polling clients wake at once.
+def job_events_channel(job_id: str) -> str:
+    return f"{JOB_EVENTS_PREFIX}{job_id}"
+
+
+# KEYS: job hash, optional per-user history version counter.
+# ARGV: target status, then field/value pairs to write when the transition is allowed.
+# Every applied write bumps the job's `version` field (and the history counter when given)
+# and publishes the new values on job_events:{job_id} (and the history counter's own name).
+# It also moves the job between the per-user status indexes (utils/job_indexes.py).
+TRANSITION_HSET_LUA = (
+    "local ALLOWED = "
+    + allowed_transitions_lua()
+    + "\n"
+    + REINDEX_JOB_LUA
+    + """
+local raw = redis.call('HGET', KEYS[1], 'status')
+local current = ''
+if raw then
+  current = string.upper(string.match(raw, '^%s*(.-)%s*$'))
+end
+local allowed = ALLOWED[current] or ALLOWED['']
+if not allowed[ARGV[1]] then
+  return {0, current}
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+local version = redis.call('HINCRBY', KEYS[1], 'version', 1)
+reindex_job(KEYS[1], current, ARGV[1], false)
+redis.call('PUBLISH', '""" + JOB_EVENTS_PREFIX + """' .. (string.gsub(KEYS[1], '^job_status:', '')), version)
+if KEYS[2] then
+  redis.call('PUBLISH', KEYS[2], redis.call('INCR', KEYS[2]))
+end
+return {1, current}
+"""
+)
+
+_sync_script = None
+_async_script = None
+
+
+# User value: supports _transition_keys so the OCR/transcription journey stays clear and reliable.
+def _transition_keys(key: str, user_email: str) -> list:
+    return [key, history_version_key(user_email)] if user_email else [key]
+
 
-    current_data = r.hgetall(key) or {}
-    current = _norm(current_data.get("status"))
+# User value: supports _events_channel_for so the OCR/transcription journey stays clear and reliable.
+def _events_channel_for(key: str) -> str:
+    return job_events_channel(key[len("job_status:"):] if key.startswith("job_status:") else key)
 
-    if not is_allowed_transition(current, target):
+
+# User value: supports _transition_args so the OCR/transcription journey stays clear and reliable.
+def _transition_args(target: str, mapping: dict) -> list:
+    args = [target]
+    for name, value in mapping.items():
+        args.extend([name, "" if value is None else value])
+    return args
+
+
+# User value: supports _decode_current so the OCR/transcription journey stays clear and reliable.
+def _decode_current(raw) -> Optional[str]:
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8", "replace")
+    return _norm(raw)
+
+
+# User value: supports _log_transition so the OCR/transcription journey stays clear and reliable.
+def _log_transition(ok: bool, *, key: str, current: Optional[str], target: str, context: str, request_id: str) -> None:
+    if not ok:
         logger.warning(
             "status_transition_blocked context=%s key=%s current=%s target=%s request_id=%s",
             context,
@@ -78,11 +158,7 @@ def transition_hset(r, *, key: str, mapping: dict, context: str, request_id: str
             target,
             request_id,
         )
-        return False, current, target
-
-    r.hset(key, mapping=mapping)
-
-    if current and current in _TERMINAL and current == target:
+    elif current and current in _TERMINAL and current == target:
         logger.info(
             "status_transition_idempotent_terminal context=%s key=%s status=%s request_id=%s",
             context,
@@ -91,4 +167,49 @@ def transition_hset(r, *, key: str, mapping: dict, context: str, request_id: str
             request_id,
         )
 
-    return True, current, target
+
+# User value: checks and writes a status change in one Redis call so a worker update can never be overwritten mid-check.
+def transition_hset(
+    r, *, key: str, mapping: dict, context: str, request_id: str = "", user_email: str = ""
+) -> tuple[bool, Optional[str], Optional[str]]:
+    global _sync_script
+    target = _norm(mapping.get("status"))
+    if not target:
+        r.hset(key, mapping=mapping)
+        # Bump after the write: a reader between the two only sees a tag that is about to change.
+        version = r.hincrby(key, "version", 1)
+        r.publish(_events_channel_for(key), version)
+        if user_email:
+            history_key = history_version_key(user_email)
+            r.publish(history_key, r.incr(history_key))
+        return True, None, None
+
+    if _sync_script is None:
+        _sync_script = r.register_script(TRANSITION_HSET_LUA)
+    ok, raw_current = _sync_script(keys=_transition_keys(key, user_email), args=_transition_args(target, mapping), client=r)
+    ok, current = bool(int(ok)), _decode_current(raw_current)
+    _log_transition(ok, key=key, current=current, target=target, context=context, request_id=request_id)
+    return ok, current, target
+
+
+# User value: applies the same transition rules on the async Redis client so uploads never block the event loop.
+async def transition_hset_async(
+    r, *, key: str, mapping: dict, context: str, request_id: str = "", user_email: str = ""
+) -> tuple[bool, Optional[str], Optional[str]]:
+    global _async_script
+    target = _norm(mapping.get("status"))
+    if not target:
+        await r.hset(key, mapping=mapping)
+        version = await r.hincrby(key, "version", 1)
+        await r.publish(_events_channel_for(key), version)
+        if user_email:
+            history_key = history_version_key(user_email)
+            await r.publish(history_key, await r.incr(history_key))
+        return True, None, None
+
+    if _async_script is None:
+        _async_script = r.register_script(TRANSITION_HSET_LUA)
+    ok, raw_current = await _async_script(keys=_transition_keys(key, user_email), args=_transition_args(target, mapping), client=r)
+    ok, current = bool(int(ok)), _decode_current(raw_current)
+    _log_transition(ok, key=key, current=current, target=target, context=context, request_id=request_id)
+    return ok, current, target